@@ -3,10 +3,24 @@ Microsoft Planner Task Creator
 Main Streamlit application for creating tasks from CSV/Excel files
 """
 
+import csv
+import io
+import os
+import threading
+from urllib.parse import urlparse
 import streamlit as st
 from graph_auth import GraphAuth
+from graph_metrics import graph_metrics
+from concurrency import run_parallel
 from file_parser import FileParser
-from typing import List, Dict, Any, Optional
+from parse_cache import ParseCache, compute_content_hash
+from task_model import Task, TaskIndex
+from task_creation import FAILURE_CLASSES, classify_failure, creation_arguments, merge_retry_results, task_assignees
+from plan_fanout import MAX_PARALLEL_PLANS, enrich_partitions, match_plans, partition_rows
+from run_report import RunReport, report_phase
+from profiling import profile_section
+from progress_throttle import ProgressThrottle
+from typing import List, Dict, Any, Optional, Tuple
 
 # Page configuration
 st.set_page_config(
@@ -15,19 +29,82 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_graph_auth() -> GraphAuth:
+    """Process-wide GraphAuth; it holds no per-user state (tokens live in session state)"""
+    return GraphAuth()
+
 def main():
     st.title("📋 Microsoft Planner Task Creator")
     st.markdown("Create tasks in Microsoft Planner from CSV or Excel files with assignee support")
     
-    # Initialize components
-    auth = GraphAuth()
-    parser = FileParser()
+    # Initialize components once instead of on every rerun
+    auth = get_graph_auth()
+    if "file_parser" not in st.session_state:
+        st.session_state.file_parser = FileParser(cache=ParseCache())
+    parser = st.session_state.file_parser
+    
+    # A preset token for the local fake Graph server skips interactive sign-in, once per session
+    # so Sign Out still works
+    if "preset_token_checked" not in st.session_state:
+        st.session_state.preset_token_checked = True
+        preset_token = get_preset_token()
+        if preset_token:
+            st.session_state.access_token = preset_token
     
     # Check if user is authenticated
     if "access_token" not in st.session_state:
         show_authentication(auth)
     else:
         show_main_interface(auth, parser)
+    
+    # Request metrics, e.g. to see whether a slow import is lookups, ETag reads or throttling. They
+    # cover every session of this process (and can be reset), so only operators can turn them on
+    if os.environ.get("PLANNER_DIAGNOSTICS"):
+        show_graph_diagnostics()
+        if parser.cache:
+            show_parse_cache_stats(parser.cache)
+
+def get_preset_token() -> Optional[str]:
+    """GRAPH_ACCESS_TOKEN, but only while GRAPH_BASE_URL points at a server on this machine
+
+    Against real Graph every visitor would otherwise be signed in as the token's owner.
+    """
+    token = os.environ.get("GRAPH_ACCESS_TOKEN")
+    host = urlparse(os.environ.get("GRAPH_BASE_URL", "")).hostname
+    if token and host in ("localhost", "127.0.0.1", "::1"):
+        return token
+    return None
+
+def show_parse_cache_stats(cache: ParseCache):
+    """Show this session's parse cache occupancy and hit rate"""
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    st.sidebar.subheader("🗂️ Parse Cache")
+    st.sidebar.write(f"{stats['entries']} entries, {stats['bytes'] / (1024 * 1024):.1f} MB, "
+                     f"{stats['hits']} of {lookups} lookups served from cache")
+
+def show_graph_diagnostics():
+    """Show Graph request metrics collected in this process, across all sessions"""
+    st.sidebar.header("📈 Graph Diagnostics")
+    summary = graph_metrics.summary()
+    if not summary:
+        st.sidebar.info("No Graph requests recorded yet")
+        return
+    
+    total_calls = sum(row["Calls"] for row in summary)
+    st.sidebar.metric("Graph requests", total_calls)
+    st.sidebar.metric("Throttled (429)", sum(row["Throttled"] for row in summary))
+    st.sidebar.metric("Retries", sum(row["Retries"] for row in summary))
+    st.sidebar.dataframe(summary, use_container_width=True)
+    
+    st.sidebar.download_button("Download Prometheus metrics", graph_metrics.to_prometheus(),
+                               file_name="graph_metrics.prom", mime="text/plain")
+    st.sidebar.download_button("Download JSON metrics", graph_metrics.to_json(),
+                               file_name="graph_metrics.json", mime="application/json")
+    if st.sidebar.button("Reset metrics"):
+        graph_metrics.reset()
+        st.rerun()
 
 def show_authentication(auth: GraphAuth):
     """Show authentication interface"""
@@ -59,7 +136,8 @@ def show_authentication(auth: GraphAuth):
     if st.button("🔑 Sign in with Microsoft Account", type="primary"):
         try:
             with st.spinner("Starting authentication..."):
-                access_token = auth.authenticate_interactive()
+                # MSAL apps (and their token caches) are per session, never shared between users
+                access_token = auth.authenticate_interactive(st.session_state.setdefault("msal_apps", {}))
                 if access_token:
                     st.session_state.access_token = access_token
                     st.success("✅ Authentication successful!")
@@ -78,15 +156,18 @@ def show_main_interface(auth: GraphAuth, parser: FileParser):
         st.header("📁 Upload File")
     with col2:
         if st.button("🚪 Sign Out", help="Sign out and re-authenticate"):
-            # Clear session state
+            # Forget the signed-in account, then clear session state
+            auth.sign_out(st.session_state.get("msal_apps"))
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
+            # Stay signed out rather than picking the preset token up again
+            st.session_state.preset_token_checked = True
             st.rerun()
     
     # File upload
     uploaded_file = st.file_uploader(
-        "Choose a CSV or Excel file",
-        type=['csv', 'xlsx', 'xls'],
+        "Choose a CSV, Excel, Parquet, Feather or Arrow file (optionally .gz, .xz or .zip compressed)",
+        type=['csv', 'xlsx', 'xls', 'parquet', 'pq', 'feather', 'arrow', 'ipc', 'gz', 'xz', 'zip'],
         help="Upload a file with columns for title, description, due date, and optional assignee"
     )
     
@@ -95,16 +176,27 @@ def show_main_interface(auth: GraphAuth, parser: FileParser):
         selected_planner_info = show_planner_selection_first(auth)
         
         if selected_planner_info:
-            # Check if we already have processed tasks for this file with this planner
-            file_key = f"{uploaded_file.name}_{uploaded_file.size}_{selected_planner_info['id']}"
+            # Check if we already have processed tasks for this file content with this planner
+            content_hash = compute_content_hash(uploaded_file)
+            file_key = f"{content_hash}_{selected_planner_info['id']}"
+            
+            # One timing report per file and planner, carried across reruns
+            if st.session_state.get("run_report_key") != file_key:
+                st.session_state.run_report = RunReport(uploaded_file.name, selected_planner_info.get('title', ''))
+                st.session_state.run_report_key = file_key
+                st.session_state.pop("creation_results", None)
+            parser.report = st.session_state.run_report
             
             if "processed_tasks" not in st.session_state or st.session_state.get("current_file_key") != file_key:
                 # Parse the file with planner context
-                tasks = parser.parse_file(uploaded_file)
+                tasks = parser.parse_file(uploaded_file, content_hash=content_hash)
                 
                 if tasks and parser.validate_tasks(tasks):
                     # Store tasks and planner info in session state
                     st.session_state.processed_tasks = tasks
+                    # Reuse the index built for the mapping preview
+                    index = parser.task_index
+                    st.session_state.task_index = index if index is not None and index.tasks is tasks else TaskIndex(tasks)
                     st.session_state.current_file_key = file_key
                     st.session_state.selected_planner_info = selected_planner_info
                     st.rerun()
@@ -113,7 +205,19 @@ def show_main_interface(auth: GraphAuth, parser: FileParser):
             else:
                 # Use stored tasks and planner info
                 tasks = st.session_state.processed_tasks
-                show_file_processing_workflow(auth, parser, tasks, selected_planner_info)
+                if get_task_index(tasks).plan_rows:
+                    # A plan column spreads the file over several planners
+                    show_multi_plan_workflow(auth, parser, tasks, selected_planner_info)
+                else:
+                    show_file_processing_workflow(auth, parser, tasks, selected_planner_info)
+
+def get_task_index(tasks: List[Task]) -> TaskIndex:
+    """Return the group-by index for the current task list, building it only once"""
+    index = st.session_state.get("task_index")
+    if index is None or index.tasks is not tasks:
+        index = TaskIndex(tasks)
+        st.session_state.task_index = index
+    return index
 
 def show_planner_selection_first(auth: GraphAuth) -> Optional[Dict[str, Any]]:
     """Show planner selection before CSV processing"""
@@ -137,6 +241,7 @@ def show_planner_selection_first(auth: GraphAuth) -> Optional[Dict[str, Any]]:
         planner_options[display_name] = {
             'id': planner['id'],
             'title': planner['title'],
+            'groupId': planner.get('groupId'),
             'groupName': planner.get('groupName', 'Unknown Group'),
             'display_name': display_name
         }
@@ -165,73 +270,170 @@ def show_planner_selection_first(auth: GraphAuth) -> Optional[Dict[str, Any]]:
     
     return None
 
-def show_file_processing_workflow(auth: GraphAuth, parser: FileParser, tasks: List[Dict[str, Any]], planner_info: Dict[str, Any]):
+def show_file_processing_workflow(auth: GraphAuth, parser: FileParser, tasks: List[Task], planner_info: Dict[str, Any]):
     """Show the file processing workflow with planner context"""
     st.header("📁 Processing Workflow")
     
     # Show selected planner info
     st.success(f"📋 Selected Planner: **{planner_info['display_name']}**")
     
-    # Check if tasks have bucket names for lookup
-    has_bucket_names = any(task.get("bucket_name") for task in tasks)
+    # Check if tasks have bucket names or assignees to look up
+    index = get_task_index(tasks)
+    has_bucket_names = bool(index.bucket_rows)
+    has_assignees = bool(index.assignee_text_counts)
     
     if has_bucket_names:
         st.info("🗂️ Bucket names detected in your CSV. These will be matched against the selected planner's buckets.")
+    if has_assignees:
+        st.info("Tasks with assignees detected. Looking up users in Microsoft Graph...")
+    
+    # Resolve buckets and assignees together, once per file and planner
+    access_token = st.session_state.access_token
+    enrichment_key = f"enrich_{planner_info['id']}_{st.session_state.get('current_file_key')}"
+    
+    if (has_bucket_names or has_assignees) and st.session_state.get("enrichment_key") != enrichment_key:
+        with st.spinner("Looking up buckets and assignees..."):
+            enrichment_results = parser.enrich_tasks(
+                tasks, auth, access_token, planner_info['id'], index=index, group_id=planner_info.get('groupId')
+            )
         
-        # Perform bucket lookup immediately with planner context
-        access_token = st.session_state.access_token
-        bucket_cache_key = f"bucket_{planner_info['id']}_{st.session_state.get('current_file_key')}"
-        
-        if "bucket_enriched_tasks" not in st.session_state or st.session_state.get("bucket_cache_key") != bucket_cache_key:
-            # Perform bucket lookup
-            bucket_enriched_tasks = parser.lookup_buckets(tasks, auth, access_token, planner_info['id'])
-            
-            # Store bucket enriched tasks
-            st.session_state.bucket_enriched_tasks = bucket_enriched_tasks
-            st.session_state.bucket_cache_key = bucket_cache_key
-            tasks = bucket_enriched_tasks
-        else:
-            # Use cached bucket enriched tasks
-            tasks = st.session_state.bucket_enriched_tasks
+        # Store lookup results; the tasks themselves were annotated in place
+        st.session_state.enrichment_results = enrichment_results
+        st.session_state.enrichment_key = enrichment_key
+    
+    enrichment_results = st.session_state.get("enrichment_results", {})
+    
+    if has_bucket_names and enrichment_results.get("buckets"):
+        parser.show_bucket_results(
+            tasks, enrichment_results["buckets"], auth, access_token, planner_info['id'], index
+        )
     
     # Now proceed with assignee lookup
     show_assignee_lookup(auth, parser, tasks, planner_info)
 
-def show_assignee_lookup(auth: GraphAuth, parser: FileParser, tasks: List[Dict[str, Any]], planner_info: Dict[str, Any]):
+def show_multi_plan_workflow(auth: GraphAuth, parser: FileParser, tasks: List[Task], planner_info: Dict[str, Any]):
+    """Show the workflow for a file whose plan column targets several planners"""
+    st.header("🗺️ Multi-Plan Import")
+    
+    access_token = st.session_state.access_token
+    index = get_task_index(tasks)
+    
+    planners = auth.get_planners(access_token) or []
+    planners_by_id = {planner['id']: planner for planner in planners}
+    planners_by_id.setdefault(planner_info['id'], planner_info)
+    
+    plan_names = sorted(index.plan_names)
+    matches = match_plans(plan_names, planners)
+    partitions = partition_rows(index, matches, planner_info)
+    st.session_state.plan_titles = {plan_id: planners_by_id[plan_id]['title'] for plan_id in partitions}
+    
+    # How the file's plan names map to planners
+    plan_summary = []
+    for plan_name in plan_names:
+        planner = matches[plan_name]
+        plan_summary.append({
+            "Plan in File": plan_name,
+            "Planner": f"{planner['title']} ({planner.get('groupName', 'Unknown Group')})" if planner else "❌ Not found",
+            "Tasks": len(index.plan_rows[plan_name]),
+        })
+    unplanned_count = len(tasks) - sum(len(row_ids) for row_ids in index.plan_rows.values())
+    if unplanned_count:
+        plan_summary.append({"Plan in File": "(blank)", "Planner": planner_info['display_name'], "Tasks": unplanned_count})
+    st.dataframe(plan_summary, use_container_width=True, hide_index=True)
+    
+    unmatched = [plan_name for plan_name in plan_names if not matches[plan_name]]
+    if unmatched:
+        unmatched_count = sum(len(index.plan_rows[plan_name]) for plan_name in unmatched)
+        st.warning(f"{unmatched_count} tasks will be skipped because their plan was not found or is ambiguous: "
+                   f"{', '.join(unmatched)}. Use 'Title (Group)' to choose between plans with the same title.")
+    if not partitions:
+        st.error("None of the plans in the file were found")
+        return
+    
+    # Resolve buckets and assignees for all plans at once, once per file
+    enrichment_key = f"multi_{st.session_state.get('current_file_key')}"
+    if st.session_state.get("enrichment_key") != enrichment_key:
+        with st.spinner(f"Looking up buckets and assignees in {len(partitions)} plans..."):
+            st.session_state.enrichment_results = enrich_partitions(
+                parser, auth, access_token, tasks, partitions, planners_by_id
+            )
+        st.session_state.enrichment_key = enrichment_key
+    
+    st.subheader("🗂️ Buckets per Plan")
+    st.caption("Bucket names are matched within each plan. Missing buckets are not created in multi-plan imports; "
+               "those tasks go to the plan's default bucket.")
+    
+    targets = {}
+    for plan_id, row_ids in partitions.items():
+        planner = planners_by_id[plan_id]
+        label = f"{planner['title']} ({planner.get('groupName', 'Unknown Group')})"
+        buckets = auth.get_planner_buckets(access_token, plan_id)
+        if not buckets:
+            st.warning(f"⚠️ {label} has no buckets; its {len(row_ids)} tasks will be skipped")
+            continue
+        
+        partition = [tasks[row_id] for row_id in row_ids]
+        bucket_matched = sum(1 for task in partition if task.get("bucket_info"))
+        bucket_missing = sum(1 for task in partition if task.get("bucket_lookup_failed"))
+        assignee_failed = sum(1 for task in partition
+                              if task.get("assignee_lookup_failed") or task.get("assignee_lookup_failed_list"))
+        
+        bucket_options = {bucket['name']: bucket['id'] for bucket in buckets}
+        col1, col2 = st.columns([2, 3])
+        with col1:
+            default_bucket = st.selectbox(f"Default bucket for {label}:", options=list(bucket_options.keys()),
+                                          key=f"multi_plan_bucket_{plan_id}")
+        with col2:
+            st.write(f"**{len(row_ids)}** tasks · {bucket_matched} matched a bucket · {bucket_missing} bucket not found"
+                     f" · {assignee_failed} with assignees not found")
+        
+        for row_id in row_ids:
+            targets[row_id] = (plan_id, bucket_options[default_bucket])
+    
+    if not targets:
+        return
+    
+    st.header("🚀 Create Tasks")
+    plan_count = len({plan_id for plan_id, _ in targets.values()})
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Tasks", len(targets))
+    with col2:
+        st.metric("Plans", plan_count)
+    with col3:
+        st.metric("Skipped", len(tasks) - len(targets))
+    
+    confirmed = st.checkbox(f"I confirm that I want to create {len(targets)} tasks across {plan_count} plans",
+                            key="multi_plan_confirmation")
+    start_creation = st.button("🚀 Create All Tasks", type="primary", disabled=not confirmed, key="multi_plan_create_btn")
+    
+    if start_creation:
+        create_tasks_with_progress(auth, tasks, planner_info['id'], "", targets=targets)
+    if "creation_results" in st.session_state:
+        show_creation_results(auth, tasks, planner_info['id'], "", targets)
+
+def show_assignee_lookup(auth: GraphAuth, parser: FileParser, tasks: List[Task], planner_info: Dict[str, Any]):
     """Show assignee lookup interface"""
     st.header("👥 Assignee Lookup")
     
     # Check if tasks have assignees
-    has_assignees = any(task.get("assignee") for task in tasks)
+    index = get_task_index(tasks)
+    has_assignees = bool(index.assignee_text_counts)
     
     if has_assignees:
-        st.info("Tasks with assignees detected. Looking up users in Microsoft Graph...")
+        # Results were resolved alongside the bucket lookup
+        assignee_results = st.session_state.get("enrichment_results", {}).get("assignees")
+        if assignee_results:
+            parser.show_assignee_results(assignee_results)
         
-        # Check if we already have enriched tasks
-        if "enriched_tasks" not in st.session_state or st.session_state.get("current_file_key") != st.session_state.get("enriched_file_key"):
-            # Perform assignee lookup
-            access_token = st.session_state.access_token
-            enriched_tasks = parser.lookup_assignees(tasks, auth, access_token)
-            
-            # Store enriched tasks
-            st.session_state.enriched_tasks = enriched_tasks
-            st.session_state.enriched_file_key = st.session_state.get("current_file_key")
-            
-            # Show lookup results
-            show_assignee_preview(enriched_tasks)
-            
-            if st.button("🔄 Proceed to Bucket Selection"):
-                show_bucket_selection(auth, enriched_tasks, planner_info)
-        else:
-            # Use cached enriched tasks
-            enriched_tasks = st.session_state.enriched_tasks
-            show_assignee_preview(enriched_tasks)
-            show_bucket_selection(auth, enriched_tasks, planner_info)
+        # Show lookup results
+        show_assignee_preview(tasks)
     else:
         st.info("No assignees detected in the uploaded file. Proceeding to bucket selection...")
-        show_bucket_selection(auth, tasks, planner_info)
+    
+    show_bucket_selection(auth, tasks, planner_info)
 
-def show_assignee_preview(tasks: List[Dict[str, Any]]):
+def show_assignee_preview(tasks: List[Task]):
     """Show preview of assignee lookup results"""
     st.subheader("🔍 Assignee Lookup Results")
     
@@ -293,7 +495,7 @@ def show_assignee_preview(tasks: List[Dict[str, Any]]):
             if len(tasks) > 10:
                 st.info(f"... and {len(tasks) - 10} more tasks")
 
-def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_info: Dict[str, Any]):
+def show_bucket_selection(auth: GraphAuth, tasks: List[Task], planner_info: Dict[str, Any]):
     """Show bucket selection interface (planner already selected)"""
     st.header("🗂️ Select Default Bucket")
     
@@ -305,7 +507,8 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
     with col1:
         if st.button("📁 Upload Different File"):
             # Clear session state
-            keys_to_clear = ["processed_tasks", "current_file_key", "enriched_tasks", "enriched_file_key", "bucket_enriched_tasks", "bucket_cache_key", "selected_planner_info"]
+            keys_to_clear = ["processed_tasks", "current_file_key", "enrichment_results", "enrichment_key", "selected_planner_info",
+                             "run_report", "run_report_key", "creation_results"]
             for key in keys_to_clear:
                 if key in st.session_state:
                     del st.session_state[key]
@@ -313,13 +516,14 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
     with col2:
         if st.button("📋 Select Different Planner"):
             # Clear session state except file data
-            keys_to_clear = ["enriched_tasks", "enriched_file_key", "bucket_enriched_tasks", "bucket_cache_key", "selected_planner_info"]
+            keys_to_clear = ["enrichment_results", "enrichment_key", "selected_planner_info"]
             for key in keys_to_clear:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
     
     access_token = st.session_state.access_token
+    index = get_task_index(tasks)
     
     # Get buckets for the already selected planner
     with st.spinner("Loading buckets..."):
@@ -330,7 +534,7 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
         st.info("💡 **Don't worry!** We can create buckets for you.")
         
         # Check if tasks have bucket names that we can create
-        unique_bucket_names = set(task.get("bucket_name") for task in tasks if task.get("bucket_name"))
+        unique_bucket_names = index.bucket_names
         
         if unique_bucket_names:
             st.subheader("🔧 Create Buckets from CSV")
@@ -348,8 +552,9 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
                 st.write("**Buckets that will be created:**")
                 
                 buckets_to_create = []
-                for bucket_name in sorted(unique_bucket_names):
-                    task_count = sum(1 for task in tasks if task.get('bucket_name') == bucket_name)
+                # Spreadsheet order, which the created buckets will keep
+                for bucket_name in index.bucket_rows:
+                    task_count = index.bucket_count(bucket_name)
                     
                     col1, col2, col3 = st.columns([1, 3, 2])
                     with col1:
@@ -372,28 +577,17 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
                     st.write(f"🎯 Ready to create {len(buckets_to_create)} bucket(s)")
                     
                     if st.button("🔨 Create All Buckets", type="primary"):
-                        with st.spinner("Creating buckets..."):
-                            created_count = 0
-                            for bucket_name in buckets_to_create:
-                                created_bucket = auth.create_bucket(access_token, planner_info['id'], bucket_name)
-                                if created_bucket:
-                                    created_count += 1
+                        with st.spinner("Creating buckets..."), report_phase(st.session_state.get("run_report"), "bucket_creation"):
+                            created_results = auth.create_buckets(access_token, planner_info['id'], buckets_to_create)
+                            created_count = sum(1 for created_bucket in created_results.values() if created_bucket)
                             
                             if created_count > 0:
                                 st.success(f"✅ Successfully created {created_count} bucket(s)!")
                                 st.info("🔄 Refreshing interface to show new buckets...")
                                 st.write("🎉 **Great!** Your buckets are now ready for task creation.")
-                                # Clear bucket cache to force reload
-                                cache_keys_to_clear = [
-                                    key for key in st.session_state.keys() 
-                                    if any(cache_term in key.lower() for cache_term in ['bucket_enriched', 'bucket_cache'])
-                                ]
-                                for key in cache_keys_to_clear:
-                                    if key in st.session_state:
-                                        del st.session_state[key]
-                                # Wait a moment for user to see the message
-                                import time
-                                time.sleep(1.5)
+                                # Match tasks against the new buckets on the next run
+                                if "enrichment_key" in st.session_state:
+                                    del st.session_state["enrichment_key"]
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to create buckets. Please check permissions.")
@@ -421,7 +615,7 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
     bucket_options = {bucket['name']: bucket['id'] for bucket in buckets}
     
     # Check if tasks have individual bucket assignments
-    has_bucket_names = any(task.get("bucket_name") for task in tasks)
+    has_bucket_names = bool(index.bucket_rows)
     
     if has_bucket_names:
         st.success("✨ Great! Your CSV contains bucket names. Tasks will be created in their specified buckets when found.")
@@ -440,7 +634,8 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
         
         # Show bucket assignment summary
         if has_bucket_names:
-            unique_bucket_names = set(task.get("bucket_name") for task in tasks if task.get("bucket_name"))
+            unique_bucket_names = index.bucket_names
+            existing_bucket_names = {b['name'].lower() for b in buckets}
             
             st.write("**Bucket Assignment Summary:**")
             st.write(f"- 🗂️ Default bucket: **{selected_bucket}**")
@@ -451,10 +646,10 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
                 with st.expander("CSV Bucket Names", expanded=False):
                     for bucket_name in sorted(unique_bucket_names):
                         # Check if bucket exists in the planner buckets
-                        bucket_exists = bucket_name.lower() in [b['name'].lower() for b in buckets]
+                        bucket_exists = bucket_name.lower() in existing_bucket_names
                         # Check if task has bucket_info (meaning it was found or created)
-                        task_with_bucket = next((task for task in tasks if task.get('bucket_name') == bucket_name), None)
-                        has_bucket_info = task_with_bucket and task_with_bucket.get('bucket_info')
+                        task_with_bucket = tasks[index.bucket_rows[bucket_name][0]]
+                        has_bucket_info = task_with_bucket.get('bucket_info')
                         
                         if bucket_exists:
                             st.write(f"✅ {bucket_name} (existing bucket)")
@@ -465,7 +660,7 @@ def show_bucket_selection(auth: GraphAuth, tasks: List[Dict[str, Any]], planner_
         
         show_task_creation(auth, tasks, planner_info['id'], selected_bucket_id)
 
-def show_task_creation(auth: GraphAuth, tasks: List[Dict[str, Any]], 
+def show_task_creation(auth: GraphAuth, tasks: List[Task], 
                       plan_id: str, bucket_id: str):
     """Show task creation interface with assignee preview"""
     st.header("🚀 Create Tasks")
@@ -523,7 +718,7 @@ def show_task_creation(auth: GraphAuth, tasks: List[Dict[str, Any]],
     # Show confirmation modal
     show_confirmation_modal(auth, tasks, plan_id, bucket_id)
 
-def show_confirmation_modal(auth: GraphAuth, tasks: List[Dict[str, Any]], 
+def show_confirmation_modal(auth: GraphAuth, tasks: List[Task], 
                            plan_id: str, bucket_id: str):
     """Show confirmation modal with assignee information"""
     
@@ -548,11 +743,12 @@ def show_confirmation_modal(auth: GraphAuth, tasks: List[Dict[str, Any]],
                 bucket_name = bucket['name']
                 break
     
-    # Count assignment statistics
+    # Assignment statistics, counted when the lookup results were applied
+    index = get_task_index(tasks)
     total_tasks = len(tasks)
-    assigned_tasks = sum(1 for task in tasks if task.get("assignee_user"))
-    failed_assignments = sum(1 for task in tasks if task.get("assignee_lookup_failed"))
-    unassigned_tasks = total_tasks - assigned_tasks - failed_assignments
+    assigned_tasks = index.assigned_task_count
+    failed_assignments = index.assignment_failed_task_count
+    unassigned_tasks = index.unassigned_count
     
     # Confirmation modal
     with st.container():
@@ -597,108 +793,168 @@ def show_confirmation_modal(auth: GraphAuth, tasks: List[Dict[str, Any]],
         
         # Create tasks button (enabled only when checkbox is checked)
         col1, col2, col3 = st.columns([1, 2, 1])
+        start_creation = False
         with col2:
             if confirmed:
-                if st.button("🚀 Create All Tasks", type="primary", key="create_tasks_btn"):
-                    create_tasks_with_progress(auth, tasks, plan_id, bucket_id)
+                start_creation = st.button("🚀 Create All Tasks", type="primary", key="create_tasks_btn")
             else:
                 st.button("🚀 Create All Tasks", disabled=True, key="disabled_create_tasks_btn")
                 st.caption("Please check the confirmation box above to enable this button")
+        
+    # Progress and results use the full page width rather than the button column
+    if start_creation:
+        create_tasks_with_progress(auth, tasks, plan_id, bucket_id)
+    if "creation_results" in st.session_state:
+        show_creation_results(auth, tasks, plan_id, bucket_id)
 
-def create_tasks_with_progress(auth: GraphAuth, tasks: List[Dict[str, Any]], 
-                              plan_id: str, bucket_id: str):
-    """Create tasks with progress tracking and assignee support"""
+def create_tasks_with_progress(auth: GraphAuth, tasks: List[Task], 
+                              plan_id: str, bucket_id: str, indexes: Optional[List[int]] = None,
+                              targets: Optional[Dict[int, Tuple[str, str]]] = None):
+    """Create tasks with progress tracking and assignee support
+    
+    With ``indexes`` only those tasks are submitted (the retry queue) and their
+    outcomes replace the matching rows of the previous results. ``targets``
+    maps task positions to their own (plan id, default bucket id) for
+    multi-plan files; each plan's tasks are then created concurrently.
+    """
     access_token = st.session_state.access_token
+    retrying = indexes is not None
+    if indexes is None:
+        indexes = sorted(targets) if targets else list(range(len(tasks)))
     
     progress_bar = st.progress(0)
     status_text = st.empty()
-    results_container = st.container()
     
-    created_count = 0
-    failed_count = 0
-    assigned_count = 0
-    assignment_failed_count = 0
-    failed_tasks = []
+    counts = {"created": 0, "failed": 0, "assigned": 0, "assignment_failed": 0, "done": 0}
     
-    for i, task in enumerate(tasks):
-        status_text.text(f"Creating task {i+1} of {len(tasks)}: {task['title']}")
-        
-        # Determine assignees
-        assignees = []
-        if task.get("assignee_users"):  # Multiple assignees
-            assignees = [user["originalName"] for user in task["assignee_users"]]
-        elif task.get("assignee_user"):  # Single assignee (legacy)
-            assignees = [task["assignee_user"]["originalName"]]
-        elif task.get("assignees"):  # Original assignee list
-            assignees = task["assignees"]
-        elif task.get("assignee") and not task.get("assignee_lookup_failed"):
-            assignees = [task["assignee"]]
+    # One result row per task; rendered once as a table instead of one element per task
+    rows_by_index = {}
+    retry_queue = []
+    throttle = ProgressThrottle(len(indexes))
+    lock = threading.Lock()
+    plan_titles = st.session_state.get("plan_titles", {})
+    
+    report = st.session_state.get("run_report")
+    
+    def create(i: int):
+        task = tasks[i]
+        task_plan_id, task_bucket_id = targets[i] if targets else (plan_id, bucket_id)
+        arguments = creation_arguments(task, task_bucket_id)
+        assignees = task_assignees(task)
         
-        # Determine bucket ID (use task-specific bucket if available)
-        task_bucket_id = bucket_id  # Default bucket
-        if task.get("bucket_info"):
-            task_bucket_id = task["bucket_info"]["id"]
+        failure = {}
+        result = auth.create_task(access_token=access_token, plan_id=task_plan_id, failure=failure, **arguments)
         
-        result = auth.create_task(
-            access_token=access_token,
-            plan_id=plan_id,
-            bucket_id=task_bucket_id,
-            title=task['title'],
-            description=task.get('description', ''),
-            due_date=task.get('due_date'),
-            start_date=task.get('start_date'),
-            assignees=assignees if assignees else None,
-            status=task.get('status')
-        )
+        row = {
+            "Row": i + 1,
+            "Title": task["title"],
+            "Bucket": task["bucket_info"]["name"] if task.get("bucket_info") else "",
+            "Outcome": "",
+            "Assigned To": "",
+            "Details": "",
+        }
+        if targets:
+            row["Plan"] = plan_titles.get(task_plan_id, task_plan_id)
         
-        if result:
-            created_count += 1
-            
-            # Prepare display message with bucket info
-            bucket_info = ""
-            if task.get("bucket_info"):
-                bucket_name = task["bucket_info"]["name"]
-                if not task["bucket_info"]["exact_match"]:
-                    bucket_info = f" in {bucket_name}"
+        with lock:
+            if result:
+                counts["created"] += 1
+                
+                # Check if assignment was successful
+                if result.get("assignedUsers"):  # Multiple assignees
+                    counts["assigned"] += len(result["assignedUsers"])
+                    row["Outcome"] = "✅ Created & Assigned"
+                    row["Assigned To"] = ", ".join(user['displayName'] for user in result["assignedUsers"])
+                elif result.get("assignedUser"):  # Single assignee (legacy)
+                    counts["assigned"] += 1
+                    row["Outcome"] = "✅ Created & Assigned"
+                    row["Assigned To"] = result['assignedUser']['displayName']
+                elif assignees and (task.get("assignee_lookup_failed") or task.get("assignee_lookup_failed_list")):
+                    # Only show warning if user lookup actually failed
+                    counts["assignment_failed"] += 1
+                    failed_names = task.get("assignee_lookup_failed_list", [task.get("assignee", "Unknown")])
+                    row["Outcome"] = "⚠️ Created (user not found)"
+                    row["Details"] = f"Intended for: {', '.join(failed_names)}"
+                elif assignees and not (task.get("assignee_lookup_failed") or task.get("assignee_lookup_failed_list")):
+                    # Users were found, assume assignment worked
+                    counts["assigned"] += len(assignees)
+                    row["Outcome"] = "✅ Created & Assigned"
+                    row["Assigned To"] = ", ".join(assignees)
                 else:
-                    bucket_info = f" in {bucket_name}"
-            
-            # Check if assignment was successful
-            if result.get("assignedUsers"):  # Multiple assignees
-                assigned_count += len(result["assignedUsers"])
-                assignee_names = [user['displayName'] for user in result["assignedUsers"]]
-                with results_container:
-                    st.success(f"✅ Created & Assigned: {task['title']}{bucket_info} → {', '.join(assignee_names)}")
-            elif result.get("assignedUser"):  # Single assignee (legacy)
-                assigned_count += 1
-                with results_container:
-                    st.success(f"✅ Created & Assigned: {task['title']}{bucket_info} → {result['assignedUser']['displayName']}")
-            elif assignees and (task.get("assignee_lookup_failed") or task.get("assignee_lookup_failed_list")):
-                # Only show warning if user lookup actually failed
-                assignment_failed_count += 1
-                failed_names = task.get("assignee_lookup_failed_list", [task.get("assignee", "Unknown")])
-                with results_container:
-                    st.warning(f"⚠️ Created (user not found): {task['title']}{bucket_info} (intended for: {', '.join(failed_names)})")
-            elif assignees and not (task.get("assignee_lookup_failed") or task.get("assignee_lookup_failed_list")):
-                # Users were found, assume assignment worked
-                assigned_count += len(assignees)
-                with results_container:
-                    st.success(f"✅ Created & Assigned: {task['title']}{bucket_info} → {', '.join(assignees)}")
+                    row["Outcome"] = "✅ Created"
             else:
-                with results_container:
-                    st.success(f"✅ Created: {task['title']}{bucket_info}")
-        else:
-            failed_count += 1
-            failed_tasks.append(task)
-            with results_container:
-                st.error(f"❌ Failed: {task['title']}")
-        
-        # Update progress
-        progress_bar.progress((i + 1) / len(tasks))
+                counts["failed"] += 1
+                failure_class = classify_failure(failure.get("status", 0))
+                row["Outcome"] = "❌ Failed"
+                row["Details"] = f"{dict(FAILURE_CLASSES)[failure_class]} ({failure.get('status', 0)}): {failure.get('message', '')}"
+                retry_queue.append({"index": i, "failure": failure_class, "status": failure.get("status", 0)})
+            
+            rows_by_index[i] = row
+            counts["done"] += 1
+            
+            # Redraw a few times per second rather than once per task
+            if throttle.due(counts["done"]):
+                status_text.text(
+                    f"Creating task {counts['done']} of {len(indexes)}: {task['title']} "
+                    f"({counts['created']} created, {counts['failed']} failed)"
+                )
+                progress_bar.progress(counts["done"] / len(indexes))
+    
+    # Tasks of one plan are created in order; different plans run side by side
+    plan_groups = {}
+    for i in indexes:
+        plan_groups.setdefault(targets[i][0] if targets else plan_id, []).append(i)
+    
+    with report_phase(report, "task_creation"), profile_section("task_creation"):
+        run_parallel(
+            {group_plan_id: (lambda rows=rows: [create(i) for i in rows]) for group_plan_id, rows in plan_groups.items()},
+            max_workers=MAX_PARALLEL_PLANS
+        )
     
     # Final results
     status_text.text("Task creation completed!")
     
+    results = {
+        "rows": [rows_by_index[i] for i in indexes],
+        "total": len(indexes),
+        "created": counts["created"],
+        "assigned": counts["assigned"],
+        "assignment_failed": counts["assignment_failed"],
+        "failed": counts["failed"],
+        "retry_queue": sorted(retry_queue, key=lambda entry: entry["index"]),
+    }
+    if retrying:
+        # Fold the retried rows back into the previous run's results
+        results = merge_retry_results(st.session_state.creation_results, results, indexes)
+    
+    report_path = None
+    if report:
+        report.count("created", results["created"])
+        report.count("failed", results["failed"])
+        # The merged queue holds every row still failed, including ones queued before this retry
+        report.count("failed_by_class", {name: sum(1 for entry in results["retry_queue"] if entry["failure"] == name)
+                                         for name, _ in FAILURE_CLASSES})
+        if retrying:
+            report.count("retried", report.counts.get("retried", 0) + len(indexes))
+        if targets:
+            report.count("plans", len(plan_groups))
+        try:
+            report_path = report.save()
+        except OSError as e:
+            st.warning(f"Could not save run report: {str(e)}")
+    
+    # Kept in session state so paging through the results survives reruns
+    st.session_state.creation_results = {**results, "report_path": report_path}
+
+def show_creation_results(auth: GraphAuth, tasks: List[Task], plan_id: str, bucket_id: str,
+                          targets: Optional[Dict[int, Tuple[str, str]]] = None):
+    """Show the summary and paginated per-task results of the last creation run"""
+    results = st.session_state.creation_results
+    created_count = results["created"]
+    assigned_count = results["assigned"]
+    assignment_failed_count = results["assignment_failed"]
+    failed_count = results["failed"]
+    
     st.header("📊 Results Summary")
     
     # Display comprehensive statistics
@@ -713,7 +969,7 @@ def create_tasks_with_progress(auth: GraphAuth, tasks: List[Dict[str, Any]],
         st.metric("❌ Failed", failed_count)
     
     if created_count > 0:
-        st.success(f"Successfully created {created_count} out of {len(tasks)} tasks!")
+        st.success(f"Successfully created {created_count} out of {results['total']} tasks!")
         if assigned_count > 0:
             st.success(f"Successfully assigned {assigned_count} tasks to users!")
         if assignment_failed_count > 0:
@@ -721,18 +977,84 @@ def create_tasks_with_progress(auth: GraphAuth, tasks: List[Dict[str, Any]],
     
     if failed_count > 0:
         st.error(f"Failed to create {failed_count} tasks")
-        with st.expander("Failed Tasks Details"):
-            for task in failed_tasks:
-                st.write(f"- {task['title']}")
+    
+    if results.get("retry_queue"):
+        show_retry_queue(auth, tasks, plan_id, bucket_id, results["retry_queue"], targets)
+    
+    show_result_table(results["rows"])
+    
+    report = st.session_state.get("run_report")
+    if report:
+        show_run_report(report, results.get("report_path"))
     
     # Option to create another batch
     if st.button("🔄 Create More Tasks"):
         # Clear relevant session state
-        keys_to_clear = ["processed_tasks", "current_file_key", "enriched_tasks", "enriched_file_key"]
+        keys_to_clear = ["processed_tasks", "current_file_key", "enrichment_results", "enrichment_key",
+                         "run_report", "run_report_key", "creation_results"]
         for key in keys_to_clear:
             if key in st.session_state:
                 del st.session_state[key]
         st.rerun()
 
+def show_retry_queue(auth: GraphAuth, tasks: List[Task], plan_id: str, bucket_id: str,
+                     retry_queue: List[Dict[str, Any]], targets: Optional[Dict[int, Tuple[str, str]]] = None):
+    """Offer to re-submit only the rows that failed, grouped by why they failed"""
+    st.subheader("🔁 Retry Failed Tasks")
+    
+    labels = dict(FAILURE_CLASSES)
+    counts = {name: sum(1 for entry in retry_queue if entry["failure"] == name) for name, _ in FAILURE_CLASSES}
+    present = [name for name, count in counts.items() if count]
+    st.write(", ".join(f"{counts[name]} {labels[name].lower()}" for name in present))
+    if counts["permission"]:
+        st.caption("Permission failures usually need access to the planner fixed before a retry can succeed.")
+    
+    selected = st.multiselect("Failure types to retry", present, default=present,
+                              format_func=lambda name: f"{labels[name]} ({counts[name]})")
+    indexes = [entry["index"] for entry in retry_queue if entry["failure"] in selected]
+    
+    if st.button(f"🔁 Retry {len(indexes)} failed tasks", disabled=not indexes, key="retry_failed_btn"):
+        # Tasks that fail again join the unselected ones in the next queue
+        create_tasks_with_progress(auth, tasks, plan_id, bucket_id, indexes=indexes, targets=targets)
+        st.rerun()
+
+def show_result_table(rows: List[Dict[str, Any]], page_size: int = 100):
+    """Show per-task results one page at a time, with a CSV download of all rows"""
+    st.subheader("📄 Task Results")
+    
+    show_failed_only = st.checkbox("Show failed and warning rows only", key="creation_results_failed_only")
+    if show_failed_only:
+        rows = [row for row in rows if not row["Outcome"].startswith("✅")]
+    
+    page_count = max(1, (len(rows) + page_size - 1) // page_size)
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Page (1-{page_count})", min_value=1, max_value=page_count, value=1,
+                               key="creation_results_page")
+    start = (page - 1) * page_size
+    st.dataframe(rows[start:start + page_size], use_container_width=True, hide_index=True)
+    if page_count > 1:
+        st.caption(f"Showing rows {start + 1}-{min(start + page_size, len(rows))} of {len(rows)}")
+    
+    output = io.StringIO()
+    fieldnames = list(rows[0]) if rows else ["Row", "Title", "Bucket", "Outcome", "Assigned To", "Details"]
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    st.download_button("Download results (CSV)", output.getvalue(), file_name="task_results.csv", mime="text/csv")
+
+def show_run_report(report: RunReport, saved_path: Optional[str] = None):
+    """Show where the import spent its time, with the saved JSON run report"""
+    st.header("⏱️ Run Timing")
+    st.dataframe(report.rows(), use_container_width=True)
+    st.caption("Bucket and assignee resolution run concurrently, so phases can add up to more than the elapsed time.")
+    
+    if saved_path:
+        st.caption(f"Run report saved to {saved_path}")
+    
+    st.download_button("Download run report (JSON)", report.to_json(),
+                       file_name=f"run_report_{report.started_at.strftime('%Y%m%d_%H%M%S')}.json",
+                       mime="application/json")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
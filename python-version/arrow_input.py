@@ -0,0 +1,96 @@
+"""
+Arrow Input Module
+Parquet, Feather and Arrow IPC files read column by column through pyarrow (optional dependency)
+"""
+
+from __future__ import annotations  # Keeps pd.DataFrame annotations from importing pandas
+
+from typing import Dict, List, Optional
+
+from lazy_imports import lazy_module
+
+pd = lazy_module("pandas")
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_IPC_EXTENSIONS = (".feather", ".arrow", ".ipc")
+ARROW_EXTENSIONS = PARQUET_EXTENSIONS + ARROW_IPC_EXTENSIONS
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ArrowFile:
+    """A columnar file that is only read for the columns actually used
+
+    Column names and the row count come from the file metadata. Single
+    columns are read on demand for the mapping previews, and ``select``
+    reads just the mapped columns. Columns keep their Arrow types (dates
+    stay timestamps), as pandas ``ArrowDtype`` columns that wrap the Arrow
+    buffers instead of converting them.
+    """
+
+    def __init__(self, source, name: str):
+        import pyarrow as pa
+
+        data = source.getvalue() if hasattr(source, "getvalue") else source.read()
+        self.name = name
+        self._buffer = pa.py_buffer(data)  # Zero-copy view of the uploaded bytes
+        self._columns: Dict[str, pd.Series] = {}
+
+        if name.lower().endswith(PARQUET_EXTENSIONS):
+            import pyarrow.parquet as pq
+            self._parquet = pq.ParquetFile(pa.BufferReader(self._buffer))
+            schema = self._parquet.schema_arrow
+            self.num_rows = self._parquet.metadata.num_rows
+            self._table = None
+        else:
+            # Feather v2 is the Arrow IPC file format; buffers are referenced, not decoded
+            self._parquet = None
+            self._table = self._read_ipc(pa)
+            schema = self._table.schema
+            self.num_rows = self._table.num_rows
+        self.columns: List[str] = list(schema.names)
+
+    def _read_ipc(self, pa):
+        try:
+            return pa.ipc.open_file(self._buffer).read_all()
+        except pa.ArrowInvalid:
+            try:
+                return pa.ipc.open_stream(self._buffer).read_all()
+            except pa.ArrowInvalid:
+                import pyarrow.feather as feather
+                return feather.read_table(pa.BufferReader(self._buffer))  # Feather v1
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, column: str) -> pd.Series:
+        if column not in self._columns:
+            self._columns[column] = self.select([column])[column]
+        return self._columns[column]
+
+    def select(self, columns: List[str]) -> pd.DataFrame:
+        """Read only ``columns`` into a DataFrame with Arrow-backed dtypes"""
+        columns = list(dict.fromkeys(columns))  # A column may be mapped to several fields
+        if self._parquet is not None:
+            table = self._parquet.read(columns=columns)
+        else:
+            table = self._table.select(columns)
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def memory_usage(self, deep: bool = False) -> pd.Series:
+        """Bytes held, in the shape ParseCache's size estimate expects from a DataFrame"""
+        return pd.Series([self._buffer.size])
+
+
+def read_arrow_file(source, name: str) -> Optional[ArrowFile]:
+    """Open a Parquet/Feather/Arrow file, or None when pyarrow is not installed"""
+    if not arrow_available():
+        return None
+    return ArrowFile(source, name)
@@ -0,0 +1,284 @@
+"""
+Batch Import
+Imports every CSV/Excel/Parquet file (plain or gzip/xz/zip compressed) in a directory without the Streamlit UI
+
+    python batch_import.py imports/2026-10 --plan "Practice 1 Plan 1"
+    python batch_import.py imports/2026-10 --plan "Admin (Practice Team 2)" --bucket "To do" --max-rps 8
+    python batch_import.py imports/2026-10 --plan <plan id> --output results.csv
+
+Files are parsed in parallel worker processes (parsing is CPU bound) while
+tasks from files that are already parsed are created through one shared pool
+of Graph workers (creation is I/O bound), so the two overlap. All Graph
+requests share one token-bucket rate limit.
+
+Columns are mapped from the header names (COLUMN_SYNONYMS in file_parser.py).
+Files with a Plan column fan out to several plans as in the app; other rows go
+to --plan. Tasks whose bucket name is not found use --bucket, or the plan's
+first bucket. The access token comes from --token or GRAPH_ACCESS_TOKEN,
+otherwise an interactive sign-in is started.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from compressed_input import COMPRESSED_EXTENSIONS
+from file_parser import READABLE_EXTENSIONS, FileParser
+from graph_auth import GraphAuth
+from graph_metrics import graph_metrics
+from plan_fanout import enrich_partitions, match_plans, partition_rows
+from rate_limiter import RateLimiter
+from run_report import RunReport
+from task_creation import FAILURE_CLASSES, classify_failure, creation_arguments
+from task_model import Task, TaskIndex
+
+SUPPORTED_EXTENSIONS = READABLE_EXTENSIONS + COMPRESSED_EXTENSIONS
+RESULT_COLUMNS = ["File", "Row", "Title", "Plan", "Bucket", "Outcome", "Failure", "Status", "Message"]
+
+
+def quiet_streamlit():
+    """Silence the "missing ScriptRunContext" warning st.* calls log outside `streamlit run`"""
+    for logger_name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+                        "streamlit.runtime.scriptrunner.script_run_context"):
+        logging.getLogger(logger_name).disabled = True
+
+
+def find_files(directory: str) -> List[str]:
+    """Spreadsheets in a directory (not recursive), in name order"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith(("~$", "."))
+    )
+
+
+def parse_path(path: str) -> Dict[str, Any]:
+    """Read and map one file; runs in a worker process, so everything returned must pickle"""
+    report = RunReport(os.path.basename(path))
+    file_parser = FileParser(report=report)
+    parsed = {"path": path, "tasks": [], "mapping": {}, "rows": 0, "phases": {}, "error": None}
+    try:
+        with report.phase("file_read"), open(path, "rb") as handle:
+            df = file_parser._read_dataframe(handle)
+        if df is None:
+            parsed["error"] = "unsupported file format"
+            return parsed
+
+        mapping = file_parser.auto_map_columns(list(df.columns))
+        parsed["mapping"] = {field: column for field, column in mapping.items() if column != "None"}
+        parsed["rows"] = len(df)
+        if mapping["title"] == "None":
+            parsed["error"] = f"no title column among {', '.join(map(str, df.columns))}"
+            return parsed
+
+        parsed["tasks"] = file_parser.process_frame(df, mapping)
+    except Exception as e:
+        parsed["error"] = str(e)
+    parsed["phases"] = dict(report.phases)
+    return parsed
+
+
+class BatchImporter:
+    """Resolves parsed files against their plans and queues their tasks on the shared creation pool"""
+
+    def __init__(self, auth: GraphAuth, access_token: str, default_planner: Dict[str, Any],
+                 planners: List[Dict[str, Any]], bucket_name: Optional[str], creators: ThreadPoolExecutor,
+                 report: RunReport):
+        self.auth = auth
+        self.access_token = access_token
+        self.default_planner = default_planner
+        self.planners = planners
+        self.planners_by_id = {planner["id"]: planner for planner in planners}
+        self.bucket_name = bucket_name
+        self.creators = creators
+        self.report = report
+        self.parser = FileParser(report=report)
+        self._default_buckets: Dict[str, Optional[str]] = {}
+
+    def use_report(self, report: RunReport):
+        """Record lookup phases of the files submitted from now on in another run report"""
+        self.report = report
+        self.parser.report = report
+
+    def default_bucket(self, plan_id: str) -> Optional[str]:
+        """Bucket id for tasks without a matching bucket name: --bucket if the plan has it, else its first bucket"""
+        if plan_id not in self._default_buckets:
+            buckets = self.auth.get_planner_buckets(self.access_token, plan_id) or []
+            chosen = buckets[0] if buckets else None
+            if self.bucket_name:
+                chosen = next((bucket for bucket in buckets
+                               if bucket["name"].lower() == self.bucket_name.lower()), chosen)
+            self._default_buckets[plan_id] = chosen["id"] if chosen else None
+        return self._default_buckets[plan_id]
+
+    def targets(self, tasks: List[Task]) -> Tuple[Dict[int, Tuple[str, str]], List[str]]:
+        """(plan id, default bucket id) per task row, after resolving buckets and assignees per plan
+
+        Also returns the plan names that could not be matched; their rows are left out.
+        """
+        index = TaskIndex(tasks)
+        matches = match_plans(sorted(index.plan_names), self.planners)
+        partitions = partition_rows(index, matches, self.default_planner)
+        enrich_partitions(self.parser, self.auth, self.access_token, tasks, partitions, self.planners_by_id)
+
+        targets = {}
+        for plan_id, row_ids in partitions.items():
+            bucket_id = self.default_bucket(plan_id)
+            if bucket_id:
+                targets.update((row_id, (plan_id, bucket_id)) for row_id in row_ids)
+        return targets, [plan_name for plan_name, planner in matches.items() if not planner]
+
+    def submit(self, path: str, tasks: List[Task],
+               row_numbers: Optional[List[int]] = None) -> Tuple[List[Future], int]:
+        """Queue a file's tasks for creation; returns the futures and the number of rows skipped
+
+        ``row_numbers`` gives the file row of each task when only some of a
+        file's tasks are submitted (default: their position in ``tasks``).
+        """
+        targets, unmatched = self.targets(tasks)
+        if unmatched:
+            print(f"  plans not found or ambiguous, rows skipped: {', '.join(unmatched)}")
+
+        futures = [
+            self.creators.submit(self.create, path, row_numbers[row_id] if row_numbers else row_id,
+                                 tasks[row_id], plan_id, bucket_id)
+            for row_id, (plan_id, bucket_id) in sorted(targets.items())
+        ]
+        return futures, len(tasks) - len(targets)
+
+    def create(self, path: str, row_id: int, task: Task, plan_id: str, bucket_id: str) -> Dict[str, Any]:
+        """Create one task and describe the outcome as a result row"""
+        arguments = creation_arguments(task, bucket_id)
+        failure = {}
+        result = self.auth.create_task(access_token=self.access_token, plan_id=plan_id, failure=failure, **arguments)
+
+        status = failure.get("status", 0)
+        return {
+            "File": os.path.basename(path),
+            "Row": row_id + 1,
+            "Title": task["title"],
+            "Plan": self.planners_by_id.get(plan_id, {}).get("title", plan_id),
+            "Bucket": task["bucket_info"]["name"] if task.get("bucket_info") else "",
+            "Outcome": "created" if result else "failed",
+            "Failure": "" if result else classify_failure(status),
+            "Status": "" if result else status,
+            "Message": "" if result else failure.get("message", ""),
+        }
+
+
+def resolve_planner(planners: List[Dict[str, Any]], plan: str) -> Optional[Dict[str, Any]]:
+    """Find the --plan planner by id, title or 'Title (Group)'"""
+    for planner in planners:
+        if planner["id"] == plan:
+            return planner
+    return match_plans([plan], planners)[plan]
+
+
+def write_results(path: str, rows: List[Dict[str, Any]]):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Import every spreadsheet in a directory into Microsoft Planner")
+    arg_parser.add_argument("directory", help="Directory of CSV/XLSX files")
+    arg_parser.add_argument("--plan", required=True, help="Plan id, title or 'Title (Group)' for rows without a plan column")
+    arg_parser.add_argument("--bucket", help="Default bucket name (default: each plan's first bucket)")
+    arg_parser.add_argument("--max-rps", type=float, default=10.0, help="Graph requests per second across all workers")
+    arg_parser.add_argument("--workers", type=int, default=8, help="Concurrent task creations")
+    arg_parser.add_argument("--parse-workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    arg_parser.add_argument("--token", default=os.environ.get("GRAPH_ACCESS_TOKEN"), help="Graph access token")
+    arg_parser.add_argument("--graph-url", help="Graph base URL (default: GRAPH_BASE_URL or Microsoft Graph)")
+    arg_parser.add_argument("--output", help="Write one result row per task to this CSV file")
+    args = arg_parser.parse_args()
+
+    quiet_streamlit()
+    paths = find_files(args.directory)
+    if not paths:
+        print(f"No {'/'.join(SUPPORTED_EXTENSIONS)} files in {args.directory}")
+        return 1
+
+    auth = GraphAuth(args.graph_url, rate_limiter=RateLimiter(args.max_rps))
+    access_token = args.token or auth.authenticate_interactive()
+    if not access_token:
+        print("Sign-in failed")
+        return 1
+
+    planners = auth.get_planners(access_token) or []
+    default_planner = resolve_planner(planners, args.plan)
+    if not default_planner:
+        print(f"Plan '{args.plan}' was not found or is ambiguous; use its id or 'Title (Group)'")
+        return 1
+
+    started = time.perf_counter()
+    report = RunReport(args.directory, default_planner["title"])
+    creation_futures: List[Future] = []
+    creation_started: Optional[float] = None
+    skipped = 0
+    parse_errors = 0
+
+    with ProcessPoolExecutor(max_workers=args.parse_workers, initializer=quiet_streamlit) as parsers, \
+            ThreadPoolExecutor(max_workers=args.workers) as creators:
+        importer = BatchImporter(auth, access_token, default_planner, planners, args.bucket, creators, report)
+
+        # Files are handed to the creation pool as soon as they are parsed, in completion order
+        for future in as_completed([parsers.submit(parse_path, path) for path in paths]):
+            parsed = future.result()
+            for name, seconds in parsed["phases"].items():
+                report.add(name, seconds)
+
+            name = os.path.basename(parsed["path"])
+            if parsed["error"]:
+                parse_errors += 1
+                print(f"{name}: skipped ({parsed['error']})")
+                continue
+
+            print(f"{name}: {len(parsed['tasks'])} tasks from {parsed['rows']} rows "
+                  f"(columns: {', '.join(f'{field}={column}' for field, column in parsed['mapping'].items())})")
+            if creation_started is None:
+                creation_started = time.perf_counter()
+            futures, file_skipped = importer.submit(parsed["path"], parsed["tasks"])
+            creation_futures.extend(futures)
+            skipped += file_skipped
+
+        results = [future.result() for future in creation_futures]
+        if creation_started is not None:
+            # Wall time of the creation stage; per-task times would add up across the workers
+            report.add("task_creation", time.perf_counter() - creation_started)
+
+    elapsed = time.perf_counter() - started
+    outcomes = Counter(row["Outcome"] for row in results)
+    failures = Counter(row["Failure"] for row in results if row["Failure"])
+
+    report.count("files", len(paths))
+    report.count("created", outcomes["created"])
+    report.count("failed", outcomes["failed"])
+    report.count("failed_by_class", {name: failures[name] for name, _ in FAILURE_CLASSES})
+
+    print(f"\n{len(paths)} files, {len(results)} tasks in {elapsed:.1f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} tasks/s): "
+          f"{outcomes['created']} created, {outcomes['failed']} failed, {skipped} skipped, {parse_errors} unreadable files")
+    if failures:
+        print("Failures: " + ", ".join(f"{failures[name]} {label.lower()}" for name, label in FAILURE_CLASSES if failures[name]))
+    print(f"Graph requests: {graph_metrics.total_requests()}, rate limiter wait {auth.rate_limiter.waited:.1f}s (summed over workers)")
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"Results written to {args.output}")
+    try:
+        print(f"Run report saved to {report.save()}")
+    except OSError as e:
+        print(f"Could not save run report: {e}")
+
+    return 1 if outcomes["failed"] or parse_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
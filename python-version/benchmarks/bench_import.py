@@ -0,0 +1,243 @@
+"""
+End-to-End Import Benchmark
+Runs parse → bucket lookup → assignee lookup → task creation against the fake Graph server
+
+    python benchmarks/bench_import.py                                 # steady and throttled scenarios
+    python benchmarks/bench_import.py --scenario throttled --rows 500
+    python benchmarks/bench_import.py --rows 500 --max-rps 20         # override a scenario setting
+    python benchmarks/bench_import.py --save-baseline
+
+Lookup and creation go through BatchImporter, the code path batch_import.py
+and watch_daemon.py use, so retries on 429/Retry-After are measured as they
+happen in a real import. Reports tasks/second, Graph calls per task and
+p50/p95/p99 per-task creation latency per scenario, and compares them with
+benchmarks/baselines/import.json.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import requests
+
+from bench_utils import (
+    BASELINE_DIR, COLUMNS, compare_to_baseline, format_metric, load_baseline, save_baseline, synthetic_rows,
+)
+from batch_import import BatchImporter
+from fake_graph_server import FakeGraphConfig, start_fake_graph
+from file_parser import FileParser
+from graph_auth import GraphAuth
+from graph_metrics import graph_metrics
+from profiling import profile_section
+from run_report import RunReport
+
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, "import.json")
+ACCESS_TOKEN = "benchmark-token"
+
+# Settings each scenario starts from; command-line flags override them
+DEFAULT_SETTINGS = {
+    "rows": 200, "workers": 1, "latency_ms": 80.0, "jitter_ms": 40.0, "error_rate": 0.0,
+    "throttle_rate": 0.0, "max_rps": 0.0, "retry_after": 0.5,
+}
+# "throttled" pushes more requests than the fake server accepts, so creation runs
+# through Graph's 429 + Retry-After handling like a large batch import does
+SCENARIOS = {
+    "steady": {},
+    "throttled": {"workers": 4, "max_rps": 15.0, "throttle_rate": 0.02},
+}
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory stand-in for a Streamlit UploadedFile"""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def synthetic_upload(rows: int, seed: int) -> NamedBytesIO:
+    """A synthetic CSV upload built from the sample files"""
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=COLUMNS)
+    writer.writeheader()
+    writer.writerows(synthetic_rows(rows, seed))
+    return NamedBytesIO(text.getvalue().encode("utf-8"), "benchmark.csv")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(fraction * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def graph_request_count(stats_url: str) -> int:
+    return requests.get(stats_url).json()["total_requests"]
+
+
+def run_import(args) -> Dict[str, Any]:
+    config = FakeGraphConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_requests_per_second=args.max_rps,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+    server = start_fake_graph(config=config, users=args.users)
+    stats_url = server.base_url.rsplit("/", 1)[0] + "/_stats"
+    phases = {}
+
+    try:
+        auth = GraphAuth(graph_url=server.base_url)
+        planners = auth.get_planners(ACCESS_TOKEN)
+        planner = planners[0]
+        requests.post(stats_url)  # Only count calls made by the import itself
+        graph_metrics.reset()
+
+        with ThreadPoolExecutor(max_workers=args.workers) as creators:
+            importer = BatchImporter(auth, ACCESS_TOKEN, planner, planners, None, creators,
+                                     RunReport("benchmark.csv", planner["title"]))
+
+            started = time.perf_counter()
+            upload = synthetic_upload(args.rows, args.seed)
+            with profile_section("parse"):
+                df = importer.parser._read_dataframe(upload)
+                tasks = importer.parser._process_mapped_data(df, *COLUMNS)
+            phases["parse"] = time.perf_counter() - started
+
+            lookup_started = time.perf_counter()
+            targets, _ = importer.targets(tasks)
+            phases["lookup"] = time.perf_counter() - lookup_started
+            lookup_calls = graph_request_count(stats_url)
+
+            def create(row_id: int) -> Tuple[float, Dict[str, Any]]:
+                task_started = time.perf_counter()
+                plan_id, bucket_id = targets[row_id]
+                row = importer.create(upload.name, row_id, tasks[row_id], plan_id, bucket_id)
+                return time.perf_counter() - task_started, row
+
+            create_started = time.perf_counter()
+            with profile_section("task_creation"):
+                outcomes = [future.result() for future in
+                            [creators.submit(create, row_id) for row_id in sorted(targets)]]
+            phases["create"] = time.perf_counter() - create_started
+
+        latencies = [elapsed for elapsed, _ in outcomes]
+        failures = sum(1 for _, row in outcomes if row["Outcome"] == "failed")
+        total_seconds = time.perf_counter() - started
+        stats = requests.get(stats_url).json()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    task_count = len(tasks) or 1
+    return {
+        "tasks": len(tasks),
+        "failed_tasks": failures,
+        "total_seconds": total_seconds,
+        "parse_seconds": phases["parse"],
+        "lookup_seconds": phases["lookup"],
+        "create_seconds": phases["create"],
+        "tasks_per_second": len(tasks) / total_seconds if total_seconds else 0.0,
+        "create_tasks_per_second": len(tasks) / phases["create"] if phases["create"] else 0.0,
+        "graph_calls_per_task": stats["total_requests"] / task_count,
+        "lookup_calls_per_task": lookup_calls / task_count,
+        "throttled_responses": stats["statuses"].get("429", 0),
+        "retried_requests": sum(endpoint["retries"] for endpoint in graph_metrics.to_dict()["endpoints"]),
+        "p50_task_seconds": percentile(latencies, 0.50),
+        "p95_task_seconds": percentile(latencies, 0.95),
+        "p99_task_seconds": percentile(latencies, 0.99),
+        "requests_by_route": stats["requests"],
+    }
+
+
+def scenario_settings(name: str, args) -> argparse.Namespace:
+    """A scenario's settings with any explicitly given flags applied on top"""
+    settings = dict(DEFAULT_SETTINGS, **SCENARIOS[name])
+    settings.update({key: getattr(args, key) for key in DEFAULT_SETTINGS if getattr(args, key) is not None})
+    return argparse.Namespace(**dict(vars(args), **settings))
+
+
+def baseline_key(settings: argparse.Namespace) -> str:
+    # Throughput depends on the simulated latency, so baselines are kept per configuration
+    return (f"import@{settings.rows}:{settings.workers}w:{settings.latency_ms:g}ms:"
+            f"{settings.max_rps:g}rps:{settings.throttle_rate:g}t")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="End-to-end import benchmark against a fake Graph server")
+    arg_parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                            help="Scenario to run, repeatable (default: all)")
+    arg_parser.add_argument("--rows", type=int)
+    arg_parser.add_argument("--workers", type=int, help="Concurrent task creations (the app uses 1 per plan)")
+    arg_parser.add_argument("--latency-ms", type=float, help="Base Graph latency per request")
+    arg_parser.add_argument("--jitter-ms", type=float, help="Random extra latency per request")
+    arg_parser.add_argument("--error-rate", type=float, help="Fraction of requests failing with 503")
+    arg_parser.add_argument("--throttle-rate", type=float, help="Fraction of requests answered with 429")
+    arg_parser.add_argument("--max-rps", type=float, help="Throttle above this many requests per second")
+    arg_parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with 429s")
+    arg_parser.add_argument("--users", type=int, default=400, help="Users in the fake directory")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--output", help="Also write the results to this JSON file")
+    arg_parser.add_argument("--profile", nargs="?", const="both", choices=("cprofile", "sample", "both"),
+                            help="Profile each phase into PLANNER_PROFILE_DIR (see profiling.py)")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before flagging")
+    args = arg_parser.parse_args()
+    if args.profile:
+        os.environ["PLANNER_PROFILE"] = args.profile
+
+    tracked = {}
+    outputs = {}
+    for name in args.scenario or sorted(SCENARIOS):
+        settings = scenario_settings(name, args)
+        key = baseline_key(settings)
+        print(f"== {name} ({key})")
+        result = run_import(settings)
+        routes = result.pop("requests_by_route")
+
+        for metric, value in result.items():
+            print(f"{metric:<26} {format_metric(metric, value) if isinstance(value, float) else value:>12}")
+        print("\nGraph requests by route:")
+        for route, count in sorted(routes.items(), key=lambda item: -item[1]):
+            print(f"  {route:<40} {count}")
+        print()
+
+        outputs[key] = dict(result, requests_by_route=routes, client_metrics=graph_metrics.to_dict())
+        tracked[key] = {metric: result[metric] for metric in (
+            "tasks_per_second", "graph_calls_per_task", "p50_task_seconds", "p95_task_seconds", "p99_task_seconds",
+        )}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(outputs, handle, indent=2)
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(tracked)
+        save_baseline(args.baseline, baseline, {"benchmark": "import"})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(tracked, load_baseline(args.baseline), args.tolerance,
+                                      higher_is_better=("tasks_per_second",))
+    if regressions:
+        print("Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
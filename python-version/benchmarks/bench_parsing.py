@@ -0,0 +1,159 @@
+"""
+Parsing Benchmarks
+Time and peak memory of the upload hot paths on synthetic files, compared against a stored baseline
+
+    python benchmarks/bench_parsing.py                       # 1k and 100k rows
+    python benchmarks/bench_parsing.py --sizes 1000,100000,1000000
+    python benchmarks/bench_parsing.py --save-baseline       # record new numbers
+
+Exits with status 1 when a benchmark is slower (or uses more memory) than
+the baseline by more than the tolerance.
+"""
+
+import argparse
+import gzip
+import io
+import os
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from bench_utils import (
+    BASELINE_DIR, compare_to_baseline, format_metric, load_baseline, measure,
+    save_baseline, synthetic_frame,
+)
+from arrow_input import arrow_available
+from bucket_matcher import BucketMatcher
+from file_parser import FileParser
+from graph_auth import GraphAuth
+from task_model import TaskIndex
+
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, "parsing.json")
+COLUMN_ARGS = ("Title", "Description", "Start Date", "Due Date", "Assignee", "Bucket Name", "Status")
+
+
+class StaticBuckets:
+    """Stands in for GraphAuth where only get_planner_buckets is needed"""
+
+    def __init__(self, buckets: List[Dict[str, Any]]):
+        self.buckets = buckets
+
+    def get_planner_buckets(self, access_token: str, plan_id: str) -> List[Dict[str, Any]]:
+        return list(self.buckets)
+
+
+def plan_buckets(count: int = 200) -> List[Dict[str, Any]]:
+    """A planner bucket list with the template bucket names plus filler buckets"""
+    names = ["Documentation", "Development", "Testing", "Bug Fixes", "Security", "Clinical", "Admin Team"]
+    names += [f"Workstream {i}" for i in range(count - len(names))]
+    return [{"id": f"bucket-{i}", "name": name, "orderHint": f"{i:06d}"} for i, name in enumerate(names)]
+
+
+def upload(data: bytes, name: str) -> Callable[[], io.BytesIO]:
+    """Return a function giving a fresh named in-memory upload of ``data`` per call"""
+    def fresh() -> io.BytesIO:
+        handle = io.BytesIO(data)
+        handle.name = name
+        return handle
+    return fresh
+
+
+def build_benchmarks(rows: int) -> List[Tuple[str, Callable[[], Any]]]:
+    """Prepare inputs for one size and return (name, callable) pairs"""
+    parser = FileParser()
+    auth = GraphAuth()
+    df = synthetic_frame(rows)
+    tasks = parser._process_mapped_data(df, *COLUMN_ARGS)
+    index = TaskIndex(tasks)
+    dates = df["Start Date"].tolist() + df["Due Date"].tolist()
+    names = [name for task in tasks for name in (task.assignees or ())]
+    bucket_auth = StaticBuckets(plan_buckets())
+
+    def resolve_buckets():
+        # Build the matcher each run so the trigram index cost is included
+        BucketMatcher._cache.clear()
+        parser.resolve_buckets(bucket_auth, "token", "plan", index)
+
+    csv_data = df.to_csv(index=False).encode("utf-8")
+    csv_upload = upload(csv_data, "benchmark.csv")
+    gzip_upload = upload(gzip.compress(csv_data, compresslevel=6), "benchmark.csv.gz")
+    benchmarks = [
+        ("read_csv", lambda: parser._read_dataframe(csv_upload())),
+        ("read_csv_gz", lambda: parser._read_dataframe(gzip_upload())),
+        ("process_mapped_data", lambda: parser._process_mapped_data(df, *COLUMN_ARGS)),
+        ("normalize_date", lambda: [parser.normalize_date(value) for value in dates]),
+        ("parse_display_name", lambda: [auth.parse_display_name(name) for name in names]),
+        ("task_index", lambda: TaskIndex(tasks)),
+        ("resolve_buckets", resolve_buckets),
+        ("validate_tasks", lambda: parser.validate_tasks(tasks)),
+    ]
+    
+    if arrow_available():
+        # The same rows as a warehouse export: typed dates plus columns the mapping doesn't use
+        typed = df.copy()
+        for column in ("Start Date", "Due Date"):
+            typed[column] = pd.to_datetime(typed[column], errors="coerce", format="mixed")
+        for i in range(20):
+            typed[f"Metric {i}"] = range(rows)
+        parquet = io.BytesIO()
+        typed.to_parquet(parquet)
+        parquet_upload = upload(parquet.getvalue(), "benchmark.parquet")
+        benchmarks.append(("read_parquet_mapped", lambda: parser._read_dataframe(parquet_upload()).select(list(COLUMN_ARGS))))
+    
+    return benchmarks
+
+
+def run(sizes: List[int], repeats: int, track_memory: bool, only: List[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for rows in sizes:
+        # Large sizes are slow enough that one timed run is representative
+        size_repeats = repeats if rows < 100_000 else 1
+        for name, fn in build_benchmarks(rows):
+            if only and name not in only:
+                continue
+            key = f"{name}@{rows}"
+            results[key] = measure(fn, size_repeats, track_memory)
+            line = f"{key:<32} {format_metric('seconds', results[key]['seconds']):>12}"
+            if "peak_bytes" in results[key]:
+                line += f" {format_metric('peak_bytes', results[key]['peak_bytes']):>12}"
+            if "arrow_peak_bytes" in results[key]:
+                line += f" (pyarrow {format_metric('arrow_peak_bytes', results[key]['arrow_peak_bytes'])})"
+            print(line, flush=True)
+    return results
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark file parsing and enrichment hot paths")
+    arg_parser.add_argument("--sizes", default="1000,100000", help="Comma-separated row counts (e.g. 1000,100000,1000000)")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Timed runs per benchmark below 100k rows")
+    arg_parser.add_argument("--only", default="", help="Comma-separated benchmark names to run")
+    arg_parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    arg_parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed peak memory growth")
+    args = arg_parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    only = [name for name in args.only.split(",") if name]
+    results = run(sizes, args.repeats, not args.no_memory, only)
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline, {"benchmark": "parsing"})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, load_baseline(args.baseline), args.tolerance, args.memory_tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Startup Benchmark
+Cold import time, first script run and rerun cost of the Streamlit app
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeats 10 --save-baseline
+
+Every repeat runs in a fresh interpreter so imports are really cold. The
+script runs use Streamlit's AppTest with GRAPH_ACCESS_TOKEN set for a local
+GRAPH_BASE_URL, so they render the upload screen without signing in or
+calling Graph.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from bench_utils import APP_DIR, BASELINE_DIR, compare_to_baseline, format_metric, load_baseline, save_baseline
+
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, "startup.json")
+HEAVY_MODULES = ("pandas", "msal", "dateutil.parser", "openpyxl")
+
+CHILD_SCRIPT = r"""
+import json, logging, os, sys, time
+started = time.perf_counter()
+import streamlit
+import graph_auth, file_parser, parse_cache, task_model
+imported = time.perf_counter()
+loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+from streamlit.testing.v1 import AppTest
+app_test = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=60)
+run_started = time.perf_counter()
+app_test.run()
+first_run = time.perf_counter() - run_started
+
+reruns = []
+for _ in range(RERUNS):
+    rerun_started = time.perf_counter()
+    app_test.run()
+    reruns.append(time.perf_counter() - rerun_started)
+
+print(json.dumps({
+    "import_seconds": imported - started,
+    "first_run_seconds": first_run,
+    "rerun_seconds": sum(reruns) / len(reruns),
+    "heavy_modules_at_import": loaded,
+    "exception": [str(item.value) for item in app_test.exception],
+}))
+"""
+
+
+def run_child(reruns: int) -> Dict[str, object]:
+    """Measure one cold start in a fresh interpreter"""
+    code = (f"HEAVY_MODULES = {HEAVY_MODULES!r}\nAPP_DIR = {APP_DIR!r}\nRERUNS = {reruns}\n" + CHILD_SCRIPT)
+    # The app only honours a preset token for a local Graph URL; nothing is ever sent to it
+    env = dict(os.environ, GRAPH_ACCESS_TOKEN="startup-benchmark", GRAPH_BASE_URL="http://127.0.0.1:9/v1.0",
+               PYTHONPATH=APP_DIR)
+    completed = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, env=env,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark app cold start and rerun cost")
+    arg_parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters to start (best is kept)")
+    arg_parser.add_argument("--reruns", type=int, default=10, help="Reruns averaged per interpreter")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging")
+    args = arg_parser.parse_args()
+
+    samples: List[Dict[str, object]] = [run_child(args.reruns) for _ in range(args.repeats)]
+    if samples[0]["exception"]:
+        print(f"App raised during the benchmark: {samples[0]['exception']}")
+        return 1
+
+    results = {"startup": {
+        metric: min(sample[metric] for sample in samples)
+        for metric in ("import_seconds", "first_run_seconds", "rerun_seconds")
+    }}
+    for metric, value in results["startup"].items():
+        print(f"{metric:<22} {format_metric(metric, value):>12}")
+    print(f"{'heavy modules loaded':<22} {', '.join(samples[0]['heavy_modules_at_import']) or 'none'}")
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline, {"benchmark": "startup"})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, load_baseline(args.baseline), args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Benchmark Utilities
+Synthetic task files, timing/memory measurement and baseline comparison shared by the benchmarks
+"""
+
+import csv
+import json
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARK_DIR)
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+# st.* calls outside `streamlit run` log a "missing ScriptRunContext" warning
+# each; the logger moved between Streamlit releases, so silence both names
+for _logger_name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+                     "streamlit.runtime.scriptrunner.script_run_context"):
+    logging.getLogger(_logger_name).disabled = True
+
+TEMPLATE_FILES = ("test_tasks.csv", "test_tasks_semicolons.csv")
+COLUMNS = ["Title", "Description", "Start Date", "Due Date", "Assignee", "Bucket Name", "Status"]
+
+# Date layouts seen in real uploads; dateutil has to handle all of them
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d %b %Y", "%Y-%m-%dT%H:%M:%S")
+
+EXTRA_PEOPLE = [
+    "Amelia Patel", "Oliver Jones (SWL PCN)", "Isla Taylor", "Harry Brown (Sutton Health)",
+    "Ava Williams", "Jack Wilson", "Emily Evans (NHS SWL ICB)", "George Thomas",
+]
+
+# Typos and reorderings the fuzzy bucket matcher has to cope with
+BUCKET_VARIANTS = {
+    "Documentation": ["Docs", "Documentaion"],
+    "Development": ["Dev", "Developement"],
+    "Testing": ["Tests", "Testng"],
+    "Clinical": ["Clincal", "Clinical Team"],
+    "Admin": ["Team Admin", "Administration"],
+}
+
+
+def load_templates() -> List[Dict[str, str]]:
+    """Rows of the sample CSV files shipped with the app"""
+    rows = []
+    for file_name in TEMPLATE_FILES:
+        with open(os.path.join(APP_DIR, file_name), newline="", encoding="utf-8") as handle:
+            rows.extend(csv.DictReader(handle))
+    return rows
+
+
+def synthetic_rows(count: int, seed: int = 42, unique_buckets: int = 40) -> List[Dict[str, str]]:
+    """Build count task rows by varying the template rows
+
+    Titles are unique, dates spread over two years in mixed formats, assignees
+    mix template names with extra people, and bucket names include typos and
+    numbered variants so bucket matching sees realistic cardinality.
+    """
+    rng = random.Random(seed)
+    templates = load_templates()
+    buckets = sorted({row["Bucket Name"] for row in templates if row["Bucket Name"]} | set(BUCKET_VARIANTS))
+    start = date(2024, 1, 1)
+    rows = []
+
+    for i in range(count):
+        template = templates[i % len(templates)]
+        row = dict(template)
+        row["Title"] = f"{template['Title']} #{i + 1}"
+
+        if template["Start Date"] or i % 7:
+            day = start + timedelta(days=rng.randrange(730))
+            row["Start Date"] = day.strftime(rng.choice(DATE_FORMATS))
+            row["Due Date"] = (day + timedelta(days=rng.randrange(1, 30))).strftime(rng.choice(DATE_FORMATS))
+
+        if i % 5 == 0:
+            row["Assignee"] = ", ".join(rng.sample(EXTRA_PEOPLE, rng.randint(1, 3)))
+        elif i % 11 == 0:
+            row["Assignee"] = ""
+
+        bucket = rng.choice(buckets)
+        roll = rng.random()
+        if roll < 0.15 and bucket in BUCKET_VARIANTS:
+            bucket = rng.choice(BUCKET_VARIANTS[bucket])
+        elif roll < 0.3:
+            bucket = f"{bucket} {rng.randrange(unique_buckets)}"
+        row["Bucket Name"] = bucket
+
+        rows.append(row)
+
+    return rows
+
+
+def synthetic_frame(count: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic rows as the DataFrame pd.read_csv would produce for them"""
+    df = pd.DataFrame(synthetic_rows(count, seed), columns=COLUMNS)
+    return df.replace("", float("nan"))
+
+
+def write_synthetic_csv(path: str, count: int, seed: int = 42) -> str:
+    """Write a synthetic task CSV (useful for manual testing through the UI)"""
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(synthetic_rows(count, seed))
+    return path
+
+
+@contextmanager
+def arrow_allocations() -> Iterator[Optional[Any]]:
+    """Route pyarrow allocations through a tracking pool while the block runs
+
+    tracemalloc only sees the Python allocator, not the buffers pyarrow
+    allocates for Arrow/Parquet reads and the pyarrow CSV engine. Yields the
+    pool (its max_memory() is the block's pyarrow peak), or None without pyarrow.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        yield None
+        return
+    previous = pa.default_memory_pool()
+    pool = pa.proxy_memory_pool(previous)
+    pa.set_memory_pool(pool)
+    try:
+        yield pool
+    finally:
+        pa.set_memory_pool(previous)
+
+
+def measure(fn: Callable[[], Any], repeats: int = 3, track_memory: bool = True) -> Dict[str, float]:
+    """Time fn (best of repeats) and, separately, record its peak memory
+
+    The memory run is kept apart from the timed runs because tracemalloc
+    slows allocation-heavy code down considerably. ``peak_bytes`` adds the
+    tracemalloc peak and the pyarrow memory pool peak (``arrow_peak_bytes``),
+    an upper bound when the two peak at different moments.
+    """
+    timings = []
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    result = {"seconds": min(timings), "mean_seconds": sum(timings) / len(timings)}
+
+    if track_memory:
+        with arrow_allocations() as arrow_pool:
+            tracemalloc.start()
+            try:
+                fn()
+                result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        arrow_peak = arrow_pool.max_memory() if arrow_pool is not None else 0
+        if arrow_peak:
+            result["arrow_peak_bytes"] = arrow_peak
+            result["peak_bytes"] += arrow_peak
+
+    return result
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """Load stored baseline results, or an empty dict if none exist yet"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle).get("results", {})
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], metadata: Optional[Dict[str, Any]] = None):
+    """Store results as the new baseline"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "metadata": dict(metadata or {}, python=sys.version.split()[0], pandas=pd.__version__),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        time_tolerance: float = 0.25, memory_tolerance: float = 0.25,
+                        higher_is_better: Tuple[str, ...] = ()) -> List[str]:
+    """Return a description of every metric that regressed beyond its tolerance
+
+    Metrics are lower-is-better unless listed in higher_is_better. Memory
+    metrics (names ending in "_bytes") use memory_tolerance.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if not old or metric.startswith("mean_"):
+                continue
+            tolerance = memory_tolerance if metric.endswith("_bytes") else time_tolerance
+            if metric in higher_is_better:
+                regressed = value < old * (1 - tolerance)
+            else:
+                regressed = value > old * (1 + tolerance)
+            if regressed:
+                regressions.append(f"{name} {metric}: {format_metric(metric, old)} -> {format_metric(metric, value)}")
+    return regressions
+
+
+def format_metric(metric: str, value: float) -> str:
+    """Human readable metric value"""
+    if metric.endswith("_bytes"):
+        return f"{value / (1024 * 1024):.1f} MB"
+    if metric.endswith("seconds"):
+        return f"{value * 1000:.1f} ms" if value < 1 else f"{value:.2f} s"
+    return f"{value:.2f}"
@@ -0,0 +1,199 @@
+"""
+Bucket Matcher Module
+Trigram index for fuzzy matching spreadsheet bucket names against planner buckets
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+_SEPARATORS = re.compile(r"[\W_]+")
+_DIGIT = re.compile(r"\d")
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold a name and collapse punctuation and whitespace runs to single spaces (letters of any script are kept)"""
+    return _SEPARATORS.sub(" ", str(name).casefold()).strip()
+
+
+def is_key_token(token: str) -> bool:
+    """Whether a token tells otherwise similar names apart: numbers and single characters ("Week 2", "Team B")"""
+    return len(token) == 1 or _DIGIT.search(token) is not None
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Optimal string alignment distance: insertions, deletions, substitutions and adjacent transpositions
+
+    With a limit, stops early and returns limit + 1 once the distance is known to exceed it.
+    """
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+
+def allowed_edits(a: str, b: str) -> int:
+    """Typos tolerated between two words: none for numbers, letters and words under 3 characters"""
+    if is_key_token(a) or is_key_token(b) or min(len(a), len(b)) < 3:
+        return 0
+    return 1 if max(len(a), len(b)) <= 8 else 2
+
+
+def align_tokens(query: List[str], name: List[str]) -> Optional[int]:
+    """Total edits pairing every word of two names one to one, or None if they don't pair up
+
+    Word order is free ("Team Admin" / "Admin Team") but an extra or missing
+    word never pairs, so "Admin Archive" is not taken for "Admin".
+    """
+    if len(query) != len(name):
+        return None
+    remaining = list(name)
+    unmatched = []
+    for token in query:
+        if token in remaining:
+            remaining.remove(token)
+        else:
+            unmatched.append(token)
+    if any(is_key_token(token) for token in unmatched):
+        return None
+
+    edits = 0
+    for token in unmatched:
+        best = None
+        for position, other in enumerate(remaining):
+            limit = allowed_edits(token, other)
+            if not limit:
+                continue
+            distance = edit_distance(token, other, limit)
+            if distance <= limit and (best is None or distance < best[0]):
+                best = (distance, position)
+        if best is None:
+            return None
+        edits += best[0]
+        remaining.pop(best[1])
+    return edits
+
+
+def trigrams(text: str) -> set:
+    """Return the set of padded character trigrams of a normalised name"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BucketMatcher:
+    """Scores names against a plan's bucket list using a trigram inverted index
+
+    Only buckets sharing at least one trigram with the query are considered,
+    so resolving hundreds of names against large plans stays cheap. A match
+    is accepted only when the words of both names pair up one to one, each
+    pair equal or a small typo apart by edit distance ("Clincal" / "Clinical",
+    "Admn" / "Admin"). Numbers and single letters must agree exactly, so
+    "Practice 3" is not filed under "Practice 1", and a name with an extra
+    word ("Admin Archive") is reported as missing rather than matched to a
+    shorter bucket. Trigram similarity ranks the suggestions for those.
+    """
+
+    _cache: "OrderedDict[Tuple[Tuple[str, str], ...], BucketMatcher]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_size = 16
+
+    def __init__(self, buckets: List[Dict[str, Any]]):
+        self.buckets = list(buckets)
+        self._names = [normalize_name(bucket["name"]) for bucket in self.buckets]
+        self._grams = [trigrams(name) for name in self._names]
+        self._words = [name.split() for name in self._names]
+        self._tokens = [set(words) for words in self._words]
+        self._index: Dict[str, List[int]] = {}
+        for position, grams in enumerate(self._grams):
+            for gram in grams:
+                self._index.setdefault(gram, []).append(position)
+
+    @classmethod
+    def for_buckets(cls, buckets: List[Dict[str, Any]]) -> "BucketMatcher":
+        """Return a matcher for a bucket list, reusing one built for the same buckets"""
+        key = tuple((bucket["id"], bucket["name"]) for bucket in buckets)
+        with cls._cache_lock:
+            matcher = cls._cache.get(key)
+            if matcher is not None:
+                cls._cache.move_to_end(key)
+                return matcher
+        matcher = cls(buckets)
+        with cls._cache_lock:
+            cls._cache[key] = matcher
+            while len(cls._cache) > cls._cache_size:
+                cls._cache.popitem(last=False)
+        return matcher
+
+    def _score(self, query: str) -> List[Tuple[int, float, float]]:
+        """(position, similarity, containment) for every bucket sharing a trigram with a normalised query"""
+        query_grams = trigrams(query)
+        query_tokens = set(query.split())
+
+        # Count shared trigrams per bucket via the inverted index
+        overlap: Dict[int, int] = {}
+        for gram in query_grams:
+            for position in self._index.get(gram, ()):
+                overlap[position] = overlap.get(position, 0) + 1
+
+        scored = []
+        for position, shared in overlap.items():
+            bucket_name = self._names[position]
+            # Dice coefficient over trigrams tolerates typos and transpositions
+            similarity = 2.0 * shared / (len(query_grams) + len(self._grams[position]))
+
+            # Token-set similarity handles reordered words ("Team Admin" / "Admin Team")
+            tokens = self._tokens[position]
+            if query_tokens and tokens:
+                similarity = max(similarity, len(query_tokens & tokens) / len(query_tokens | tokens))
+
+            # Containment ("Docs" / "Docs Archive") ranks suggestions but never accepts a match on its own
+            containment = 0.0
+            if query in bucket_name or bucket_name in query:
+                containment = min(len(query), len(bucket_name)) / max(len(query), len(bucket_name))
+
+            scored.append((position, similarity, containment))
+        return scored
+
+    def candidates(self, name: str, top_k: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to top_k (bucket, score) pairs ordered by descending similarity, as suggestions"""
+        query = normalize_name(name)
+        if not query:
+            return []
+        scored = [(max(similarity, containment), position) for position, similarity, containment in self._score(query)]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self.buckets[position], score) for score, position in scored[:top_k]]
+
+    def best_match(self, name: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Return the bucket whose words pair up with the name's with the fewest typos, or (None, best similarity)
+
+        The score of a match is 1 - edits / length of the longer name.
+        """
+        query = normalize_name(name)
+        if not query:
+            return None, 0.0
+        words = query.split()
+        best = None
+        best_similarity = 0.0
+        for position, similarity, _ in self._score(query):
+            best_similarity = max(best_similarity, similarity)
+            if len(self._words[position]) != len(words):
+                continue
+            edits = align_tokens(words, self._words[position])
+            if edits is not None and (best is None or (edits, -similarity, position) < best):
+                best = (edits, -similarity, position)
+        if best is None:
+            return None, best_similarity
+        edits, _, position = best
+        return self.buckets[position], 1.0 - edits / max(len(query), len(self._names[position]))
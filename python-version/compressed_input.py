@@ -0,0 +1,70 @@
+"""
+Compressed Input Module
+Opens gzip, xz and zip uploads as decompressing streams, so CSV needs no temp file or decompressed copy
+"""
+
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Tuple
+
+COMPRESSED_EXTENSIONS = (".gz", ".xz", ".zip")
+
+# Excel files are zip containers read with many backward seeks, each of which would restart
+# decompression; they are spooled instead (in memory up to SPOOL_MAX_BYTES, then to disk)
+SPOOLED_EXTENSIONS = (".xlsx", ".xls")
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+def inner_name(name: str, members: Optional[list] = None, readable: Tuple[str, ...] = ()) -> str:
+    """Name of the file inside a compressed upload, used to pick its reader
+
+    For gzip and xz the suffix is dropped (``tasks.csv.gz`` -> ``tasks.csv``);
+    a bare ``tasks.gz`` is taken to be CSV. For zip archives it is the first
+    member with a readable extension, skipping folders and macOS metadata.
+    """
+    if members is None:
+        stem = os.path.splitext(name)[0]
+        return stem if stem.lower().endswith(readable) else stem + ".csv"
+    for member in members:
+        if not member.endswith("/") and not member.startswith("__MACOSX/") and member.lower().endswith(readable):
+            return member
+    raise ValueError(f"{name} contains no {', '.join(readable)} file")
+
+
+@contextmanager
+def decompressed(source: IO[bytes], name: str, readable: Tuple[str, ...]) -> Iterator[Tuple[IO[bytes], str]]:
+    """Yield (stream, inner name) for a compressed upload
+
+    The streams decompress block by block as the reader consumes them and
+    are seekable (a backward seek restarts decompression), which the CSV
+    sniffer relies on. Excel files are decompressed once into a spooled file
+    instead. Closing the streams leaves ``source`` open.
+    """
+    lowered = name.lower()
+    if lowered.endswith(".zip"):
+        with zipfile.ZipFile(source) as archive:
+            member = inner_name(name, archive.namelist(), readable)
+            with archive.open(member) as stream, _spooled(stream, member) as readable_stream:
+                yield readable_stream, member
+    else:
+        member = inner_name(name, readable=readable)
+        stream = gzip.GzipFile(fileobj=source, mode="rb") if lowered.endswith(".gz") else lzma.LZMAFile(source)
+        with stream, _spooled(stream, member) as readable_stream:
+            yield readable_stream, member
+
+
+@contextmanager
+def _spooled(stream: IO[bytes], member: str) -> Iterator[IO[bytes]]:
+    """The stream itself, or for Excel members a rewound spooled copy of it"""
+    if not member.lower().endswith(SPOOLED_EXTENSIONS):
+        yield stream
+        return
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        shutil.copyfileobj(stream, spool)
+        spool.seek(0)
+        yield spool
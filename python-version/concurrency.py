@@ -0,0 +1,77 @@
+"""
+Concurrency Module
+Thread pool helpers that keep Streamlit messages working from worker threads
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Outside Streamlit (benchmarks, CLI tools) there is no script context
+    add_script_run_ctx = None
+    get_script_run_ctx = None
+
+
+def with_script_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn so it runs with the caller's Streamlit script context attached
+
+    Without the context, st.* calls made on a worker thread (GraphAuth reports
+    errors with st.error) are silently dropped.
+    """
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    if ctx is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def run_parallel(calls: Dict[str, Callable[[], Any]], max_workers: int = None) -> Dict[str, Any]:
+    """Run independent zero-argument callables concurrently and return their results by name
+
+    The first exception raised by any call is re-raised in the calling thread,
+    so Streamlit control flow such as st.rerun() still reaches the script runner.
+    """
+    if not calls:
+        return {}
+    if len(calls) == 1:
+        name, fn = next(iter(calls.items()))
+        return {name: fn()}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(calls)) as executor:
+        futures = {name: executor.submit(with_script_context(fn)) for name, fn in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def run_dag(steps: Dict[str, Tuple[Sequence[str], Callable[[Dict[str, Any]], Any]]],
+            max_workers: int = None) -> Dict[str, Any]:
+    """Run a small dependency graph of steps, each as soon as its dependencies have finished
+
+    ``steps`` maps a step name to ``(dependencies, fn)``; ``fn`` receives the
+    results of the steps finished so far. Independent steps run concurrently.
+    """
+    results: Dict[str, Any] = {}
+    pending = dict(steps)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(steps) or 1) as executor:
+        running = {}
+        while pending or running:
+            for name, (dependencies, fn) in list(pending.items()):
+                if all(dependency in results for dependency in dependencies):
+                    future = executor.submit(with_script_context(fn), dict(results))
+                    running[future] = name
+                    del pending[name]
+
+            if not running:
+                raise ValueError(f"Steps with unsatisfiable dependencies: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return results
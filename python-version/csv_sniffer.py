@@ -0,0 +1,78 @@
+"""
+CSV Sniffer Module
+Detects the encoding, delimiter and quoting of a CSV file from its first bytes, then parses it
+"""
+
+from __future__ import annotations  # Keeps pd.DataFrame annotations from importing pandas
+
+import codecs
+import csv
+from typing import Dict
+
+from arrow_input import arrow_available
+from lazy_imports import lazy_module
+
+pd = lazy_module("pandas")
+
+SAMPLE_BYTES = 64 * 1024
+SAMPLE_LINES = 50
+DELIMITERS = ",;\t|"
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """Encoding of a CSV sample: a BOM if present, else UTF-8 if it decodes, else cp1252 (Excel on Windows)"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 3:  # Not merely a character cut in half at the end of the sample
+            return "cp1252"
+    return "utf-8"
+
+
+def sniff_dialect(text: str) -> Dict[str, str]:
+    """Delimiter and quote character of CSV text, defaulting to a comma and double quotes"""
+    lines = text.splitlines()[:SAMPLE_LINES]
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS)
+        return {"sep": dialect.delimiter, "quotechar": dialect.quotechar or '"'}
+    except csv.Error:
+        # Too little to go on (e.g. a single column) - use the most common delimiter in the header
+        header = lines[0] if lines else ""
+        delimiter = max(DELIMITERS, key=header.count)
+        return {"sep": delimiter if header.count(delimiter) else ",", "quotechar": '"'}
+
+
+def sniff_csv(sample: bytes) -> Dict[str, str]:
+    """pandas.read_csv options (sep, quotechar, encoding) for a file starting with ``sample``"""
+    encoding = sniff_encoding(sample)
+    text = codecs.decode(sample, encoding, errors="ignore")
+    if len(sample) == SAMPLE_BYTES and "\n" in text:
+        text = text[:text.rindex("\n")]  # Drop the last, probably partial, line
+    return {**sniff_dialect(text), "encoding": encoding}
+
+
+def read_csv(handle) -> pd.DataFrame:
+    """Parse a seekable binary CSV file with sniffed options
+
+    Uses pandas' pyarrow engine (multi-threaded) when pyarrow is installed,
+    falling back to the C engine for files it rejects, such as ragged rows.
+    """
+    start = handle.tell()
+    options = sniff_csv(handle.read(SAMPLE_BYTES))
+    handle.seek(start)
+
+    if arrow_available():
+        try:
+            return pd.read_csv(handle, engine="pyarrow", **options)
+        except Exception:
+            handle.seek(start)
+    try:
+        return pd.read_csv(handle, **options)
+    except UnicodeDecodeError:
+        # cp1252 leaves a few bytes undefined; latin-1 accepts every byte
+        handle.seek(start)
+        return pd.read_csv(handle, **{**options, "encoding": "latin-1"})
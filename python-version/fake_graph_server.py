@@ -0,0 +1,488 @@
+"""
+Fake Microsoft Graph Server
+Local stand-in for the Graph endpoints used by GraphAuth, for offline benchmarking
+
+Serves teams, groups and members, planner plans, buckets, tasks and task
+details (with ETags), user search via $filter/$search and /$batch, with
+configurable latency, error rate and 429 throttling.
+
+Run standalone and point the app at it:
+
+    python fake_graph_server.py --port 8765 --latency-ms 80
+    GRAPH_BASE_URL=http://127.0.0.1:8765/v1.0 GRAPH_ACCESS_TOKEN=fake streamlit run app.py
+
+or start it in-process with start_fake_graph().
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+API_PREFIX = "/v1.0"
+
+FIRST_NAMES = [
+    "Shane", "John", "Jane", "Ed", "Kenny", "Amelia", "Oliver", "Isla", "Harry", "Ava",
+    "Jack", "Emily", "George", "Sophie", "Noah", "Grace", "Leo", "Freya", "Oscar", "Lily",
+]
+LAST_NAMES = [
+    "Sweeney", "Doe", "Smith", "Totton", "Gates", "Patel", "Jones", "Taylor", "Brown", "Williams",
+    "Wilson", "Evans", "Thomas", "Johnson", "Roberts", "Walker", "Wright", "Khan", "Hughes", "Green",
+]
+COMPANIES = ["SWL PCN", "Sutton Health", "NHS SWL ICB"]
+
+ROUTES = [
+    ("GET", re.compile(r"^/me/joinedTeams$"), "me/joinedTeams"),
+    ("GET", re.compile(r"^/me/memberOf$"), "me/memberOf"),
+    ("GET", re.compile(r"^/groups/(?P<group_id>[^/]+)/planner/plans$"), "groups/{id}/planner/plans"),
+    ("GET", re.compile(r"^/groups/(?P<group_id>[^/]+)/members$"), "groups/{id}/members"),
+    ("GET", re.compile(r"^/planner/plans/(?P<plan_id>[^/]+)/buckets$"), "planner/plans/{id}/buckets"),
+    ("POST", re.compile(r"^/planner/buckets$"), "planner/buckets"),
+    ("POST", re.compile(r"^/planner/tasks$"), "planner/tasks"),
+    ("GET", re.compile(r"^/planner/tasks/(?P<task_id>[^/]+)$"), "planner/tasks/{id}"),
+    ("PATCH", re.compile(r"^/planner/tasks/(?P<task_id>[^/]+)$"), "planner/tasks/{id}"),
+    ("GET", re.compile(r"^/planner/tasks/(?P<task_id>[^/]+)/details$"), "planner/tasks/{id}/details"),
+    ("PATCH", re.compile(r"^/planner/tasks/(?P<task_id>[^/]+)/details$"), "planner/tasks/{id}/details"),
+    ("GET", re.compile(r"^/users$"), "users"),
+    ("POST", re.compile(r"^/\$batch$"), "$batch"),
+]
+
+
+class FakeGraphConfig:
+    """Behaviour knobs for the fake service"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, max_requests_per_second: float = 0.0,
+                 retry_after_seconds: float = 1.0, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_requests_per_second = max_requests_per_second
+        self.retry_after_seconds = retry_after_seconds
+        self.seed = seed
+
+
+class FakeGraphState:
+    """In-memory directory and planner data plus request statistics"""
+
+    def __init__(self, config: FakeGraphConfig, groups: int = 2, plans_per_group: int = 2,
+                 buckets_per_plan: int = 5, users: int = 200, members_per_group: int = 50):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.etag_counter = 0
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.groups: Dict[str, Dict[str, Any]] = {}
+        self.plans: Dict[str, Dict[str, Any]] = {}
+        self.buckets: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.details: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.status_counts: Dict[int, int] = {}
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self._seed(groups, plans_per_group, buckets_per_plan, users, members_per_group)
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128)))
+
+    def next_etag(self) -> str:
+        self.etag_counter += 1
+        return f'W/"fake-etag-{self.etag_counter}"'
+
+    def _seed(self, groups: int, plans_per_group: int, buckets_per_plan: int, users: int, members_per_group: int):
+        names = [f"{first} {last}" for last in LAST_NAMES for first in FIRST_NAMES]
+        for i in range(users):
+            base_name = names[i % len(names)]
+            # Some directory names carry an organisation suffix, like real tenants do
+            display_name = f"{base_name} ({COMPANIES[i % len(COMPANIES)]})" if i % 3 == 2 else base_name
+            if i >= len(names):
+                display_name = f"{base_name} {i // len(names) + 1}"
+            user_id = self._new_id()
+            mail_name = base_name.lower().replace(" ", ".")
+            self.users[user_id] = {
+                "id": user_id,
+                "displayName": display_name,
+                "mail": f"{mail_name}{i}@example.nhs.uk",
+                "userPrincipalName": f"{mail_name}{i}@example.nhs.uk",
+            }
+
+        user_ids = list(self.users)
+        for g in range(groups):
+            group_id = self._new_id()
+            members = user_ids[:members_per_group] if g == 0 else self.random.sample(user_ids, min(members_per_group, len(user_ids)))
+            self.groups[group_id] = {"id": group_id, "displayName": f"Practice Team {g + 1}", "members": members}
+            for p in range(plans_per_group):
+                plan_id = self._new_id()
+                self.plans[plan_id] = {"id": plan_id, "title": f"Practice {g + 1} Plan {p + 1}", "groupId": group_id}
+                for b in range(buckets_per_plan):
+                    self._add_bucket(plan_id, ["Documentation", "Development", "Testing", "Clinical", "Admin",
+                                               "Finance", "Estates", "Training"][b % 8] + ("" if b < 8 else f" {b}"))
+
+    def _add_bucket(self, plan_id: str, name: str, order_hint: Optional[str] = None) -> Dict[str, Any]:
+        bucket_id = self._new_id()
+        bucket = {
+            "id": bucket_id,
+            "name": name,
+            "planId": plan_id,
+            "orderHint": order_hint or f"{len(self.buckets):08d}",
+            "@odata.etag": self.next_etag(),
+        }
+        self.buckets[bucket_id] = bucket
+        return bucket
+
+    def record(self, method: str, template: str, status: int):
+        with self.lock:
+            key = f"{method} {template}"
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": dict(self.request_counts),
+                "statuses": {str(status): count for status, count in self.status_counts.items()},
+                "total_requests": sum(self.request_counts.values()),
+                "tasks": len(self.tasks),
+                "buckets": len(self.buckets),
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.request_counts.clear()
+            self.status_counts.clear()
+
+    def should_throttle(self) -> bool:
+        """Random throttling plus an optional requests-per-second ceiling"""
+        with self.lock:
+            if self.config.throttle_rate and self.random.random() < self.config.throttle_rate:
+                return True
+            if self.config.max_requests_per_second:
+                now = time.monotonic()
+                if now - self.window_start >= 1.0:
+                    self.window_start = now
+                    self.window_count = 0
+                self.window_count += 1
+                return self.window_count > self.config.max_requests_per_second
+            return False
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return bool(self.config.error_rate) and self.random.random() < self.config.error_rate
+
+    def latency(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(0, self.config.jitter_ms) if self.config.jitter_ms else 0.0
+        return (self.config.latency_ms + jitter) / 1000.0
+
+
+def _error(status: int, code: str, message: str) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+    return status, {}, {"error": {"code": code, "message": message}}
+
+
+class FakeGraphApp:
+    """Routes Graph requests to handlers; shared by the HTTP server and $batch"""
+
+    def __init__(self, state: FakeGraphState, base_url: str = ""):
+        self.state = state
+        self.base_url = base_url
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], headers: Dict[str, str],
+               body: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, str], Optional[Dict[str, Any]]]:
+        """Return (status, headers, json body) for one request"""
+        for route_method, pattern, template in ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                break
+        else:
+            self.state.record(method, path, 404)
+            return _error(404, "NotFound", f"No fake route for {method} {path}")
+
+        if not headers.get("authorization", "").startswith("Bearer "):
+            result = _error(401, "InvalidAuthenticationToken", "Access token is empty.")
+        elif template != "$batch" and self.state.should_throttle():
+            retry_after = self.state.config.retry_after_seconds
+            result = (429, {"Retry-After": f"{retry_after:g}"},
+                      {"error": {"code": "TooManyRequests", "message": "Too many requests"}})
+        elif template != "$batch" and self.state.should_fail():
+            result = _error(503, "ServiceUnavailable", "Injected failure")
+        else:
+            handler = getattr(self, "_" + re.sub(r"[^a-z]+", "_", template.lower()).strip("_"))
+            result = handler(method=method, query=query, headers=headers, body=body or {}, **match.groupdict())
+
+        self.state.record(method, template, result[0])
+        return result
+
+    # Directory -----------------------------------------------------------
+
+    def _me_joinedteams(self, **_):
+        return 200, {}, {"value": [{"id": g["id"], "displayName": g["displayName"]} for g in self.state.groups.values()]}
+
+    def _me_memberof(self, **_):
+        groups = [{"id": g["id"], "displayName": g["displayName"], "groupTypes": ["Unified"]}
+                  for g in self.state.groups.values()]
+        return 200, {}, {"value": groups}
+
+    def _groups_id_members(self, group_id: str, query, **_):
+        group = self.state.groups.get(group_id)
+        if not group:
+            return _error(404, "Request_ResourceNotFound", "Group not found")
+        top = int(query.get("$top", ["100"])[0])
+        skip = int(query.get("$skiptoken", ["0"])[0])
+        member_ids = group["members"][skip:skip + top]
+        members = [dict(self.state.users[user_id], **{"@odata.type": "#microsoft.graph.user"}) for user_id in member_ids]
+        body = {"value": members}
+        if skip + top < len(group["members"]):
+            body["@odata.nextLink"] = f"{self.base_url}/groups/{group_id}/members?$top={top}&$skiptoken={skip + top}"
+        return 200, {}, body
+
+    def _users(self, query, **_):
+        users = list(self.state.users.values())
+        filter_expr = query.get("$filter", [""])[0]
+        search_expr = query.get("$search", [""])[0]
+        eq = re.match(r"^displayName eq '(.*)'$", filter_expr)
+        startswith = re.match(r"^startswith\(displayName,'(.*)'\)$", filter_expr)
+        search = re.match(r'^"displayName:(.*)"$', search_expr)
+        if eq:
+            value = eq.group(1).replace("''", "'")
+            users = [u for u in users if u["displayName"].lower() == value.lower()]
+        elif startswith:
+            value = startswith.group(1).replace("''", "'").lower()
+            users = [u for u in users if u["displayName"].lower().startswith(value)]
+        elif search:
+            words = search.group(1).lower().split()
+            users = [u for u in users if all(word in u["displayName"].lower() for word in words)]
+        elif filter_expr or search_expr:
+            return _error(400, "Request_UnsupportedQuery", "Unsupported query")
+        return 200, {}, {"value": users[:100]}
+
+    # Planner -------------------------------------------------------------
+
+    def _groups_id_planner_plans(self, group_id: str, **_):
+        plans = [{"id": p["id"], "title": p["title"], "owner": p["groupId"]}
+                 for p in self.state.plans.values() if p["groupId"] == group_id]
+        return 200, {}, {"value": plans}
+
+    def _planner_plans_id_buckets(self, plan_id: str, **_):
+        if plan_id not in self.state.plans:
+            return _error(404, "NotFound", "Plan not found")
+        with self.state.lock:
+            buckets = [dict(b) for b in self.state.buckets.values() if b["planId"] == plan_id]
+        return 200, {}, {"value": buckets}
+
+    def _planner_buckets(self, body, **_):
+        if body.get("planId") not in self.state.plans or not body.get("name"):
+            return _error(400, "BadRequest", "planId and name are required")
+        with self.state.lock:
+            bucket = self.state._add_bucket(body["planId"], body["name"], _resolve_order_hint(body.get("orderHint")))
+        return 201, {"ETag": bucket["@odata.etag"]}, dict(bucket)
+
+    def _planner_tasks(self, body, **_):
+        plan_id = body.get("planId")
+        if plan_id not in self.state.plans or not body.get("title"):
+            return _error(400, "BadRequest", "planId and title are required")
+        if body.get("bucketId") and body["bucketId"] not in self.state.buckets:
+            return _error(400, "BadRequest", "Invalid bucketId")
+        with self.state.lock:
+            task_id = self.state._new_id()
+            task = {
+                "id": task_id,
+                "planId": plan_id,
+                "bucketId": body.get("bucketId"),
+                "title": body["title"],
+                "percentComplete": body.get("percentComplete", 0),
+                "startDateTime": body.get("startDateTime"),
+                "dueDateTime": body.get("dueDateTime"),
+                "assignments": dict(body.get("assignments") or {}),
+                "@odata.etag": self.state.next_etag(),
+            }
+            self.state.tasks[task_id] = task
+            self.state.details[task_id] = {"id": task_id, "description": "", "@odata.etag": self.state.next_etag()}
+        return 201, {"ETag": task["@odata.etag"]}, dict(task)
+
+    def _planner_tasks_id(self, task_id: str, method, headers, body, **_):
+        return self._read_or_patch(self.state.tasks, task_id, headers, body, method)
+
+    def _planner_tasks_id_details(self, task_id: str, method, headers, body, **_):
+        return self._read_or_patch(self.state.details, task_id, headers, body, method)
+
+    def _read_or_patch(self, store: Dict[str, Dict[str, Any]], task_id: str, headers, body, method):
+        with self.state.lock:
+            record = store.get(task_id)
+            if record is None:
+                return _error(404, "NotFound", "Task not found")
+            if method != "PATCH":
+                return 200, {"ETag": record["@odata.etag"]}, dict(record)
+            if headers.get("if-match") != record["@odata.etag"]:
+                return _error(412, "PreconditionFailed", "The ETag does not match")
+            for key, value in body.items():
+                if key == "assignments":
+                    record.setdefault("assignments", {}).update(value)
+                elif key in record or key == "description":
+                    record[key] = value
+            record["@odata.etag"] = self.state.next_etag()
+        return 204, {}, None
+
+    # Batch ---------------------------------------------------------------
+
+    def _batch(self, headers, body, **_):
+        requests_list = body.get("requests", [])
+        if len(requests_list) > 20:
+            return _error(400, "BadRequest", "A batch may contain at most 20 requests")
+        responses = []
+        for item in requests_list:
+            parts = urlsplit(item.get("url", ""))
+            sub_headers = {key.lower(): value for key, value in (item.get("headers") or {}).items()}
+            sub_headers["authorization"] = headers.get("authorization", "")
+            status, response_headers, response_body = self.handle(
+                item.get("method", "GET").upper(), unquote(parts.path), parse_qs(parts.query), sub_headers, item.get("body")
+            )
+            responses.append({"id": item.get("id"), "status": status, "headers": response_headers, "body": response_body})
+        return 200, {}, {"responses": responses}
+
+
+def _resolve_order_hint(order_hint: Optional[str]) -> Optional[str]:
+    """Turn a '<previous> <next>!' hint into a concrete value between the two anchors"""
+    if not order_hint or not order_hint.endswith("!"):
+        return order_hint
+    previous, _, following = order_hint[:-1].partition(" ")
+    if following and previous < following:
+        return previous + "V" if previous + "V" < following else previous + "0V"
+    return (previous or "") + "V"
+
+
+class FakeGraphHandler(BaseHTTPRequestHandler):
+    """HTTP front end for FakeGraphApp"""
+
+    app: FakeGraphApp = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output quiet
+
+    def _respond(self, status: int, headers: Dict[str, str], body: Optional[Dict[str, Any]]):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def _handle(self, method: str):
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        if parts.path == "/_stats":
+            if method == "POST":
+                self.app.state.reset_stats()
+            return self._respond(200, {}, self.app.state.stats())
+
+        if not parts.path.startswith(API_PREFIX):
+            return self._respond(404, {}, {"error": {"code": "NotFound", "message": "Unknown API version"}})
+
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except ValueError:
+            return self._respond(400, {}, {"error": {"code": "BadRequest", "message": "Invalid JSON"}})
+
+        delay = self.app.state.latency()
+        if delay:
+            time.sleep(delay)
+
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        path = unquote(parts.path[len(API_PREFIX):]) or "/"
+        status, response_headers, response_body = self.app.handle(method, path, parse_qs(parts.query), headers, body)
+        self._respond(status, response_headers, response_body)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+
+class FakeGraphServer(ThreadingHTTPServer):
+    """Threaded HTTP server wrapping one FakeGraphState"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[FakeGraphConfig] = None, **seed):
+        self.state = FakeGraphState(config or FakeGraphConfig(), **seed)
+        self.app = FakeGraphApp(self.state)
+        handler = type("BoundFakeGraphHandler", (FakeGraphHandler,), {"app": self.app})
+        super().__init__((host, port), handler)
+        self.app.base_url = self.base_url
+
+    @property
+    def base_url(self) -> str:
+        """Graph base URL to pass to GraphAuth(graph_url=...)"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+
+def start_fake_graph(host: str = "127.0.0.1", port: int = 0, config: Optional[FakeGraphConfig] = None,
+                     **seed) -> FakeGraphServer:
+    """Start a fake Graph server on a background thread; call .shutdown() when done"""
+    server = FakeGraphServer(host, port, config, **seed)
+    thread = threading.Thread(target=server.serve_forever, name="fake-graph", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run a local fake Microsoft Graph service")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency added to every request")
+    arg_parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency up to this value")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 503")
+    arg_parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    arg_parser.add_argument("--max-rps", type=float, default=0.0, help="Throttle above this many requests per second")
+    arg_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    arg_parser.add_argument("--users", type=int, default=200)
+    arg_parser.add_argument("--groups", type=int, default=2)
+    arg_parser.add_argument("--plans-per-group", type=int, default=2)
+    arg_parser.add_argument("--buckets-per-plan", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    config = FakeGraphConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_requests_per_second=args.max_rps,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+    server = FakeGraphServer(
+        args.host, args.port, config,
+        groups=args.groups, plans_per_group=args.plans_per_group,
+        buckets_per_plan=args.buckets_per_plan, users=args.users,
+    )
+    print(f"Fake Graph listening on {server.base_url} (stats at http://{args.host}:{args.port}/_stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,50 @@ File Parser Module
 Handles CSV and Excel file parsing for task data
 """
 
-import pandas as pd
+from __future__ import annotations  # Keeps pd.DataFrame annotations from importing pandas
+
 import streamlit as st
 from typing import List, Dict, Any, Optional
 import io
-from dateutil import parser
-from datetime import datetime
+import re
+import time
+from datetime import date, datetime
+from lazy_imports import lazy_module
+from arrow_input import ARROW_EXTENSIONS, ArrowFile, read_arrow_file
+from compressed_input import COMPRESSED_EXTENSIONS, decompressed
+from csv_sniffer import read_csv
+from parse_cache import ParseCache, compute_content_hash
+from bucket_matcher import BucketMatcher
+from concurrency import run_parallel
+from run_report import RunReport, report_phase
+from profiling import profile_section
+from task_model import Task, TaskIndex, BUCKET_FIELDS, ASSIGNEE_FIELDS, intern_text
+
+# Imported on first use so the sign-in screen doesn't wait for pandas
+pd = lazy_module("pandas")
+parser = lazy_module("dateutil.parser")
+
+# Header names recognised for each task field when batch_import and watch_daemon map columns
+# automatically; the app leaves the mapping to the user
+COLUMN_SYNONYMS = {
+    "title": ("title", "task", "task name", "task title", "name", "subject"),
+    "description": ("description", "notes", "details"),
+    "start_date": ("start date", "start", "start on", "starts"),
+    "due_date": ("due date", "due", "deadline", "due by"),
+    "assignee": ("assignee", "assignees", "assigned to", "owner"),
+    "bucket": ("bucket name", "bucket"),
+    "status": ("status", "progress", "state"),
+    "plan": ("plan", "plan name", "planner"),
+}
+
+# Formats that can be read directly, or from inside a compressed upload
+READABLE_EXTENSIONS = (".csv", ".xlsx", ".xls") + ARROW_EXTENSIONS
 
 class FileParser:
-    def __init__(self):
+    def __init__(self, cache: Optional[ParseCache] = None, report: Optional[RunReport] = None):
+        self.cache = cache
+        self.task_index: Optional[TaskIndex] = None  # Index of the last parsed task list, built once per parse
+        self.report = report
         self.required_columns = ["title", "description", "due_date", "assignee"]
         self.optional_columns = ["title", "description", "due_date", "assignee"]
     
@@ -21,8 +56,14 @@ class FileParser:
             return None
         
         try:
-            # Parse the date string using dateutil (handles many formats)
-            parsed_date = parser.parse(str(date_str))
+            if isinstance(date_str, datetime):
+                # Native timestamps (Parquet/Arrow, Excel) need no string parsing
+                parsed_date = date_str.to_pydatetime() if hasattr(date_str, "to_pydatetime") else date_str
+            elif isinstance(date_str, date):
+                parsed_date = datetime(date_str.year, date_str.month, date_str.day)
+            else:
+                # Parse the date string using dateutil (handles many formats)
+                parsed_date = parser.parse(str(date_str))
             
             # Convert to ISO 8601 format with UTC timezone
             if parsed_date.tzinfo is None:
@@ -40,29 +81,83 @@ class FileParser:
             st.warning(f"Could not parse date '{date_str}': {str(e)}")
             return None
     
-    def parse_file(self, uploaded_file) -> Optional[List[Dict[str, Any]]]:
+    def parse_file(self, uploaded_file, content_hash: Optional[str] = None) -> Optional[List[Task]]:
         """Parse uploaded CSV or Excel file and return list of tasks"""
         try:
-            # Determine file type and read accordingly
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(uploaded_file)
-            else:
-                st.error("Unsupported file format. Please upload a CSV or Excel file.")
-                return None
+            if content_hash is None:
+                content_hash = compute_content_hash(uploaded_file)
+            
+            # Reuse the DataFrame from an earlier rerun of the same content
+            df = self.cache.get(ParseCache.frame_key(content_hash)) if self.cache else None
+            
+            if df is None:
+                with report_phase(self.report, "file_read"), profile_section("file_read"):
+                    df = self._read_dataframe(uploaded_file)
+                if df is None:
+                    return None
+                if self.cache:
+                    self.cache.put(ParseCache.frame_key(content_hash), df)
             
             # Display file info
             st.info(f"File loaded: {uploaded_file.name} with {len(df)} rows")
             
             # Show column mapping interface
-            return self._map_columns(df)
+            return self._map_columns(df, content_hash)
             
         except Exception as e:
             st.error(f"Error parsing file: {str(e)}")
             return None
     
-    def _map_columns(self, df: pd.DataFrame) -> Optional[List[Dict[str, Any]]]:
+    def auto_map_columns(self, columns: List[str]) -> Dict[str, str]:
+        """Guess the column for each task field from the file's headers ("None" when no header matches), for the headless importers"""
+        normalised = {}
+        for column in columns:
+            key = " ".join(str(column).lower().replace("_", " ").replace("-", " ").split())
+            normalised.setdefault(key, column)
+        
+        mapping = {}
+        for field, synonyms in COLUMN_SYNONYMS.items():
+            mapping[field] = next((normalised[name] for name in synonyms if name in normalised), "None")
+        return mapping
+    
+    def process_frame(self, df: pd.DataFrame, mapping: Dict[str, str]) -> List[Task]:
+        """Turn a DataFrame into tasks with a field -> column mapping, without the mapping UI"""
+        return self._process_mapped_data(
+            df, mapping["title"], mapping.get("description", "None"), mapping.get("start_date", "None"),
+            mapping.get("due_date", "None"), mapping.get("assignee", "None"), mapping.get("bucket", "None"),
+            mapping.get("status", "None"), mapping.get("plan", "None")
+        )
+    
+    def _read_dataframe(self, uploaded_file, name: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Read an uploaded CSV or Excel file into a DataFrame
+        
+        Parquet, Feather and Arrow files are returned as an ArrowFile instead,
+        which reads columns only once they are previewed or mapped. Gzip, xz
+        and zip uploads are read through a decompressing stream by the reader
+        for the file inside (``name`` is that file's name).
+        """
+        name = name or uploaded_file.name
+        if name.lower().endswith(COMPRESSED_EXTENSIONS):
+            with decompressed(uploaded_file, name, READABLE_EXTENSIONS) as (stream, inner_name):
+                return self._read_dataframe(stream, inner_name)
+        
+        # Determine file type and read accordingly
+        if name.lower().endswith('.csv'):
+            # Delimiter and encoding vary: semicolons and cp1252 in European Excel exports
+            return read_csv(uploaded_file)
+        elif name.lower().endswith(('.xlsx', '.xls')):
+            return pd.read_excel(uploaded_file)
+        elif name.lower().endswith(ARROW_EXTENSIONS):
+            frame = read_arrow_file(uploaded_file, name)
+            if frame is None:
+                st.error("Reading Parquet, Feather or Arrow files requires pyarrow (`pip install pyarrow`).")
+            return frame
+        else:
+            st.error("Unsupported file format. Please upload a CSV, Excel, Parquet, Feather or Arrow file "
+                     "(optionally as .gz, .xz or .zip).")
+            return None
+    
+    def _map_columns(self, df: pd.DataFrame, content_hash: Optional[str] = None) -> Optional[List[Task]]:
         """Map file columns to required task fields"""
         st.subheader("Column Mapping")
         st.write("Map your file columns to the required task fields:")
@@ -87,6 +182,7 @@ class FileParser:
             st.write("5. Assignee (optional)")
             st.write("6. Bucket Name (optional)")
             st.write("7. Status (optional)")
+            st.write("8. Plan (optional)")
         
         # Column mapping
         title_col = st.selectbox(
@@ -117,7 +213,7 @@ class FileParser:
             "Select Assignee Column (optional):",
             options=["None"] + available_columns,
             index=0,
-            help="Column containing names in format 'FirstName LastName (COMPANY)', 'FirstName LastName', or comma-separated multiple assignees"
+            help="Column containing names in format 'FirstName LastName (COMPANY)', 'FirstName LastName', or multiple assignees separated by commas or semicolons"
         )
         
         bucket_col = st.selectbox(
@@ -134,6 +230,13 @@ class FileParser:
             help="Column containing status like 'In Progress', 'Complete', etc."
         )
         
+        plan_col = st.selectbox(
+            "Select Plan Column (optional):",
+            options=["None"] + available_columns,
+            index=0,
+            help="Column containing plan names, so one file can create tasks in several planners. Rows without a plan use the selected planner"
+        )
+        
         # Show assignee preview if column selected
         if assignee_col != "None":
             st.write("**Assignee Preview:**")
@@ -163,78 +266,140 @@ class FileParser:
         
         # Process the data
         if st.button("Process Data"):
-            return self._process_mapped_data(
-                df, title_col, description_col, start_date_col, due_date_col, assignee_col, bucket_col, status_col
-            )
+            mapping = {
+                "title": title_col,
+                "description": description_col,
+                "start_date": start_date_col,
+                "due_date": due_date_col,
+                "assignee": assignee_col,
+                "bucket": bucket_col,
+                "status": status_col,
+                "plan": plan_col
+            }
+            tasks_key = ParseCache.tasks_key(content_hash, mapping) if self.cache and content_hash else None
+            
+            # Same content with the same mapping - skip re-processing
+            cached_tasks = self.cache.get(tasks_key) if tasks_key else None
+            if cached_tasks is not None:
+                st.success(f"Processed {len(cached_tasks)} tasks from {len(df)} rows (cached)")
+                self.task_index = TaskIndex(cached_tasks)
+                if cached_tasks:
+                    self._show_task_preview(cached_tasks, self.task_index)
+                return cached_tasks
+            
+            with profile_section("parse"):
+                tasks = self._process_mapped_data(
+                    df, title_col, description_col, start_date_col, due_date_col, assignee_col, bucket_col, status_col,
+                    plan_col
+                )
+            
+            st.success(f"Processed {len(tasks)} tasks from {len(df)} rows")
+            
+            # Show preview of processed tasks; the index is kept for the rest of the workflow
+            self.task_index = TaskIndex(tasks)
+            if tasks:
+                self._show_task_preview(tasks, self.task_index)
+            
+            if tasks_key:
+                self.cache.put(tasks_key, tasks)
+            return tasks
         
         return None
     
     def _process_mapped_data(self, df: pd.DataFrame, title_col: str, 
                            description_col: str, start_date_col: str, due_date_col: str, 
-                           assignee_col: str, bucket_col: str, status_col: str) -> List[Dict[str, Any]]:
-        """Process the mapped data into task objects"""
+                           assignee_col: str, bucket_col: str, status_col: str,
+                           plan_col: str = "None") -> List[Task]:
+        """Process the mapped data into task objects (no rendering; callers show the result)"""
         tasks = []
+        read_seconds = 0.0
+        
+        if isinstance(df, ArrowFile):
+            # Columnar files: read just the mapped columns
+            read_started = time.perf_counter()
+            df = df.select([column for column in (title_col, description_col, start_date_col, due_date_col,
+                                                  assignee_col, bucket_col, status_col, plan_col)
+                            if column != "None"])
+            read_seconds = time.perf_counter() - read_started
+        
+        started = time.perf_counter()
+        date_seconds = 0.0
+        
+        # Repeated values share one object across rows instead of a copy per task
+        date_cache = {}
+        assignee_lists = {}
         
         for index, row in df.iterrows():
-            task = {
-                "title": str(row[title_col]) if pd.notna(row[title_col]) else "",
-                "description": "",
-                "start_date": None,
-                "due_date": None,
-                "assignee": None,
-                "bucket_name": None,
-                "status": None
-            }
+            task = Task(title=str(row[title_col]) if pd.notna(row[title_col]) else "")
             
             # Add description if column is selected and not "None"
             if description_col != "None" and pd.notna(row[description_col]):
-                task["description"] = str(row[description_col])
+                task.description = str(row[description_col])
             
             # Add start date if column is selected and not "None"
             if start_date_col != "None" and pd.notna(row[start_date_col]):
-                normalized_start_date = self.normalize_date(row[start_date_col])
-                task["start_date"] = normalized_start_date
+                raw_date = row[start_date_col]
+                if raw_date not in date_cache:
+                    date_started = time.perf_counter()
+                    date_cache[raw_date] = self.normalize_date(raw_date)
+                    date_seconds += time.perf_counter() - date_started
+                task.start_date = date_cache[raw_date]
             
             # Add due date if column is selected and not "None"
             if due_date_col != "None" and pd.notna(row[due_date_col]):
                 # Use the new date normalization function
-                normalized_date = self.normalize_date(row[due_date_col])
-                task["due_date"] = normalized_date
+                raw_date = row[due_date_col]
+                if raw_date not in date_cache:
+                    date_started = time.perf_counter()
+                    date_cache[raw_date] = self.normalize_date(raw_date)
+                    date_seconds += time.perf_counter() - date_started
+                task.due_date = date_cache[raw_date]
             
             # Add assignee if column is selected and not "None"
             if assignee_col != "None" and pd.notna(row[assignee_col]):
                 assignee_name = str(row[assignee_col]).strip()
                 if assignee_name:
-                    # Handle multiple assignees separated by commas
-                    assignees = [name.strip() for name in assignee_name.split(',') if name.strip()]
-                    task["assignee"] = assignee_name  # Keep original for display
-                    task["assignees"] = assignees  # Store as list for processing
+                    if assignee_name not in assignee_lists:
+                        # Handle multiple assignees separated by commas or semicolons
+                        assignee_lists[assignee_name] = tuple(
+                            intern_text(name.strip()) for name in re.split(r'[,;]', assignee_name) if name.strip()
+                        )
+                    task.assignee = intern_text(assignee_name)  # Keep original for display
+                    task.assignees = assignee_lists[assignee_name]  # Store as tuple for processing
             
             # Add bucket name if column is selected and not "None"
             if bucket_col != "None" and pd.notna(row[bucket_col]):
                 bucket_name = str(row[bucket_col]).strip()
                 if bucket_name:
-                    task["bucket_name"] = bucket_name
+                    task.bucket_name = intern_text(bucket_name)
             
             # Add status if column is selected and not "None"
             if status_col != "None" and pd.notna(row[status_col]):
                 status_name = str(row[status_col]).strip()
                 if status_name:
-                    task["status"] = status_name
+                    task.status = intern_text(status_name)
+            
+            # Add plan name if column is selected and not "None"
+            if plan_col != "None" and pd.notna(row[plan_col]):
+                plan_name = str(row[plan_col]).strip()
+                if plan_name:
+                    task.plan_name = intern_text(plan_name)
             
             # Only add tasks with non-empty titles
-            if task["title"].strip():
+            if task.title.strip():
                 tasks.append(task)
         
-        st.success(f"Processed {len(tasks)} tasks from {len(df)} rows")
-        
-        # Show preview of processed tasks
-        if tasks:
-            self._show_task_preview(tasks)
+        if self.report:
+            if read_seconds:
+                self.report.add("file_read", read_seconds)
+            self.report.add("date_normalisation", date_seconds)
+            self.report.add("column_mapping", time.perf_counter() - started - date_seconds)
+            self.report.count("rows", len(df))
+            self.report.count("tasks", len(tasks))
         
         return tasks
     
-    def _show_task_preview(self, tasks: List[Dict[str, Any]]):
+    def _show_task_preview(self, tasks: List[Task], index: Optional[TaskIndex] = None):
         """Show preview of processed tasks with assignee information"""
         st.subheader("Task Preview")
         
@@ -259,41 +424,29 @@ class FileParser:
             st.info(f"Showing first 5 of {len(tasks)} tasks")
         
         # Show assignee statistics
-        assignee_stats = self._get_assignee_statistics(tasks)
+        assignee_stats = self._get_assignee_statistics(tasks, index)
         if assignee_stats:
             st.write("**Assignee Statistics:**")
             for assignee, count in assignee_stats.items():
                 st.write(f"- {assignee}: {count} task(s)")
     
-    def _get_assignee_statistics(self, tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+    def _get_assignee_statistics(self, tasks: List[Task], index: Optional[TaskIndex] = None) -> Dict[str, int]:
         """Get statistics about assignees in the tasks"""
-        assignee_counts = {}
-        unassigned_count = 0
+        index = index or TaskIndex(tasks)
+        assignee_counts = dict(index.assignee_text_counts)
         
-        for task in tasks:
-            assignee = task.get("assignee")
-            if assignee:
-                assignee_counts[assignee] = assignee_counts.get(assignee, 0) + 1
-            else:
-                unassigned_count += 1
-        
-        if unassigned_count > 0:
-            assignee_counts["[Unassigned]"] = unassigned_count
+        if index.unassigned_count > 0:
+            assignee_counts["[Unassigned]"] = index.unassigned_count
         
         return assignee_counts
     
-    def lookup_buckets(self, tasks: List[Dict[str, Any]], auth, access_token: str, plan_id: str) -> List[Dict[str, Any]]:
-        """Lookup bucket names and add bucket information to tasks"""
-        if not tasks or not plan_id:
-            return tasks
-        
-        st.subheader("🗂️ Looking up Buckets")
-        
+    def resolve_buckets(self, auth, access_token: str, plan_id: str, index: TaskIndex) -> Dict[str, Any]:
+        """Match the tasks' bucket names against the planner's buckets without rendering anything"""
         # Get buckets from the selected planner
         buckets = auth.get_planner_buckets(access_token, plan_id)
+        results = {"buckets": buckets, "matches": {}}
         if not buckets:
-            st.warning("No buckets found in the selected planner")
-            return tasks
+            return results
         
         # Create bucket lookup dictionary (case-insensitive)
         bucket_lookup = {}
@@ -305,45 +458,228 @@ class FileParser:
                 'exact_match': bucket_name
             }
         
-        # Get unique bucket names from tasks
-        unique_bucket_names = set()
+        matcher = BucketMatcher.for_buckets(buckets)
+        
+        # Unique bucket names from tasks, in spreadsheet order
+        for bucket_name in index.bucket_rows:
+            # Try exact match first (case-insensitive)
+            if bucket_name.lower() in bucket_lookup:
+                results["matches"][bucket_name] = {
+                    "bucket": bucket_lookup[bucket_name.lower()],
+                    "kind": "exact",
+                    "score": 1.0,
+                    "candidates": []
+                }
+                continue
+            
+            # Try fuzzy matching against the plan's trigram index
+            best_match, best_score = matcher.best_match(bucket_name)
+            if best_match:
+                results["matches"][bucket_name] = {
+                    "bucket": bucket_lookup[best_match['name'].lower()],
+                    "kind": "fuzzy",
+                    "score": best_score,
+                    "candidates": []
+                }
+            else:
+                results["matches"][bucket_name] = {
+                    "bucket": None,
+                    "kind": "missing",
+                    "score": best_score,
+                    "candidates": [(bucket['name'], score) for bucket, score in matcher.candidates(bucket_name, top_k=3)]
+                }
+        
+        return results
+    
+    def resolve_assignees(self, auth, access_token: str, index: TaskIndex,
+                          group_id: Optional[str] = None) -> Dict[str, Any]:
+        """Resolve the tasks' assignee names to directory users without rendering anything"""
+        results = {"member_count": None, "users": {}}
+        unique_assignees = index.assignee_names
+        if not unique_assignees:
+            return results
+        
+        # Only members of the plan's group can be assigned, so resolve against them first
+        member_index = None
+        if group_id:
+            members = auth.get_group_members(access_token, group_id)
+            if members is not None:
+                member_index = auth.build_member_index(members)
+                results["member_count"] = len(members)
+        
+        misses = []
+        for assignee_name in unique_assignees:
+            user = auth.find_member(member_index, assignee_name) if member_index is not None else None
+            if user:
+                results["users"][assignee_name] = {"user": user, "status": "member"}
+            else:
+                misses.append(assignee_name)
+        
+        # Fall back to a tenant-wide directory search for misses, batched
+        if misses:
+            directory_results = auth.batch_search_users(access_token, misses)
+            for assignee_name in misses:
+                user = directory_results.get(assignee_name)
+                if user and member_index is not None:
+                    # Planner rejects assignments to people outside the plan's group
+                    results["users"][assignee_name] = {"user": user, "status": "not_member"}
+                elif user:
+                    results["users"][assignee_name] = {"user": user, "status": "directory"}
+                else:
+                    results["users"][assignee_name] = {"user": None, "status": "not_found"}
+        
+        return results
+    
+    def enrich_tasks(self, tasks: List[Task], auth, access_token: str, plan_id: Optional[str],
+                     index: Optional[TaskIndex] = None, group_id: Optional[str] = None) -> Dict[str, Any]:
+        """Resolve buckets and assignees concurrently, then annotate the tasks in one pass
+
+        Bucket and assignee resolution touch independent Graph resources, so
+        both run at the same time instead of as sequential phases.
+        """
+        index = index or TaskIndex(tasks)
+        
+        def timed(phase, fn):
+            def run():
+                with report_phase(self.report, phase):
+                    return fn()
+            return run
+        
+        calls = {}
+        if plan_id and index.bucket_rows:
+            calls["buckets"] = timed("bucket_resolution", lambda: self.resolve_buckets(auth, access_token, plan_id, index))
+        if index.assignee_rows:
+            calls["assignees"] = timed("assignee_resolution", lambda: self.resolve_assignees(auth, access_token, index, group_id))
+        
+        with profile_section("enrichment"):
+            results = run_parallel(calls)
+            self.apply_enrichment(tasks, index, results.get("buckets"), results.get("assignees"))
+        return results
+    
+    def apply_enrichment(self, tasks: List[Task], index: TaskIndex,
+                         bucket_results: Optional[Dict[str, Any]] = None,
+                         assignee_results: Optional[Dict[str, Any]] = None):
+        """Annotate tasks in place with bucket and assignee lookup results in a single pass"""
+        # Every task for a bucket shares one bucket_info record
+        bucket_infos = {}
+        if bucket_results:
+            for bucket_name, match in bucket_results["matches"].items():
+                matched_bucket = match["bucket"]
+                if matched_bucket:
+                    bucket_infos[bucket_name] = {
+                        "id": matched_bucket["id"],
+                        "name": matched_bucket["name"],
+                        "original_name": bucket_name,
+                        "exact_match": matched_bucket["name"].lower() == bucket_name.lower()
+                    }
+        
+        # Tasks with the same assignees share one user list
+        user_records = {}
+        looked_up = set()
+        if assignee_results:
+            for assignee_name, result in assignee_results["users"].items():
+                looked_up.add(assignee_name)
+                user = result["user"]
+                if user and result["status"] != "not_member":
+                    user_records[assignee_name] = {
+                        "id": user["id"],
+                        "displayName": user["displayName"],
+                        "mail": user.get("mail", ""),
+                        "originalName": assignee_name
+                    }
+        
+        resolved_lists = {}
+        if assignee_results:
+            index.assigned_task_count = index.assignment_failed_task_count = 0
         for task in tasks:
-            if task.get("bucket_name"):
-                unique_bucket_names.add(task["bucket_name"])
+            if bucket_results:
+                task.clear(BUCKET_FIELDS)
+                bucket_name = task.get("bucket_name")
+                if bucket_name and bucket_name in bucket_results["matches"]:
+                    if bucket_name in bucket_infos:
+                        task.bucket_info = bucket_infos[bucket_name]
+                    else:
+                        task.bucket_lookup_failed = True
+            
+            if assignee_results:
+                task.clear(ASSIGNEE_FIELDS)
+                if task.get("assignees"):
+                    # Handle multiple assignees
+                    assignees = task.assignees
+                    if assignees not in resolved_lists:
+                        assignee_users = [user_records[name] for name in assignees if name in user_records]
+                        failed_assignees = [name for name in assignees if name in looked_up and name not in user_records]
+                        resolved_lists[assignees] = (assignee_users or None, failed_assignees or None)
+                    task.assignee_users, task.assignee_lookup_failed_list = resolved_lists[assignees]
+                elif task.get("assignee"):
+                    # Handle single assignee (legacy support)
+                    assignee_name = task.assignee
+                    if assignee_name in looked_up:
+                        if assignee_name in user_records:
+                            task.assignee_user = user_records[assignee_name]
+                        else:
+                            task.assignee_lookup_failed = True
+                
+                # Counted in the same pass so the confirmation step needn't scan the tasks again
+                if task.assignee_users or task.assignee_user:
+                    index.assigned_task_count += 1
+                if task.assignee_lookup_failed_list or task.assignee_lookup_failed:
+                    index.assignment_failed_task_count += 1
+    
+    def lookup_buckets(self, tasks: List[Task], auth, access_token: str, plan_id: str,
+                       index: Optional[TaskIndex] = None) -> List[Task]:
+        """Lookup bucket names and add bucket information to tasks"""
+        if not tasks or not plan_id:
+            return tasks
         
-        if not unique_bucket_names:
-            st.info("No bucket names to lookup")
+        index = index or TaskIndex(tasks)
+        bucket_results = self.resolve_buckets(auth, access_token, plan_id, index)
+        self.apply_enrichment(tasks, index, bucket_results=bucket_results)
+        self.show_bucket_results(tasks, bucket_results, auth, access_token, plan_id, index)
+        return tasks
+    
+    def lookup_assignees(self, tasks: List[Task], auth, access_token: str,
+                         index: Optional[TaskIndex] = None, group_id: Optional[str] = None) -> List[Task]:
+        """Lookup assignees and add user information to tasks"""
+        if not tasks:
             return tasks
         
+        index = index or TaskIndex(tasks)
+        with st.spinner("Looking up assignees..."):
+            assignee_results = self.resolve_assignees(auth, access_token, index, group_id)
+        self.apply_enrichment(tasks, index, assignee_results=assignee_results)
+        self.show_assignee_results(assignee_results)
+        return tasks
+    
+    def show_bucket_results(self, tasks: List[Task], bucket_results: Dict[str, Any], auth,
+                            access_token: str, plan_id: str, index: TaskIndex):
+        """Show bucket mapping results and the interface for creating missing buckets"""
+        st.subheader("🗂️ Looking up Buckets")
+        
+        buckets = bucket_results["buckets"]
+        if not buckets:
+            st.warning("No buckets found in the selected planner")
+            return
+        
+        matches = bucket_results["matches"]
+        if not matches:
+            st.info("No bucket names to lookup")
+            return
+        
         # Show bucket mapping results
         st.write("**Bucket Mapping Results:**")
-        bucket_mapping_results = {}
-        
-        for bucket_name in unique_bucket_names:
-            # Try exact match first (case-insensitive)
-            if bucket_name.lower() in bucket_lookup:
-                matched_bucket = bucket_lookup[bucket_name.lower()]
-                bucket_mapping_results[bucket_name] = matched_bucket
-                st.success(f"✅ Found: {bucket_name} → {matched_bucket['name']}")
+        for bucket_name, match in matches.items():
+            if match["kind"] == "exact":
+                st.success(f"✅ Found: {bucket_name} → {match['bucket']['name']}")
+            elif match["kind"] == "created":
+                st.success(f"🆕 Created: {bucket_name} → {match['bucket']['name']}")
+            elif match["kind"] == "fuzzy":
+                st.warning(f"⚠️ Fuzzy match: {bucket_name} → {match['bucket']['name']} (similarity: {match['score']:.1%})")
+            elif match["candidates"]:
+                suggestions = ", ".join(f"{name} ({score:.0%})" for name, score in match["candidates"])
+                st.error(f"❌ Not found: {bucket_name} (closest: {suggestions})")
             else:
-                # Try fuzzy matching
-                best_match = None
-                best_score = 0
-                
-                for available_bucket_name in bucket_lookup.keys():
-                    # Simple substring matching
-                    if bucket_name.lower() in available_bucket_name or available_bucket_name in bucket_name.lower():
-                        score = min(len(bucket_name), len(available_bucket_name)) / max(len(bucket_name), len(available_bucket_name))
-                        if score > best_score:
-                            best_score = score
-                            best_match = bucket_lookup[available_bucket_name]
-                
-                if best_match and best_score > 0.5:  # 50% similarity threshold
-                    bucket_mapping_results[bucket_name] = best_match
-                    st.warning(f"⚠️ Fuzzy match: {bucket_name} → {best_match['name']} (similarity: {best_score:.1%})")
-                else:
-                    bucket_mapping_results[bucket_name] = None
-                    st.error(f"❌ Not found: {bucket_name}")
+                st.error(f"❌ Not found: {bucket_name}")
                     
         # Available buckets info
         with st.expander("📋 Available Buckets in Planner", expanded=False):
@@ -352,8 +688,7 @@ class FileParser:
                 st.write(f"- {bucket['name']}")
         
         # Handle bucket creation for missing buckets
-        missing_buckets = [bucket_name for bucket_name, match in bucket_mapping_results.items() if not match]
-        created_buckets = {}
+        missing_buckets = [bucket_name for bucket_name, match in matches.items() if not match["bucket"]]
         
         if missing_buckets:
             st.subheader("🔧 Create Missing Buckets")
@@ -391,7 +726,7 @@ class FileParser:
                             st.write(f"🗂️ **{bucket_name}**")
                         
                         with col3:
-                            task_count = sum(1 for task in tasks if task.get('bucket_name') == bucket_name)
+                            task_count = index.bucket_count(bucket_name)
                             st.info(f"{task_count} task(s)")
                         
                         if should_create:
@@ -420,40 +755,39 @@ class FileParser:
                     st.markdown("---")
                     st.write(f"🎯 **Ready to create {len(buckets_to_create)} bucket(s):**")
                     for bucket_name in buckets_to_create:
-                        task_count = sum(1 for task in tasks if task.get('bucket_name') == bucket_name)
+                        task_count = index.bucket_count(bucket_name)
                         st.write(f"- 🗂️ {bucket_name} ({task_count} task(s))")
                     
                     col1, col2 = st.columns([2, 1])
                     with col1:
                         if st.button("🔨 Create Selected Buckets", type="primary"):
                             with st.spinner("Creating buckets..."):
+                                # One batched call; order hints keep the spreadsheet order
+                                with report_phase(self.report, "bucket_creation"):
+                                    created_results = auth.create_buckets(access_token, plan_id, buckets_to_create)
                                 success_count = 0
-                                for bucket_name in buckets_to_create:
-                                    created_bucket = auth.create_bucket(access_token, plan_id, bucket_name)
+                                for bucket_name, created_bucket in created_results.items():
                                     if created_bucket:
                                         success_count += 1
-                                        created_buckets[bucket_name] = {
-                                            'id': created_bucket['id'],
-                                            'name': created_bucket['name'],
-                                            'exact_match': created_bucket['name']
-                                        }
+                                        buckets.append(created_bucket)
                                         # Update the mapping results
-                                        bucket_mapping_results[bucket_name] = created_buckets[bucket_name]
+                                        matches[bucket_name] = {
+                                            "bucket": {
+                                                'id': created_bucket['id'],
+                                                'name': created_bucket['name'],
+                                                'exact_match': created_bucket['name']
+                                            },
+                                            "kind": "created",
+                                            "score": 1.0,
+                                            "candidates": []
+                                        }
                             
                             # Show results and refresh
                             if success_count > 0:
                                 st.success(f"✅ Successfully created {success_count} out of {len(buckets_to_create)} bucket(s)!")
                                 st.info("🔄 Refreshing interface to show new buckets...")
-                                # Clear bucket-related cache to force reload
-                                cache_keys_to_clear = [
-                                    key for key in st.session_state.keys() 
-                                    if any(cache_term in key.lower() for cache_term in ['bucket_enriched', 'bucket_cache'])
-                                ]
-                                for key in cache_keys_to_clear:
-                                    del st.session_state[key]
-                                # Wait a moment for user to see the message
-                                import time
-                                time.sleep(1)
+                                # Point the affected tasks at the new buckets before refreshing
+                                self.apply_enrichment(tasks, index, bucket_results=bucket_results)
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to create any buckets. Please check permissions.")
@@ -465,138 +799,50 @@ class FileParser:
                     with st.expander("🗒️ Bucket Creation Summary", expanded=False):
                         st.write("**Buckets that will be created:**")
                         for bucket_name in buckets_to_create:
-                            task_count = sum(1 for task in tasks if task.get('bucket_name') == bucket_name)
+                            task_count = index.bucket_count(bucket_name)
                             st.write(f"- 🗂️ {bucket_name} ({task_count} task(s))")
                         
                         remaining_missing = [b for b in missing_buckets if b not in buckets_to_create]
                         if remaining_missing:
                             st.write("**Buckets that will use default bucket:**")
                             for bucket_name in remaining_missing:
-                                task_count = sum(1 for task in tasks if task.get('bucket_name') == bucket_name)
+                                task_count = index.bucket_count(bucket_name)
                                 st.write(f"- ❌ {bucket_name} ({task_count} task(s))")
         
-        # Add bucket information to tasks
-        enriched_tasks = []
-        for task in tasks:
-            enriched_task = task.copy()
-            bucket_name = task.get("bucket_name")
-            
-            if bucket_name and bucket_name in bucket_mapping_results:
-                matched_bucket = bucket_mapping_results[bucket_name]
-                if matched_bucket:
-                    enriched_task["bucket_info"] = {
-                        "id": matched_bucket["id"],
-                        "name": matched_bucket["name"],
-                        "original_name": bucket_name,
-                        "exact_match": matched_bucket["name"].lower() == bucket_name.lower()
-                    }
-                else:
-                    enriched_task["bucket_lookup_failed"] = True
-            
-            enriched_tasks.append(enriched_task)
-        
         # Show bucket lookup summary
-        found_count = sum(1 for bucket_name, match in bucket_mapping_results.items() if match)
-        total_count = len(unique_bucket_names)
+        found_count = sum(1 for match in matches.values() if match["bucket"])
+        total_count = len(matches)
         
         st.info(f"Bucket Lookup Complete: {found_count}/{total_count} found")
-        
-        return enriched_tasks
     
-    def lookup_assignees(self, tasks: List[Dict[str, Any]], auth, access_token: str) -> List[Dict[str, Any]]:
-        """Lookup assignees and add user information to tasks"""
-        if not tasks:
-            return tasks
-        
+    def show_assignee_results(self, assignee_results: Dict[str, Any]):
+        """Show the outcome of assignee resolution"""
         st.subheader("🔍 Looking up Assignees")
         
-        # Get unique assignees (including individual names from multi-assignee tasks)
-        unique_assignees = set()
-        for task in tasks:
-            if task.get("assignees"):
-                # Handle multiple assignees
-                for assignee in task["assignees"]:
-                    unique_assignees.add(assignee)
-            elif task.get("assignee"):
-                # Handle single assignee (legacy)
-                unique_assignees.add(task["assignee"])
-        
-        if not unique_assignees:
+        users = assignee_results["users"]
+        if not users:
             st.info("No assignees to lookup")
-            return tasks
-        
-        # Lookup each unique assignee
-        assignee_cache = {}
-        progress_bar = st.progress(0)
-        
-        for i, assignee_name in enumerate(unique_assignees):
-            progress_bar.progress((i + 1) / len(unique_assignees))
-            
-            if assignee_name not in assignee_cache:
-                user = auth.search_user(access_token, assignee_name)
-                assignee_cache[assignee_name] = user
-                
-                if user:
-                    st.success(f"✅ Found: {assignee_name} → {user['displayName']}")
-                else:
-                    st.warning(f"❌ Not found: {assignee_name}")
+            return
         
-        progress_bar.empty()
+        if assignee_results["member_count"] is not None:
+            st.info(f"Matched assignees against {assignee_results['member_count']} plan group member(s)")
         
-        # Add user information to tasks
-        enriched_tasks = []
-        for task in tasks:
-            enriched_task = task.copy()
-            
-            if task.get("assignees"):
-                # Handle multiple assignees
-                assignee_users = []
-                failed_assignees = []
-                
-                for assignee_name in task["assignees"]:
-                    if assignee_name in assignee_cache:
-                        user = assignee_cache[assignee_name]
-                        if user:
-                            assignee_users.append({
-                                "id": user["id"],
-                                "displayName": user["displayName"],
-                                "mail": user.get("mail", ""),
-                                "originalName": assignee_name
-                            })
-                        else:
-                            failed_assignees.append(assignee_name)
-                
-                if assignee_users:
-                    enriched_task["assignee_users"] = assignee_users
-                if failed_assignees:
-                    enriched_task["assignee_lookup_failed_list"] = failed_assignees
-                    
-            elif task.get("assignee"):
-                # Handle single assignee (legacy support)
-                assignee_name = task["assignee"]
-                if assignee_name in assignee_cache:
-                    user = assignee_cache[assignee_name]
-                    if user:
-                        enriched_task["assignee_user"] = {
-                            "id": user["id"],
-                            "displayName": user["displayName"],
-                            "mail": user.get("mail", ""),
-                            "originalName": assignee_name
-                        }
-                    else:
-                        enriched_task["assignee_lookup_failed"] = True
-            
-            enriched_tasks.append(enriched_task)
+        for assignee_name, result in users.items():
+            user = result["user"]
+            if result["status"] == "not_member":
+                st.warning(f"❌ Not a plan member: {assignee_name} → {user['displayName']} is not in the plan's group")
+            elif user:
+                st.success(f"✅ Found: {assignee_name} → {user['displayName']}")
+            else:
+                st.warning(f"❌ Not found: {assignee_name}")
         
         # Show lookup summary
-        found_count = sum(1 for assignee, user in assignee_cache.items() if user)
-        total_count = len(unique_assignees)
+        found_count = sum(1 for result in users.values() if result["user"] and result["status"] != "not_member")
+        total_count = len(users)
         
         st.info(f"Assignee Lookup Complete: {found_count}/{total_count} found")
-        
-        return enriched_tasks
     
-    def validate_tasks(self, tasks: List[Dict[str, Any]]) -> bool:
+    def validate_tasks(self, tasks: List[Task]) -> bool:
         """Validate that all tasks have required fields"""
         if not tasks:
             st.error("No tasks to validate")
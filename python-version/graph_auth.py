@@ -3,16 +3,143 @@ Microsoft Graph Authentication Module
 Handles OAuth2 authentication with Microsoft Graph API using personal Microsoft account
 """
 
-import msal
+import os
 import streamlit as st
 import requests
-from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Collection, Set
+from collections import OrderedDict
 import webbrowser
 import time
 import re
+import threading
+from urllib.parse import quote
+from single_flight import SingleFlight
+from graph_metrics import graph_metrics, endpoint_template, body_size
+from concurrency import run_dag
+from rate_limiter import RateLimiter
+
+DEFAULT_GRAPH_URL = "https://graph.microsoft.com/v1.0"
+
+# Maximum number of requests Microsoft Graph accepts in one $batch call
+GRAPH_BATCH_LIMIT = 20
+
+# How long a completed read may be reused by later identical requests.
+# Directory reads barely change during an import; bucket lists are updated
+# in place whenever buckets are created. ETag reads are never reused.
+DIRECTORY_REUSE_SECONDS = 60.0
+BUCKET_REUSE_SECONDS = 30.0
+
+# Bucket lists kept at once; expired lists are dropped whenever one is stored
+BUCKET_CACHE_MAX_PLANS = 64
+
+# Throttled (429) and briefly unavailable (503) requests are retried after
+# the Retry-After delay Graph sends, or an exponential backoff without one
+GRAPH_MAX_RETRIES = 4
+GRAPH_RETRY_STATUS_CODES = (429, 503)
+GRAPH_MAX_RETRY_WAIT = 30.0
+
+# One pooled HTTP session per process so Graph calls reuse TCP/TLS connections
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+# Identical in-flight GETs (same URL and token) are coalesced process-wide
+_graph_reads = SingleFlight()
+
+# Bucket lists per (token, plan id), updated in place when buckets are created,
+# least recently used first
+_bucket_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_bucket_cache_lock = threading.Lock()
+
+# Characters used for locally generated order hints, in ascending ordinal order
+_ORDER_HINT_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def _get_cached_buckets(access_token: str, plan_id: str) -> Optional[list]:
+    """Return a copy of a recently fetched bucket list, if any"""
+    key = (access_token, plan_id)
+    with _bucket_cache_lock:
+        entry = _bucket_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > BUCKET_REUSE_SECONDS:
+            del _bucket_cache[key]
+            return None
+        _bucket_cache.move_to_end(key)
+        return list(entry[1])
+
+
+def _set_cached_buckets(access_token: str, plan_id: str, buckets: list):
+    """Store a freshly fetched bucket list, dropping expired and least recently used ones"""
+    now = time.monotonic()
+    key = (access_token, plan_id)
+    with _bucket_cache_lock:
+        for stale in [stale for stale, entry in _bucket_cache.items() if now - entry[0] > BUCKET_REUSE_SECONDS]:
+            del _bucket_cache[stale]
+        _bucket_cache[key] = (now, list(buckets))
+        _bucket_cache.move_to_end(key)
+        while len(_bucket_cache) > BUCKET_CACHE_MAX_PLANS:
+            _bucket_cache.popitem(last=False)
+
+
+def _add_cached_buckets(access_token: str, plan_id: str, new_buckets: list):
+    """Append newly created buckets to the cached list instead of re-fetching it"""
+    with _bucket_cache_lock:
+        entry = _bucket_cache.get((access_token, plan_id))
+        if entry:
+            _bucket_cache[(access_token, plan_id)] = (entry[0], entry[1] + list(new_buckets))
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide pooled requests session, creating it on first use"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            # Enough pooled connections for the concurrent lookups and creation steps
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_msal_app(client_id: str, authority: str, msal_apps: Dict[tuple, Any]):
+    """Return the MSAL public client app for a client id from ``msal_apps``, importing msal on first use
+
+    The store belongs to one user (a Streamlit session or a CLI process), never
+    the whole server: an app's token cache signs its accounts in silently.
+    """
+    key = (client_id, authority)
+    app = msal_apps.get(key)
+    if app is None:
+        import msal  # Only needed for interactive sign-in
+        app = msal_apps[key] = msal.PublicClientApplication(client_id, authority=authority)
+    return app
+
+
+def compute_order_hints(last_hint: str, count: int) -> List[str]:
+    """Return Planner '<previous> <next>!' order hints placing count items after last_hint in order
+
+    Each item is placed between two locally generated anchors that sort after
+    last_hint and ascend, so items created concurrently still keep their order.
+    """
+    width = 1
+    while len(_ORDER_HINT_ALPHABET) ** width <= count:
+        width += 1
+    
+    def anchor(position: int) -> str:
+        digits = []
+        for _ in range(width):
+            position, remainder = divmod(position, len(_ORDER_HINT_ALPHABET))
+            digits.append(_ORDER_HINT_ALPHABET[remainder])
+        return last_hint + "".join(reversed(digits))
+    
+    anchors = [last_hint] + [anchor(position) for position in range(1, count + 1)]
+    return [f"{anchors[i]} {anchors[i + 1]}!" for i in range(count)]
 
 class GraphAuth:
-    def __init__(self):
+    def __init__(self, graph_url: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None):
         # Try multiple client IDs that might work better with org restrictions
         self.client_ids = [
             "1950a258-227b-4e31-a9cf-717495945fc2",  # Microsoft Azure CLI client ID
@@ -21,20 +148,78 @@ class GraphAuth:
         ]
         self.tenant_id = "common"  # Use common tenant for personal accounts
         self.scopes = ["https://graph.microsoft.com/.default"]
+        # Overridable so imports can run against a local stand-in (see fake_graph_server.py)
+        self.graph_url = (graph_url or os.environ.get("GRAPH_BASE_URL") or DEFAULT_GRAPH_URL).rstrip("/")
+        # Optional pacing shared by all threads using this client (batch imports)
+        self.rate_limiter = rate_limiter
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a Graph request, waiting and retrying while Graph throttles it
+
+        Every call is recorded in graph_metrics with its endpoint template,
+        final status, total latency (including waits), retries and bytes.
+        """
+        started = time.perf_counter()
+        throttled = 0
+        status = 0
+        response = None
+        try:
+            for attempt in range(GRAPH_MAX_RETRIES + 1):
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                response = get_http_session().request(method, url, **kwargs)
+                status = response.status_code
+                throttled += status == 429
+                if status not in GRAPH_RETRY_STATUS_CODES or attempt == GRAPH_MAX_RETRIES:
+                    return response
+                time.sleep(self._retry_delay(response, attempt))
+            return response
+        finally:
+            graph_metrics.record(
+                method,
+                endpoint_template(url, self.graph_url),
+                status,  # 0 when the request raised before any response
+                time.perf_counter() - started,
+                retries=attempt,
+                throttled=throttled,
+                request_bytes=body_size(kwargs),
+                response_bytes=len(response.content) if response is not None else 0
+            )
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a throttled response"""
+        try:
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = 0.5 * (2 ** attempt)
+        return min(max(delay, 0.0), GRAPH_MAX_RETRY_WAIT)
     
-    def authenticate_interactive(self) -> Optional[str]:
-        """Authenticate using interactive browser flow with multiple client IDs"""
+    def _get(self, url: str, headers: Dict[str, str], max_age: float = 0.0) -> requests.Response:
+        """GET a Graph URL, sharing the response with identical concurrent requests"""
+        key = ("GET", url, headers.get("Authorization"))
+        return _graph_reads.do(
+            key,
+            lambda: self._request("GET", url, headers=headers),
+            max_age=max_age,
+            cache_if=lambda response: response.status_code == 200
+        )
+    
+    def authenticate_interactive(self, msal_apps: Optional[Dict[tuple, Any]] = None) -> Optional[str]:
+        """Authenticate using interactive browser flow with multiple client IDs
+        
+        ``msal_apps`` is the caller's per-user store of MSAL apps; accounts
+        already signed in through it are reused silently. Without one every
+        call starts a fresh sign-in.
+        """
         authority = f"https://login.microsoftonline.com/{self.tenant_id}"
+        msal_apps = {} if msal_apps is None else msal_apps
         
         # Try each client ID until one works
         for i, client_id in enumerate(self.client_ids):
             try:
                 st.info(f"**Trying authentication method {i+1} of {len(self.client_ids)}...**")
                 
-                app = msal.PublicClientApplication(
-                    client_id,
-                    authority=authority
-                )
+                app = get_msal_app(client_id, authority, msal_apps)
                 
                 # Try to get token silently first
                 accounts = app.get_accounts()
@@ -75,6 +260,30 @@ class GraphAuth:
         st.error("❌ All authentication methods failed")
         return None
     
+    def acquire_token_silent(self, msal_apps: Dict[tuple, Any]) -> Optional[str]:
+        """A current token for an account already signed in through ``msal_apps``, never prompting
+        
+        MSAL returns the cached token while it is valid and redeems the refresh
+        token near expiry. None when no account is signed in or refreshing fails.
+        """
+        for app in list(msal_apps.values()):
+            for account in app.get_accounts():
+                try:
+                    result = app.acquire_token_silent(self.scopes, account=account)
+                except Exception:
+                    continue
+                if result and "access_token" in result:
+                    return result["access_token"]
+        return None
+    
+    def sign_out(self, msal_apps: Optional[Dict[tuple, Any]]):
+        """Remove every account from a per-user MSAL app store so the next sign-in prompts again"""
+        for app in (msal_apps or {}).values():
+            for account in app.get_accounts():
+                app.remove_account(account)
+        if msal_apps:
+            msal_apps.clear()
+    
     def get_planners(self, access_token: str) -> Optional[list]:
         """Get list of planners from Microsoft Graph"""
         headers = {
@@ -84,9 +293,10 @@ class GraphAuth:
         
         try:
             # Get teams first
-            response = requests.get(
-                "https://graph.microsoft.com/v1.0/me/joinedTeams",
-                headers=headers
+            response = self._get(
+                f"{self.graph_url}/me/joinedTeams",
+                headers=headers,
+                max_age=DIRECTORY_REUSE_SECONDS
             )
             
             if response.status_code == 401:
@@ -108,9 +318,10 @@ class GraphAuth:
                     group_name = team.get("displayName", "Unknown Group")
                     
                     # Get plans for this group
-                    plans_response = requests.get(
-                        f"https://graph.microsoft.com/v1.0/groups/{group_id}/planner/plans",
-                        headers=headers
+                    plans_response = self._get(
+                        f"{self.graph_url}/groups/{group_id}/planner/plans",
+                        headers=headers,
+                        max_age=DIRECTORY_REUSE_SECONDS
                     )
                     
                     if plans_response.status_code == 200:
@@ -143,9 +354,10 @@ class GraphAuth:
         
         try:
             # Try to get groups
-            response = requests.get(
-                "https://graph.microsoft.com/v1.0/me/memberOf?$filter=groupTypes/any(c:c eq 'Unified')",
-                headers=headers
+            response = self._get(
+                f"{self.graph_url}/me/memberOf?$filter=groupTypes/any(c:c eq 'Unified')",
+                headers=headers,
+                max_age=DIRECTORY_REUSE_SECONDS
             )
             
             if response.status_code == 200:
@@ -157,9 +369,10 @@ class GraphAuth:
                     group_name = group.get("displayName", "Unknown Group")
                     
                     # Get plans for this group
-                    plans_response = requests.get(
-                        f"https://graph.microsoft.com/v1.0/groups/{group_id}/planner/plans",
-                        headers=headers
+                    plans_response = self._get(
+                        f"{self.graph_url}/groups/{group_id}/planner/plans",
+                        headers=headers,
+                        max_age=DIRECTORY_REUSE_SECONDS
                     )
                     
                     if plans_response.status_code == 200:
@@ -183,7 +396,8 @@ class GraphAuth:
             st.error(f"Error in fallback method: {str(e)}")
             return None
     
-    def create_bucket(self, access_token: str, plan_id: str, bucket_name: str) -> Optional[Dict[str, Any]]:
+    def create_bucket(self, access_token: str, plan_id: str, bucket_name: str,
+                      order_hint: str = " !") -> Optional[Dict[str, Any]]:
         """Create a new bucket in Microsoft Planner"""
         headers = {
             "Authorization": f"Bearer {access_token}",
@@ -193,12 +407,13 @@ class GraphAuth:
         bucket_data = {
             "name": bucket_name,
             "planId": plan_id,
-            "orderHint": " !"
+            "orderHint": order_hint
         }
         
         try:
-            response = requests.post(
-                "https://graph.microsoft.com/v1.0/planner/buckets",
+            response = self._request(
+                "POST",
+                f"{self.graph_url}/planner/buckets",
                 headers=headers,
                 json=bucket_data
             )
@@ -214,6 +429,7 @@ class GraphAuth:
                 return None
             elif response.status_code == 201:
                 bucket = response.json()
+                _add_cached_buckets(access_token, plan_id, [bucket])
                 st.success(f"✅ Created bucket: {bucket_name}")
                 return bucket
             else:
@@ -224,6 +440,53 @@ class GraphAuth:
             st.error(f"Error creating bucket '{bucket_name}': {str(e)}")
             return None
     
+    def create_buckets(self, access_token: str, plan_id: str, bucket_names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Create several buckets at once through $batch, keeping their spreadsheet order
+
+        Order hints are computed locally so the batched requests can run in any
+        order, and the created records go straight into the bucket cache.
+        """
+        results = {bucket_name: None for bucket_name in bucket_names}
+        if not bucket_names:
+            return results
+        
+        existing_buckets = self.get_planner_buckets(access_token, plan_id) or []
+        last_hint = max((bucket.get("orderHint") or "" for bucket in existing_buckets), default="")
+        order_hints = compute_order_hints(last_hint, len(bucket_names))
+        
+        batch_requests = []
+        for i, bucket_name in enumerate(bucket_names):
+            batch_requests.append({
+                "id": str(i),
+                "method": "POST",
+                "url": "/planner/buckets",
+                "headers": {"Content-Type": "application/json"},
+                "body": {"name": bucket_name, "planId": plan_id, "orderHint": order_hints[i]}
+            })
+        
+        responses = self._post_batch(access_token, batch_requests)
+        
+        created = []
+        for i, bucket_name in enumerate(bucket_names):
+            response = responses.get(str(i)) or {}
+            status = response.get("status")
+            body = response.get("body") or {}
+            
+            if status == 201:
+                results[bucket_name] = body
+                created.append(body)
+            elif status in (401, 403):
+                error_message = body.get("error", {}).get("message", "Access denied")
+                st.error(f"❌ Could not create bucket '{bucket_name}': {error_message}")
+            else:
+                # Rejected hint or lost batch response - create this one on its own
+                results[bucket_name] = self.create_bucket(access_token, plan_id, bucket_name)
+        
+        if created:
+            _add_cached_buckets(access_token, plan_id, created)
+        
+        return results
+    
     def get_planner_buckets(self, access_token: str, plan_id: str) -> Optional[list]:
         """Get buckets for a specific planner"""
         headers = {
@@ -231,9 +494,13 @@ class GraphAuth:
             "Content-Type": "application/json"
         }
         
+        cached_buckets = _get_cached_buckets(access_token, plan_id)
+        if cached_buckets is not None:
+            return cached_buckets
+        
         try:
-            response = requests.get(
-                f"https://graph.microsoft.com/v1.0/planner/plans/{plan_id}/buckets",
+            response = self._get(
+                f"{self.graph_url}/planner/plans/{plan_id}/buckets",
                 headers=headers
             )
             
@@ -244,7 +511,9 @@ class GraphAuth:
                 st.rerun()
                 return None
             elif response.status_code == 200:
-                return response.json().get("value", [])
+                buckets = response.json().get("value", [])
+                _set_cached_buckets(access_token, plan_id, buckets)
+                return list(buckets)
             else:
                 st.error(f"Failed to get buckets: {response.text}")
                 return None
@@ -301,8 +570,82 @@ class GraphAuth:
             "displayName": display_name
         }
     
-    def search_user(self, access_token: str, assignee_name: str) -> Optional[Dict[str, Any]]:
-        """Search for a user by display name using Microsoft Graph"""
+    def get_group_members(self, access_token: str, group_id: str) -> Optional[list]:
+        """Get all user members of a group (the people a plan's tasks can be assigned to)"""
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        
+        url = f"{self.graph_url}/groups/{group_id}/members?$select=id,displayName,mail,userPrincipalName&$top=999"
+        members = []
+        
+        try:
+            # Follow paging links until the whole membership has been read
+            while url:
+                response = self._get(url, headers=headers, max_age=DIRECTORY_REUSE_SECONDS)
+                
+                if response.status_code != 200:
+                    st.warning(f"Could not load plan group members: {response.status_code}")
+                    return None
+                
+                data = response.json()
+                for member in data.get("value", []):
+                    member_type = member.get("@odata.type", "#microsoft.graph.user")
+                    if member_type == "#microsoft.graph.user" and member.get("id"):
+                        members.append(member)
+                url = data.get("@odata.nextLink")
+            
+            return members
+            
+        except Exception as e:
+            st.warning(f"Error loading plan group members: {str(e)}")
+            return None
+    
+    def build_member_index(self, members: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index group members by lower-cased display name and parsed 'FirstName LastName'"""
+        member_index = {}
+        for member in members:
+            display_name = member.get("displayName") or ""
+            if not display_name:
+                continue
+            member_index.setdefault(display_name.lower(), member)
+            parsed_name = self.parse_display_name(display_name)
+            if parsed_name and parsed_name["fullName"]:
+                member_index.setdefault(parsed_name["fullName"].lower(), member)
+        return member_index
+    
+    def find_member(self, member_index: Dict[str, Dict[str, Any]], assignee_name: str) -> Optional[Dict[str, Any]]:
+        """Resolve an assignee name against an indexed group membership without any Graph calls"""
+        if not assignee_name or not assignee_name.strip():
+            return None
+        
+        parsed_name = self.parse_display_name(assignee_name)
+        if not parsed_name:
+            return None
+        
+        # Exact matches on the original string or 'FirstName LastName'
+        for key in (parsed_name["displayName"].strip().lower(), parsed_name["fullName"].lower()):
+            if key in member_index:
+                return member_index[key]
+        
+        # Same rule as search_user: display name contains both first and last name
+        first_name = parsed_name["firstName"].lower()
+        last_name = parsed_name["lastName"].lower()
+        if first_name and last_name:
+            for key, member in member_index.items():
+                if first_name in key and last_name in key:
+                    return member
+        
+        return None
+    
+    def search_user(self, access_token: str, assignee_name: str,
+                    exact_tried: Collection[str] = ()) -> Optional[Dict[str, Any]]:
+        """Search for a user by display name using Microsoft Graph
+
+        The exact ``$filter`` query is skipped for the terms in ``exact_tried``,
+        which batch_search_users has already answered.
+        """
         if not assignee_name or assignee_name.strip() == "":
             return None
             
@@ -331,34 +674,22 @@ class GraphAuth:
                     
                 # Try different search approaches
                 search_queries = [
-                    f"https://graph.microsoft.com/v1.0/users?$filter=displayName eq '{search_term}'&$select=id,displayName,mail,userPrincipalName",
-                    f"https://graph.microsoft.com/v1.0/users?$filter=startswith(displayName,'{search_term}')&$select=id,displayName,mail,userPrincipalName",
-                    f"https://graph.microsoft.com/v1.0/users?$search=\"displayName:{search_term}\"&$select=id,displayName,mail,userPrincipalName"
+                    f"{self.graph_url}/users?$filter=displayName eq '{search_term}'&$select=id,displayName,mail,userPrincipalName",
+                    f"{self.graph_url}/users?$filter=startswith(displayName,'{search_term}')&$select=id,displayName,mail,userPrincipalName",
+                    f"{self.graph_url}/users?$search=\"displayName:{search_term}\"&$select=id,displayName,mail,userPrincipalName"
                 ]
+                if search_term in exact_tried:
+                    search_queries = search_queries[1:]
                 
                 for query_url in search_queries:
                     try:
-                        response = requests.get(query_url, headers=headers)
+                        response = self._get(query_url, headers=headers, max_age=DIRECTORY_REUSE_SECONDS)
                         
                         if response.status_code == 200:
                             users = response.json().get("value", [])
-                            
-                            # Look for exact or close matches
-                            for user in users:
-                                user_display_name = user.get("displayName", "")
-                                
-                                # Check for exact match first
-                                if user_display_name.lower() == parsed_name["fullName"].lower():
-                                    return user
-                                
-                                # Check if user display name contains the search components
-                                if (parsed_name["firstName"].lower() in user_display_name.lower() and 
-                                    parsed_name["lastName"].lower() in user_display_name.lower()):
-                                    return user
-                            
-                            # If exact matches not found, return first result for exact search
-                            if users and "eq" in query_url:
-                                return users[0]
+                            user = self._select_user(users, parsed_name, "eq" in query_url)
+                            if user:
+                                return user
                                 
                     except Exception as e:
                         continue  # Try next search approach
@@ -369,41 +700,163 @@ class GraphAuth:
             st.warning(f"Error searching for user '{assignee_name}': {str(e)}")
             return None
     
+    def _select_user(self, users: List[Dict[str, Any]], parsed_name: Dict[str, str],
+                     exact_query: bool) -> Optional[Dict[str, Any]]:
+        """Pick the best user from a directory query result for a parsed name"""
+        # Look for exact or close matches
+        for user in users:
+            user_display_name = user.get("displayName", "")
+            
+            # Check for exact match first
+            if user_display_name.lower() == parsed_name["fullName"].lower():
+                return user
+            
+            # Check if user display name contains the search components
+            if (parsed_name["firstName"].lower() in user_display_name.lower() and 
+                parsed_name["lastName"].lower() in user_display_name.lower()):
+                return user
+        
+        # If exact matches not found, return first result for exact search
+        if users and exact_query:
+            return users[0]
+        
+        return None
+    
+    def _post_batch(self, access_token: str, batch_requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Send requests through the Graph /$batch endpoint in groups of 20, keyed by request id"""
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        
+        responses = {}
+        for start in range(0, len(batch_requests), GRAPH_BATCH_LIMIT):
+            chunk = batch_requests[start:start + GRAPH_BATCH_LIMIT]
+            try:
+                response = self._request(
+                    "POST",
+                    f"{self.graph_url}/$batch",
+                    headers=headers,
+                    json={"requests": chunk}
+                )
+                
+                if response.status_code != 200:
+                    continue  # Callers treat missing ids as failed requests
+                
+                for item in response.json().get("responses", []):
+                    responses[str(item.get("id"))] = item
+                    
+            except Exception:
+                continue
+        
+        return responses
+    
+    def batch_search_users(self, access_token: str, assignee_names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve many names with exact-match queries sent through $batch
+
+        Names that miss fall back to the slower startswith/$search strategies of
+        search_user one at a time.
+        """
+        results = {}
+        batch_requests = []
+        request_names = {}
+        request_terms = {}
+        parsed_names = {}
+        exact_tried: Dict[str, Set[str]] = {}
+        
+        for assignee_name in assignee_names:
+            results[assignee_name] = None
+            parsed_name = self.parse_display_name(assignee_name) if assignee_name and assignee_name.strip() else None
+            if not parsed_name:
+                continue
+            parsed_names[assignee_name] = parsed_name
+            
+            # Same exact-match terms search_user tries first, in the same order
+            terms = []
+            for term in (parsed_name["fullName"], parsed_name["displayName"]):
+                if term and term not in terms:
+                    terms.append(term)
+            
+            for term in terms:
+                request_id = str(len(batch_requests))
+                escaped_term = term.replace("'", "''")
+                batch_requests.append({
+                    "id": request_id,
+                    "method": "GET",
+                    "url": "/users?$filter=" + quote(f"displayName eq '{escaped_term}'") + "&$select=id,displayName,mail,userPrincipalName"
+                })
+                request_names[request_id] = assignee_name
+                request_terms[request_id] = term
+        
+        responses = self._post_batch(access_token, batch_requests)
+        
+        # Requests are evaluated in order so the full name wins over the raw string
+        for request in batch_requests:
+            assignee_name = request_names[request["id"]]
+            if results[assignee_name]:
+                continue
+            response = responses.get(request["id"])
+            if response and response.get("status") == 200:
+                exact_tried.setdefault(assignee_name, set()).add(request_terms[request["id"]])
+                users = (response.get("body") or {}).get("value", [])
+                results[assignee_name] = self._select_user(users, parsed_names[assignee_name], True)
+        
+        # Slower fuzzy strategies only for the names the exact queries missed
+        for assignee_name, parsed_name in parsed_names.items():
+            if not results[assignee_name]:
+                results[assignee_name] = self.search_user(access_token, assignee_name, exact_tried.get(assignee_name, ()))
+        
+        return results
+    
     def assign_task(self, access_token: str, task_id: str, user_id: str) -> bool:
         """Assign a task to a user"""
+        return self.assign_task_users(access_token, task_id, [user_id])
+    
+    def assign_task_users(self, access_token: str, task_id: str, user_ids: List[str],
+                          etag: Optional[str] = None) -> bool:
+        """Assign a task to one or more users in a single update
+
+        When the caller already holds the task's ETag (the create response carries
+        it) the extra GET for the ETag is skipped.
+        """
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
         
         try:
-            # First, get the task to retrieve its ETag
-            task_response = requests.get(
-                f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}",
-                headers=headers
-            )
-            
-            if task_response.status_code != 200:
-                st.warning(f"Could not get task for assignment: {task_response.text}")
-                return False
-            
-            # Get the etag from the response headers
-            etag = task_response.headers.get('ETag', '')
             if not etag:
-                st.warning("Could not get ETag for task assignment")
-                return False
+                # First, get the task to retrieve its ETag
+                task_response = self._get(
+                    f"{self.graph_url}/planner/tasks/{task_id}",
+                    headers=headers
+                )
+                
+                if task_response.status_code != 200:
+                    st.warning(f"Could not get task for assignment: {task_response.text}")
+                    return False
+                
+                # Get the etag from the response headers
+                etag = task_response.headers.get('ETag', '')
+                if not etag:
+                    st.warning("Could not get ETag for task assignment")
+                    return False
             
             # Add If-Match header with the etag
             headers["If-Match"] = etag
             
             # Create assignment data - FIXED: orderHint should be a string, not object
-            assignments = {user_id: {"@odata.type": "microsoft.graph.plannerAssignment", "orderHint": " !"}}
+            assignments = {
+                user_id: {"@odata.type": "microsoft.graph.plannerAssignment", "orderHint": " !"}
+                for user_id in user_ids
+            }
             
             # Update the task with assignment
             assignment_data = {"assignments": assignments}
             
-            response = requests.patch(
-                f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}",
+            response = self._request(
+                "PATCH",
+                f"{self.graph_url}/planner/tasks/{task_id}",
                 headers=headers,
                 json=assignment_data
             )
@@ -422,13 +875,18 @@ class GraphAuth:
     def create_task(self, access_token: str, plan_id: str, bucket_id: str, 
                    title: str, description: str = "", due_date: str = None, 
                    start_date: str = None, assignees: List[str] = None, 
-                   status: str = None) -> Optional[Dict[str, Any]]:
-        """Create a new task in Microsoft Planner with optional assignees, dates, and status"""
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
-        
+                   status: str = None, resolved_users: List[Dict[str, Any]] = None,
+                   failure: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Create a new task in Microsoft Planner with optional assignees, dates, and status
+
+        When the create fails and ``failure`` is given, it is filled with the
+        HTTP ``status`` (0 for errors without a response) and a ``message``.
+
+        The follow-up steps form a small dependency graph: the description update
+        (on /details) and the assignment (on the task) both depend only on the
+        create, so they run concurrently. Resolving assignee names does not need
+        the task at all and overlaps with the create itself.
+        """
         # Step 1: Create the basic task
         task_data = {
             "planId": plan_id,
@@ -455,62 +913,115 @@ class GraphAuth:
             progress_value = status_mapping.get(status.lower().replace(" ", "_"), 0)
             task_data["percentComplete"] = progress_value
         
-        try:
-            # Create the task
-            response = requests.post(
-                "https://graph.microsoft.com/v1.0/planner/tasks",
-                headers=headers,
-                json=task_data
+        steps = {
+            "create": ((), lambda done: self._post_task(access_token, task_data, failure))
+        }
+        
+        # Step 2: Update the task with description if provided
+        if description:
+            steps["description"] = (
+                ("create",),
+                lambda done: done["create"] is not None
+                and self._update_task_description(access_token, done["create"]["id"], description)
             )
+        
+        # Step 3: Assign the task if assignees are provided
+        if resolved_users or assignees:
+            # Users resolved during assignee lookup skip the directory search
+            steps["users"] = ((), lambda done: resolved_users or self._search_assignees(access_token, assignees))
+            steps["assignment"] = (
+                ("create", "users"),
+                lambda done: self._assign_created_task(access_token, done["create"], done["users"])
+            )
+        
+        try:
+            if len(steps) == 1:
+                results = {"create": self._post_task(access_token, task_data, failure)}
+            else:
+                results = run_dag(steps)
             
-            if response.status_code == 401:
-                st.error("❌ Authentication expired. Please sign in again.")
-                if "access_token" in st.session_state:
-                    del st.session_state.access_token
-                st.rerun()
-                return None
-            elif response.status_code == 403:
-                st.error("❌ Access denied. You may not have permission to create tasks in this planner.")
-                st.warning("**Possible solutions:**")
-                st.write("1. Make sure you have write permissions in the selected planner")
-                st.write("2. Check if you're a member of the group that contains this planner")
-                st.write("3. Try selecting a different planner or bucket")
-                return None
-            elif response.status_code != 201:
-                st.error(f"Failed to create task: {response.text}")
-                return None
-            
-            # Get the created task
-            task = response.json()
-            task_id = task["id"]
-            
-            # Step 2: Update the task with description if provided
-            if description:
-                self._update_task_description(access_token, task_id, description)
-            
-            # Step 3: Assign the task if assignees are provided
-            assigned_users = []
-            if assignees:
-                for assignee in assignees:
-                    user = self.search_user(access_token, assignee)
-                    if user:
-                        assignment_success = self.assign_task(access_token, task_id, user["id"])
-                        if assignment_success:
-                            assigned_users.append({
-                                "id": user["id"],
-                                "displayName": user["displayName"],
-                                "mail": user.get("mail", ""),
-                                "originalName": assignee
-                            })
-                
-                if assigned_users:
-                    task["assignedUsers"] = assigned_users
+            task = results["create"]
+            if task and results.get("assignment"):
+                task["assignedUsers"] = results["assignment"]
             
             return task
                 
         except Exception as e:
             st.error(f"Error creating task: {str(e)}")
+            if failure is not None:
+                failure.update(status=0, message=str(e))
+            return None
+    
+    def _post_task(self, access_token: str, task_data: Dict[str, Any],
+                   failure: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """POST a new task and report failures; returns the created task"""
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        
+        # Create the task
+        response = self._request(
+            "POST",
+            f"{self.graph_url}/planner/tasks",
+            headers=headers,
+            json=task_data
+        )
+        
+        if response.status_code != 201 and failure is not None:
+            try:
+                message = response.json().get("error", {}).get("message", "")
+            except ValueError:
+                message = ""
+            failure.update(status=response.status_code, message=message or response.text[:200])
+        
+        if response.status_code == 401:
+            st.error("❌ Authentication expired. Please sign in again.")
+            if "access_token" in st.session_state:
+                del st.session_state.access_token
+            st.rerun()
+            return None
+        elif response.status_code == 403:
+            st.error("❌ Access denied. You may not have permission to create tasks in this planner.")
+            st.warning("**Possible solutions:**")
+            st.write("1. Make sure you have write permissions in the selected planner")
+            st.write("2. Check if you're a member of the group that contains this planner")
+            st.write("3. Try selecting a different planner or bucket")
+            return None
+        elif response.status_code != 201:
+            st.error(f"Failed to create task: {response.text}")
             return None
+        
+        # Get the created task
+        return response.json()
+    
+    def _search_assignees(self, access_token: str, assignees: List[str]) -> List[Dict[str, Any]]:
+        """Resolve assignee names that were not looked up before task creation"""
+        users = []
+        for assignee in assignees:
+            user = self.search_user(access_token, assignee)
+            if user:
+                users.append({
+                    "id": user["id"],
+                    "displayName": user["displayName"],
+                    "mail": user.get("mail", ""),
+                    "originalName": assignee
+                })
+        return users
+    
+    def _assign_created_task(self, access_token: str, task: Optional[Dict[str, Any]],
+                             users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Assign a freshly created task to users; returns the users actually assigned"""
+        if not task or not users:
+            return []
+        
+        # The create response's ETag is still current for the task itself
+        if self.assign_task_users(access_token, task["id"], [user["id"] for user in users],
+                                  etag=task.get("@odata.etag")):
+            return list(users)
+        
+        # Fall back to one assignment at a time with fresh ETags, so one bad user doesn't block the rest
+        return [user for user in users if self.assign_task(access_token, task["id"], user["id"])]
     
     def _update_task_description(self, access_token: str, task_id: str, description: str) -> bool:
         """Update task description using the proper /details endpoint"""
@@ -521,8 +1032,8 @@ class GraphAuth:
         
         try:
             # Step 1: Get the task details to get the ETag
-            get_response = requests.get(
-                f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details",
+            get_response = self._get(
+                f"{self.graph_url}/planner/tasks/{task_id}/details",
                 headers=headers
             )
             
@@ -542,8 +1053,9 @@ class GraphAuth:
                 "description": description
             }
             
-            response = requests.patch(
-                f"https://graph.microsoft.com/v1.0/planner/tasks/{task_id}/details",
+            response = self._request(
+                "PATCH",
+                f"{self.graph_url}/planner/tasks/{task_id}/details",
                 headers=headers,
                 json=update_data
             )
@@ -0,0 +1,200 @@
+"""
+Graph Metrics Module
+Counters and latency histograms for every HTTP call GraphAuth makes, exportable as Prometheus text or JSON
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Histogram bucket upper bounds in seconds, Prometheus style (+Inf is implicit)
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments that are followed by a resource id in Graph URLs
+_ID_COLLECTIONS = frozenset(("groups", "plans", "tasks", "buckets", "users", "teams"))
+
+
+def endpoint_template(url: str, base_url: str = "") -> str:
+    """Reduce a Graph URL to its endpoint template, e.g. /planner/tasks/{id}/details"""
+    path = urlsplit(url).path
+    base_path = urlsplit(base_url).path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+
+    segments = []
+    previous = ""
+    for segment in path.strip("/").split("/"):
+        segments.append("{id}" if previous in _ID_COLLECTIONS else segment)
+        previous = segment
+    return "/" + "/".join(segments)
+
+
+class _EndpointStats:
+    """Aggregates for one (method, endpoint template) pair"""
+
+    __slots__ = ("statuses", "bucket_counts", "latency_sum", "latency_max", "count",
+                 "retries", "throttled", "request_bytes", "response_bytes")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.count = 0
+        self.retries = 0
+        self.throttled = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def quantile(self, fraction: float) -> float:
+        """Estimate a latency quantile from the histogram (upper bound of the bucket it falls in)"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for position, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= target:
+                return LATENCY_BUCKETS[position] if position < len(LATENCY_BUCKETS) else self.latency_max
+        return self.latency_max
+
+
+class GraphMetrics:
+    """Thread-safe request metrics shared by all GraphAuth instances in the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], _EndpointStats] = {}
+
+    def record(self, method: str, endpoint: str, status: int, seconds: float, retries: int = 0,
+               throttled: int = 0, request_bytes: int = 0, response_bytes: int = 0):
+        """Record one logical request (including any retries it needed)"""
+        with self._lock:
+            stats = self._endpoints.get((method, endpoint))
+            if stats is None:
+                stats = self._endpoints[(method, endpoint)] = _EndpointStats()
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.count += 1
+            stats.latency_sum += seconds
+            stats.latency_max = max(stats.latency_max, seconds)
+            stats.retries += retries
+            stats.throttled += throttled
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            for position, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.bucket_counts[position] += 1
+                    break
+            else:
+                stats.bucket_counts[-1] += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(stats.count for stats in self._endpoints.values())
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per endpoint, slowest total time first (used by the diagnostics panel)"""
+        with self._lock:
+            rows = []
+            for (method, endpoint), stats in self._endpoints.items():
+                errors = sum(count for status, count in stats.statuses.items() if status >= 400)
+                rows.append({
+                    "Method": method,
+                    "Endpoint": endpoint,
+                    "Calls": stats.count,
+                    "Errors": errors,
+                    "Retries": stats.retries,
+                    "Throttled": stats.throttled,
+                    "Total (s)": round(stats.latency_sum, 3),
+                    "Mean (ms)": round(1000 * stats.latency_sum / stats.count, 1),
+                    "p95 ≤ (ms)": round(1000 * stats.quantile(0.95), 1),
+                    "Max (ms)": round(1000 * stats.latency_max, 1),
+                    "KB in": round(stats.response_bytes / 1024, 1),
+                })
+        rows.sort(key=lambda row: -row["Total (s)"])
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full metrics as JSON-serialisable data"""
+        with self._lock:
+            endpoints = []
+            for (method, endpoint), stats in sorted(self._endpoints.items()):
+                endpoints.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": stats.count,
+                    "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+                    "latency_seconds": {
+                        "sum": stats.latency_sum,
+                        "max": stats.latency_max,
+                        "buckets": {str(bound): count for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts)},
+                        "overflow": stats.bucket_counts[-1],
+                    },
+                    "retries": stats.retries,
+                    "throttled": stats.throttled,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                })
+        return {"endpoints": endpoints}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "planner_graph") -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_requests_total Graph requests by endpoint and final status.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            for (method, endpoint), stats in items:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'{prefix}_requests_total{{{_labels(method, endpoint)},status="{status}"}} {count}')
+
+            for name, attribute, help_text in (
+                ("retries_total", "retries", "Retried attempts after 429/503 responses."),
+                ("throttled_total", "throttled", "Responses with status 429."),
+                ("request_bytes_total", "request_bytes", "Request body bytes sent."),
+                ("response_bytes_total", "response_bytes", "Response body bytes received."),
+            ):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (method, endpoint), stats in items:
+                    lines.append(f"{prefix}_{name}{{{_labels(method, endpoint)}}} {getattr(stats, attribute)}")
+
+            lines.append(f"# HELP {prefix}_request_duration_seconds Graph request latency including retries.")
+            lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+            for (method, endpoint), stats in items:
+                labels = _labels(method, endpoint)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {stats.latency_sum}")
+                lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str) -> str:
+    escaped = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",endpoint="{escaped}"'
+
+
+def body_size(kwargs: Dict[str, Any]) -> int:
+    """Approximate size of a request body passed to requests as json= or data="""
+    if kwargs.get("json") is not None:
+        return len(json.dumps(kwargs["json"]))
+    data: Optional[Any] = kwargs.get("data")
+    return len(data) if isinstance(data, (bytes, str)) else 0
+
+
+# Process-wide collector used by GraphAuth
+graph_metrics = GraphMetrics()
@@ -0,0 +1,37 @@
+"""
+Lazy Imports Module
+Defers importing heavy modules until one of their attributes is first used
+"""
+
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access
+
+    pandas alone takes a few hundred milliseconds to import, which every cold
+    start paid even when the first screen is only the sign-in page.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a proxy that imports module ``name`` when first used"""
+    return LazyModule(name)
@@ -0,0 +1,122 @@
+"""
+Parse Cache Module
+Content-hash keyed LRU cache for parsed upload DataFrames and mapped tasks
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def compute_content_hash(uploaded_file) -> str:
+    """Return a SHA-256 hex digest of an uploaded file's bytes"""
+    if hasattr(uploaded_file, "getvalue"):
+        data = uploaded_file.getvalue()
+    else:
+        position = uploaded_file.tell()
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        uploaded_file.seek(position)
+    return hashlib.sha256(data).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """Roughly estimate the memory held by a cached DataFrame or task list"""
+    if hasattr(value, "memory_usage"):
+        # pandas DataFrame - deep accounting includes string payloads
+        try:
+            return int(value.memory_usage(deep=True).sum())
+        except Exception:
+            pass
+    if isinstance(value, (list, tuple)):
+        total = sys.getsizeof(value)
+        for item in value:
+            total += _estimate_record_size(item)
+        return total
+    return sys.getsizeof(value)
+
+
+def _estimate_record_size(record: Any) -> int:
+    """Estimate the size of a single task record including its field values"""
+    if isinstance(record, dict):
+        values = record.values()
+    elif hasattr(record, "__slots__"):
+        values = [getattr(record, slot, None) for slot in record.__slots__]
+    else:
+        return sys.getsizeof(record)
+    total = sys.getsizeof(record)
+    for value in values:
+        if isinstance(value, str):
+            total += sys.getsizeof(value)
+        elif isinstance(value, (list, tuple)):
+            total += sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    return total
+
+
+class ParseCache:
+    """LRU cache of parsed files keyed by content hash, bounded by entry count and memory"""
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def frame_key(content_hash: str) -> Tuple[Hashable, ...]:
+        """Key for the raw DataFrame read from a file"""
+        return ("frame", content_hash)
+
+    @staticmethod
+    def tasks_key(content_hash: str, mapping: Dict[str, str]) -> Tuple[Hashable, ...]:
+        """Key for the tasks produced from a file with a given column mapping"""
+        return ("tasks", content_hash, tuple(sorted(mapping.items())))
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Return a cached value and mark it as most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Store a value, evicting least recently used entries to stay within limits"""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Larger than the whole budget - caching it would evict everything else
+                return
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache occupancy and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
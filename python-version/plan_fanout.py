@@ -0,0 +1,76 @@
+"""
+Plan Fan-out Module
+Splits a multi-plan file into one partition per planner and resolves each partition in parallel
+"""
+
+from typing import Any, Dict, List, Optional
+
+from concurrency import run_parallel
+from task_model import Task, TaskIndex
+
+# Partitions looked up or created at the same time; Graph throttles per app, so more mostly adds 429s
+MAX_PARALLEL_PLANS = 4
+
+
+def match_plans(plan_names: List[str], planners: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Match plan names from the file to planners, case-insensitively
+
+    A name may be the plan title or "Title (Group)" as shown in the planner
+    selector; the latter is needed when several groups have a plan of that title.
+    """
+    by_display = {}
+    by_title: Dict[str, List[Dict[str, Any]]] = {}
+    for planner in planners:
+        title = planner["title"].strip().lower()
+        by_display[f"{title} ({planner.get('groupName', 'Unknown Group').strip().lower()})"] = planner
+        by_title.setdefault(title, []).append(planner)
+
+    matches = {}
+    for plan_name in plan_names:
+        key = plan_name.strip().lower()
+        if key in by_display:
+            matches[plan_name] = by_display[key]
+        elif len(by_title.get(key, ())) == 1:
+            matches[plan_name] = by_title[key][0]
+        else:
+            matches[plan_name] = None  # Unknown or ambiguous
+    return matches
+
+
+def partition_rows(index: TaskIndex, matches: Dict[str, Optional[Dict[str, Any]]],
+                   default_planner: Dict[str, Any]) -> Dict[str, List[int]]:
+    """Task row ids per planner id; rows without a plan name go to the default planner
+
+    Rows whose plan name did not match a planner are left out.
+    """
+    partitions: Dict[str, List[int]] = {}
+    planned = set()
+    for plan_name, row_ids in index.plan_rows.items():
+        planned.update(row_ids)
+        planner = matches.get(plan_name)
+        if planner:
+            partitions.setdefault(planner["id"], []).extend(row_ids)
+
+    unplanned = [row_id for row_id in range(len(index.tasks)) if row_id not in planned]
+    if unplanned:
+        partitions.setdefault(default_planner["id"], []).extend(unplanned)
+
+    for row_ids in partitions.values():
+        row_ids.sort()
+    return partitions
+
+
+def enrich_partitions(parser, auth, access_token: str, tasks: List[Task],
+                      partitions: Dict[str, List[int]], planners: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Run bucket and assignee resolution for every partition in parallel
+
+    Each partition is resolved against its own plan's buckets and group
+    members; the tasks are annotated in place. Returns results per plan id.
+    """
+    def enrich(plan_id: str):
+        partition = [tasks[row_id] for row_id in partitions[plan_id]]
+        return parser.enrich_tasks(partition, auth, access_token, plan_id, index=TaskIndex(partition),
+                                   group_id=planners[plan_id].get("groupId"))
+
+    calls = {plan_id: (lambda plan_id=plan_id: enrich(plan_id)) for plan_id in partitions}
+    return run_parallel(calls, max_workers=MAX_PARALLEL_PLANS)
@@ -0,0 +1,168 @@
+"""
+Profiling Module
+Opt-in deterministic (cProfile) and sampling profiling of import phases
+
+Enable with the PLANNER_PROFILE environment variable or a --profile flag:
+
+    PLANNER_PROFILE=1 streamlit run app.py              # cProfile and sampling
+    streamlit run app.py -- --profile=sample            # sampling only
+    python benchmarks/bench_import.py --profile cprofile
+
+Each profiled section writes to PLANNER_PROFILE_DIR (default "profiles"):
+
+- <run>_<section>.prof    cProfile stats (snakeviz, pstats)
+- <run>_<section>.txt     call tree: top functions by cumulative time and their callees
+- <run>_<section>.folded  sampled stacks in collapsed format (flamegraph.pl, speedscope)
+
+cProfile only sees the thread that entered the section; the sampler also
+covers worker threads started inside it, such as the concurrent lookups.
+One section is profiled at a time; sections entered meanwhile are not.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional, Set
+
+DEFAULT_PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL_SECONDS = 0.005
+MODES = ("cprofile", "sample", "both")
+
+_run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+_sections = Counter()
+_sections_lock = threading.Lock()
+# Held while a section is profiled: only one cProfile profiler may be active per process (Python 3.12+)
+_active = threading.Lock()
+
+
+def profiling_mode() -> Optional[str]:
+    """The requested profiling mode ("cprofile", "sample" or "both"), or None when disabled"""
+    value = os.environ.get("PLANNER_PROFILE", "")
+    for arg in sys.argv[1:]:
+        if arg == "--profile":
+            value = value or "both"
+        elif arg.startswith("--profile="):
+            value = arg.split("=", 1)[1]
+
+    value = value.strip().lower()
+    if value in ("", "0", "false", "off"):
+        return None
+    return value if value in MODES else "both"
+
+
+class StackSampler:
+    """Samples the stacks of threads on a timer and counts them in collapsed format"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS, include_thread: Optional[int] = None):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._include_thread = include_thread
+        self._ignored: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        # Threads that already exist (other than the profiled one) are idle Streamlit or server threads
+        self._ignored = {ident for ident in sys._current_frames() if ident != self._include_thread}
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident or ident in self._ignored:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks, one "frame;frame;frame count" line per distinct stack"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _call_tree(profile: cProfile.Profile, limit: int = 40) -> str:
+    """Text report of the slowest functions by cumulative time and what they call"""
+    output = io.StringIO()
+    stats = pstats.Stats(profile, stream=output)
+    stats.strip_dirs().sort_stats("cumulative")
+    stats.print_stats(limit)
+    stats.print_callees(limit // 2)
+    return output.getvalue()
+
+
+def _output_path(directory: str, name: str) -> str:
+    with _sections_lock:
+        _sections[name] += 1
+        suffix = f"_{_sections[name]}" if _sections[name] > 1 else ""
+    return os.path.join(directory, f"{_run_id}_{name}{suffix}")
+
+
+@contextmanager
+def profile_section(name: str) -> Iterator[None]:
+    """Profile the enclosed block when profiling is enabled, otherwise do nothing
+
+    Sections entered while another is being profiled, nested or from another
+    thread (enrich_partitions runs one lookup per plan in parallel), run
+    unprofiled; the outer section's sampler still sees their threads.
+    """
+    mode = profiling_mode()
+    if mode is None or not _active.acquire(blocking=False):
+        yield
+        return
+    try:
+        yield from _profile(name, mode)
+    finally:
+        _active.release()
+
+
+def _profile(name: str, mode: str) -> Iterator[None]:
+    """Generator body of profile_section: profile around its single yield and write the outputs"""
+    directory = os.environ.get("PLANNER_PROFILE_DIR", DEFAULT_PROFILE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    base_path = _output_path(directory, name)
+
+    profile = cProfile.Profile() if mode in ("cprofile", "both") else None
+    sampler = StackSampler(include_thread=threading.get_ident()) if mode in ("sample", "both") else None
+    started = time.perf_counter()
+
+    if sampler:
+        sampler.start()
+    if profile:
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile:
+            profile.disable()
+        if sampler:
+            sampler.stop()
+        elapsed = time.perf_counter() - started
+
+        if profile:
+            profile.dump_stats(base_path + ".prof")
+            with open(base_path + ".txt", "w", encoding="utf-8") as handle:
+                handle.write(f"Section '{name}' took {elapsed:.3f}s\n\n")
+                handle.write(_call_tree(profile))
+        if sampler:
+            with open(base_path + ".folded", "w", encoding="utf-8") as handle:
+                handle.write(sampler.folded())
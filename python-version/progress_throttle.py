@@ -0,0 +1,30 @@
+"""
+Progress Throttle Module
+Rate limits Streamlit progress updates during long loops
+"""
+
+import time
+
+
+class ProgressThrottle:
+    """Decides when a loop should redraw its progress widgets
+
+    Every Streamlit element update is a websocket message, so updating per
+    item turns large imports into thousands of messages. Updates are let
+    through at most every ``min_interval`` seconds, plus the first and last.
+    """
+
+    def __init__(self, total: int, min_interval: float = 0.25):
+        self.total = total
+        self.min_interval = min_interval
+        self.updates = 0
+        self._last_update = None
+
+    def due(self, done: int) -> bool:
+        """Return True if progress for ``done`` finished items should be rendered now"""
+        now = time.monotonic()
+        if self._last_update is None or done >= self.total or now - self._last_update >= self.min_interval:
+            self._last_update = now
+            self.updates += 1
+            return True
+        return False
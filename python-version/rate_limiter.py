@@ -0,0 +1,40 @@
+"""
+Rate Limiter Module
+Token bucket shared by every thread that sends Graph requests
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per second with bursts of up to ``burst``
+
+    Graph throttles per app and tenant, so concurrent workers share one
+    bucket instead of each pacing itself.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self.waited += delay
+            time.sleep(delay)
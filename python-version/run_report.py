@@ -0,0 +1,125 @@
+"""
+Run Report Module
+Per-phase wall time for one import run, saved as a JSON report
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# Phases in pipeline order; the report lists them in this order
+PHASES = (
+    ("file_read", "File read"),
+    ("column_mapping", "Column mapping"),
+    ("date_normalisation", "Date normalisation"),
+    ("bucket_resolution", "Bucket resolution"),
+    ("assignee_resolution", "Assignee resolution"),
+    ("bucket_creation", "Bucket creation"),
+    ("task_creation", "Task creation"),
+)
+
+DEFAULT_REPORT_DIR = "run_reports"
+
+
+class RunReport:
+    """Accumulates wall time per phase across the Streamlit reruns of one import
+
+    Phases may run more than once (e.g. a re-run lookup) or concurrently
+    (bucket and assignee resolution), so durations are summed per phase and
+    overlapping phases can add up to more than the elapsed time.
+    """
+
+    def __init__(self, file_name: str = "", plan_title: str = ""):
+        self.started_at = datetime.now()
+        self.file_name = file_name
+        self.plan_title = plan_title
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and add it to a phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float):
+        """Add a measured duration to a phase"""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: Any):
+        """Record a count or flag alongside the timings (rows, tasks, cache hits)"""
+        with self._lock:
+            self.counts[name] = value
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Table rows for display, in pipeline order"""
+        total = sum(self.phases.values()) or 1.0
+        rows = []
+        for name, label in PHASES:
+            if name in self.phases:
+                rows.append({
+                    "Phase": label,
+                    "Seconds": round(self.phases[name], 3),
+                    "Share": f"{100 * self.phases[name] / total:.0f}%",
+                })
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "file_name": self.file_name,
+                "plan_title": self.plan_title,
+                "phases_seconds": {name: round(self.phases[name], 6) for name, _ in PHASES if name in self.phases},
+                "total_seconds": round(sum(self.phases.values()), 6),
+                "counts": dict(self.counts),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+    def save(self, directory: Optional[str] = None) -> str:
+        """Write the report as JSON and return its path
+
+        The first save claims a new file, so reports started in the same
+        second (batch imports, the watch daemon) never overwrite each other.
+        Later saves of the same report, e.g. after a retry, update that file.
+        """
+        if self._path:
+            with open(self._path, "w", encoding="utf-8") as handle:
+                handle.write(self.to_json())
+            return self._path
+
+        directory = directory or os.environ.get("PLANNER_REPORT_DIR", DEFAULT_REPORT_DIR)
+        os.makedirs(directory, exist_ok=True)
+        stem = f"run_{self.started_at.strftime('%Y%m%d_%H%M%S_%f')}"
+        for attempt in itertools.count():
+            path = os.path.join(directory, f"{stem}_{attempt}.json" if attempt else f"{stem}.json")
+            try:
+                with open(path, "x", encoding="utf-8") as handle:
+                    handle.write(self.to_json())
+            except FileExistsError:
+                continue
+            self._path = path
+            return path
+
+
+@contextmanager
+def report_phase(report: Optional[RunReport], name: str) -> Iterator[None]:
+    """Time a phase when a report is being collected, otherwise do nothing"""
+    if report is None:
+        yield
+    else:
+        with report.phase(name):
+            yield
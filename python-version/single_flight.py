@@ -0,0 +1,80 @@
+"""
+Single Flight Module
+Coalesces identical in-flight calls so concurrent callers share one result
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """A call in progress that later callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its result
+
+    Callers that arrive while a call for the same key is running wait for it
+    instead of issuing their own. With ``max_age`` a completed result is also
+    reused by callers arriving shortly afterwards, which covers the same read
+    being repeated several times within one Streamlit rerun.
+    """
+
+    def __init__(self, max_recent: int = 256):
+        self.max_recent = max_recent
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._recent: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], max_age: float = 0.0,
+           cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return fn() for key, sharing the call with concurrent callers of the same key"""
+        with self._lock:
+            if max_age > 0 and key in self._recent:
+                completed_at, result = self._recent[key]
+                if time.monotonic() - completed_at <= max_age:
+                    self.shared += 1
+                    return result
+                del self._recent[key]
+
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and max_age > 0 and (cache_if is None or cache_if(call.result)):
+                    self._recent[key] = (time.monotonic(), call.result)
+                    self._recent.move_to_end(key)
+                    while len(self._recent) > self.max_recent:
+                        self._recent.popitem(last=False)
+            call.done.set()
+
+        return call.result
@@ -0,0 +1,94 @@
+"""
+Task Creation Module
+Turns enriched task records into GraphAuth.create_task calls, shared by the app and headless tools
+"""
+
+from typing import Any, Dict, List, Optional
+
+from task_model import ASSIGNEE_FIELDS, Task
+
+# Why a create failed, which decides whether retrying it is likely to help
+FAILURE_CLASSES = (
+    ("throttled", "Throttled"),
+    ("permission", "Permission"),
+    ("validation", "Validation"),
+    ("error", "Error"),
+)
+
+
+def assignee_lookup_ran(task: Task) -> bool:
+    """Whether assignee lookup has annotated the task (found users or recorded failures)"""
+    return any(task.get(name) for name in ASSIGNEE_FIELDS)
+
+
+def task_assignees(task: Task) -> List[str]:
+    """Names the task should be assigned to, preferring users resolved during lookup"""
+    if task.get("assignee_users"):  # Multiple assignees
+        return [user["originalName"] for user in task["assignee_users"]]
+    if task.get("assignee_user"):  # Single assignee (legacy)
+        return [task["assignee_user"]["originalName"]]
+    if task.get("assignees"):  # Original assignee list
+        return list(task["assignees"])
+    if task.get("assignee") and not task.get("assignee_lookup_failed"):
+        return [task["assignee"]]
+    return []
+
+
+def creation_arguments(task: Task, default_bucket_id: str) -> Dict[str, Any]:
+    """Keyword arguments for GraphAuth.create_task (without access_token and plan_id)"""
+    # Determine bucket ID (use task-specific bucket if available)
+    bucket_id = default_bucket_id
+    if task.get("bucket_info"):
+        bucket_id = task["bucket_info"]["id"]
+
+    # Users resolved during assignee lookup are assigned directly by id
+    resolved_users: Optional[List[Dict[str, Any]]] = None
+    if task.get("assignee_users"):
+        resolved_users = task["assignee_users"]
+    elif task.get("assignee_user"):
+        resolved_users = [task["assignee_user"]]
+
+    # Once lookup has run, names it could not resolve (e.g. not plan members) are left unassigned;
+    # only names that were never looked up are searched for during creation
+    assignees = None if assignee_lookup_ran(task) else task_assignees(task) or None
+    return {
+        "bucket_id": bucket_id,
+        "title": task["title"],
+        "description": task.get("description", ""),
+        "due_date": task.get("due_date"),
+        "start_date": task.get("start_date"),
+        "assignees": assignees,
+        "status": task.get("status"),
+        "resolved_users": resolved_users,
+    }
+
+
+def classify_failure(status: int) -> str:
+    """Failure class for the HTTP status of a failed create (0 when no response arrived)"""
+    if status in (429, 503):
+        return "throttled"
+    if status in (401, 403):
+        return "permission"
+    if 400 <= status < 500:
+        return "validation"
+    return "error"
+
+
+def merge_retry_results(previous: Dict[str, Any], retried: Dict[str, Any], indexes: List[int]) -> Dict[str, Any]:
+    """Fold the results of retrying the tasks at ``indexes`` into the previous run's results
+
+    Retried rows replace their earlier rows and counts, and failures that
+    were not retried this time stay in the retry queue.
+    """
+    retried_rows = {row["Row"]: row for row in retried["rows"]}
+    retried_indexes = set(indexes)
+    still_queued = [entry for entry in previous["retry_queue"] if entry["index"] not in retried_indexes]
+    return {
+        "rows": [retried_rows.get(row["Row"], row) for row in previous["rows"]],
+        "total": previous["total"],
+        "created": previous["created"] + retried["created"],
+        "assigned": previous["assigned"] + retried["assigned"],
+        "assignment_failed": previous["assignment_failed"] + retried["assignment_failed"],
+        "failed": previous["failed"] - len(indexes) + retried["failed"],
+        "retry_queue": sorted(retried["retry_queue"] + still_queued, key=lambda entry: entry["index"]),
+    }
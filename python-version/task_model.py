@@ -0,0 +1,172 @@
+"""
+Task Model Module
+Compact slotted task records shared by the file parser, lookups and task creation
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+TASK_FIELDS = (
+    # Parsed from the uploaded file
+    "title",
+    "description",
+    "start_date",
+    "due_date",
+    "assignee",
+    "assignees",
+    "bucket_name",
+    "status",
+    "plan_name",
+    # Added by bucket lookup
+    "bucket_info",
+    "bucket_lookup_failed",
+    # Added by assignee lookup
+    "assignee_users",
+    "assignee_lookup_failed_list",
+    "assignee_user",
+    "assignee_lookup_failed",
+)
+
+PARSED_FIELDS = TASK_FIELDS[:TASK_FIELDS.index("bucket_info")]
+BUCKET_FIELDS = ("bucket_info", "bucket_lookup_failed")
+ASSIGNEE_FIELDS = ("assignee_users", "assignee_lookup_failed_list", "assignee_user", "assignee_lookup_failed")
+
+_FIELD_SET = frozenset(TASK_FIELDS)
+# Fields Task() takes as arguments; the rest start unset
+_CONSTRUCTOR_FIELDS = ("title", "description", "start_date", "due_date", "status")
+_UNSET_FIELDS = tuple(name for name in TASK_FIELDS if name not in _CONSTRUCTOR_FIELDS)
+
+
+def intern_text(value: Optional[str]) -> Optional[str]:
+    """Intern short repeated strings such as bucket, status and assignee names"""
+    if value is None:
+        return None
+    return sys.intern(value)
+
+
+class Task:
+    """A single task row stored in slots instead of a per-row dict
+
+    Supports the dict-style access (``task["title"]``, ``task.get("bucket_info")``)
+    used throughout the app. Unset fields are ``None`` and ``get`` treats them as
+    missing, matching the previous dict records where optional keys were absent.
+    """
+
+    __slots__ = TASK_FIELDS
+
+    def __init__(self, title: str = "", description: str = "", start_date: Optional[str] = None,
+                 due_date: Optional[str] = None, status: Optional[str] = None, **fields: Any):
+        self.title = title
+        self.description = description
+        self.start_date = start_date
+        self.due_date = due_date
+        self.status = status
+        for name in _UNSET_FIELDS:
+            setattr(self, name, None)
+        for name, value in fields.items():
+            self[name] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field value, or default if the field is unset"""
+        if key not in _FIELD_SET:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELD_SET and getattr(self, key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in TASK_FIELDS if getattr(self, name) is not None)
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()!r})"
+
+    def clear(self, fields) -> None:
+        """Reset enrichment fields before a lookup annotates the task again"""
+        for name in fields:
+            setattr(self, name, None)
+
+    def copy(self) -> "Task":
+        """Return a shallow copy (shared bucket and user references are kept)"""
+        clone = Task.__new__(Task)
+        for name in TASK_FIELDS:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the task as a plain dict of its set fields"""
+        return {name: getattr(self, name) for name in TASK_FIELDS if getattr(self, name) is not None}
+
+
+class TaskIndex:
+    """Group-by indexes over a task list, built once per parse
+
+    Row ids are positions in the indexed list. Lookups annotate tasks in place,
+    so the index stays valid for the enriched list as well.
+    """
+
+    def __init__(self, tasks: List[Task]):
+        self.tasks = tasks
+        self.bucket_rows: Dict[str, List[int]] = {}
+        self.plan_rows: Dict[str, List[int]] = {}
+        self.assignee_rows: Dict[str, List[int]] = {}
+        self.assignee_text_counts: Dict[str, int] = {}
+        self.unassigned_count = 0
+        # Tasks with at least one user found / at least one name not found, set by FileParser.apply_enrichment
+        self.assigned_task_count = 0
+        self.assignment_failed_task_count = 0
+
+        for row_id, task in enumerate(tasks):
+            bucket_name = task.get("bucket_name")
+            if bucket_name:
+                self.bucket_rows.setdefault(bucket_name, []).append(row_id)
+
+            plan_name = task.get("plan_name")
+            if plan_name:
+                self.plan_rows.setdefault(plan_name, []).append(row_id)
+
+            assignee = task.get("assignee")
+            if assignee:
+                self.assignee_text_counts[assignee] = self.assignee_text_counts.get(assignee, 0) + 1
+                for name in task.get("assignees") or (assignee,):
+                    self.assignee_rows.setdefault(name, []).append(row_id)
+            else:
+                self.unassigned_count += 1
+
+    @property
+    def bucket_names(self) -> Set[str]:
+        """Unique bucket names referenced by the tasks"""
+        return set(self.bucket_rows)
+
+    @property
+    def plan_names(self) -> Set[str]:
+        """Unique plan names referenced by the tasks (multi-plan files)"""
+        return set(self.plan_rows)
+
+    @property
+    def assignee_names(self) -> Set[str]:
+        """Unique individual assignee names referenced by the tasks"""
+        return set(self.assignee_rows)
+
+    def bucket_count(self, bucket_name: str) -> int:
+        """Number of tasks that reference a bucket name"""
+        return len(self.bucket_rows.get(bucket_name, ()))
+
+    def tasks_for_bucket(self, bucket_name: str) -> List[Task]:
+        """Tasks that reference a bucket name"""
+        return [self.tasks[row_id] for row_id in self.bucket_rows.get(bucket_name, ())]
+
+    def tasks_for_assignee(self, assignee_name: str) -> List[Task]:
+        """Tasks that list an individual assignee name"""
+        return [self.tasks[row_id] for row_id in self.assignee_rows.get(assignee_name, ())]
@@ -0,0 +1,68 @@
+"""
+Bucket Matcher Checks
+Run with: python -m pytest test_bucket_matcher.py
+"""
+
+import pytest
+
+from bucket_matcher import BucketMatcher, edit_distance
+
+BUCKETS = ["Finance", "Admin", "Clinical", "Documents", "Documentation", "Practice 1", "Team A", "Week 1", "Q1 2024", "Приём"]
+
+
+def matched(name, buckets=BUCKETS):
+    bucket, _ = BucketMatcher([{"id": str(i), "name": n} for i, n in enumerate(buckets)]).best_match(name)
+    return bucket["name"] if bucket else None
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Finanse", "Finance"),
+    ("Admn", "Admin"),
+    ("Clincal", "Clinical"),
+    ("Documentaton", "Documentation"),
+    ("Fianance", "Finance"),
+    ("Practice-1", "Practice 1"),
+    ("Q1-2024", "Q1 2024"),
+    ("Прием", "Приём"),
+])
+def test_typos_and_punctuation_match(name, expected):
+    assert matched(name) == expected
+
+
+def test_word_order_is_ignored():
+    assert matched("Team Admin", ["Admin Team", "Finance"]) == "Admin Team"
+
+
+@pytest.mark.parametrize("name", ["Admin Team", "Documents Archive", "Clinical Team", "Admin Archive"])
+def test_extra_words_are_not_matched(name):
+    assert matched(name) is None
+
+
+@pytest.mark.parametrize("name", ["Practice 3", "Practice 12", "Team B", "Week 2", "Q2 2024"])
+def test_numbers_and_letters_must_agree(name):
+    assert matched(name) is None
+
+
+def test_fewest_edits_wins():
+    assert matched("Documents", ["Documentation", "Document", "Documents"]) == "Documents"
+    assert matched("Documnts", ["Document", "Documents"]) == "Documents"
+
+
+def test_score_reflects_edits():
+    matcher = BucketMatcher([{"id": "1", "name": "Finance"}])
+    assert matcher.best_match("finance")[1] == 1.0
+    assert matcher.best_match("Finanse")[1] == pytest.approx(1 - 1 / 7)
+
+
+def test_missing_bucket_still_gets_suggestions():
+    matcher = BucketMatcher([{"id": "1", "name": "Admin"}, {"id": "2", "name": "Finance"}])
+    bucket, score = matcher.best_match("Admin Team")
+    assert bucket is None and score > 0
+    assert matcher.candidates("Admin Team")[0][0]["name"] == "Admin"
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("admin", "admin") == 0
+    assert edit_distance("clincal", "clinical") == 1
+    assert edit_distance("fianance", "finance") == 1
+    assert edit_distance("abcd", "badc") == 2
@@ -0,0 +1,67 @@
+"""
+CSV Sniffer Checks
+Run with: python -m pytest test_csv_sniffer.py
+"""
+
+import codecs
+import io
+
+from csv_sniffer import SAMPLE_BYTES, read_csv, sniff_csv, sniff_encoding
+
+ROWS = [["Title", "Description", "Bucket Name"], ["Café rota", "Résumé; draft", "Admin"], ["Ward round", "", "Clinical"]]
+
+
+def csv_text(delimiter: str) -> str:
+    def field(value):
+        return f'"{value}"' if delimiter in value else value
+    return "".join(delimiter.join(field(value) for value in row) + "\r\n" for row in ROWS)
+
+
+def frame_rows(df):
+    return [list(df.columns)] + [["" if value != value else value for value in row] for row in df.values.tolist()]
+
+
+def test_cp1252_with_semicolons():
+    data = csv_text(";").encode("cp1252")
+    assert sniff_csv(data) == {"sep": ";", "quotechar": '"', "encoding": "cp1252"}
+    assert frame_rows(read_csv(io.BytesIO(data))) == ROWS
+
+
+def test_utf8_bom_is_stripped():
+    data = codecs.BOM_UTF8 + csv_text(",").encode("utf-8")
+    assert sniff_csv(data)["encoding"] == "utf-8-sig"
+    assert list(read_csv(io.BytesIO(data)).columns) == ROWS[0]
+
+
+def test_utf16_excel_export():
+    data = csv_text("\t").encode("utf-16")
+    assert sniff_csv(data) == {"sep": "\t", "quotechar": '"', "encoding": "utf-16"}
+    assert frame_rows(read_csv(io.BytesIO(data))) == ROWS
+
+
+def test_tabs():
+    data = csv_text("\t").encode("utf-8")
+    assert sniff_csv(data)["sep"] == "\t"
+    assert frame_rows(read_csv(io.BytesIO(data))) == ROWS
+
+
+def test_quoted_semicolons_in_comma_file():
+    data = b'Title,Description\n"Plan; review","a; b; c"\n"Call back","x; y"\n'
+    assert sniff_csv(data)["sep"] == ","
+    df = read_csv(io.BytesIO(data))
+    assert df["Description"].tolist() == ["a; b; c", "x; y"]
+
+
+def test_single_column_falls_back_to_comma():
+    assert sniff_csv(b"Title\nOne\nTwo\n")["sep"] == ","
+
+
+def test_multibyte_character_cut_at_sample_end_stays_utf8():
+    sample = ("x" * (SAMPLE_BYTES - 1) + "é").encode("utf-8")[:SAMPLE_BYTES]
+    assert sniff_encoding(sample) == "utf-8"
+
+
+def test_read_starts_at_current_position():
+    handle = io.BytesIO(b"ignored\n" + csv_text(",").encode("utf-8"))
+    handle.readline()
+    assert frame_rows(read_csv(handle)) == ROWS
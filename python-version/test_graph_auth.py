@@ -0,0 +1,75 @@
+"""
+Graph Auth Checks
+Run with: python -m pytest test_graph_auth.py
+"""
+
+import pytest
+
+import graph_auth
+
+
+@pytest.fixture(autouse=True)
+def empty_bucket_cache():
+    graph_auth._bucket_cache.clear()
+    yield
+    graph_auth._bucket_cache.clear()
+
+
+def test_bucket_cache_is_capped_least_recently_used_first(monkeypatch):
+    monkeypatch.setattr(graph_auth, "BUCKET_CACHE_MAX_PLANS", 2)
+    graph_auth._set_cached_buckets("token", "a", [{"name": "A"}])
+    graph_auth._set_cached_buckets("token", "b", [{"name": "B"}])
+    assert graph_auth._get_cached_buckets("token", "a") == [{"name": "A"}]
+    graph_auth._set_cached_buckets("token", "c", [{"name": "C"}])
+    assert graph_auth._get_cached_buckets("token", "b") is None
+    assert graph_auth._get_cached_buckets("token", "a") == [{"name": "A"}]
+    assert len(graph_auth._bucket_cache) == 2
+
+
+def test_expired_bucket_lists_are_dropped(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(graph_auth.time, "monotonic", lambda: clock[0])
+    graph_auth._set_cached_buckets("old token", "plan", [])
+    clock[0] += graph_auth.BUCKET_REUSE_SECONDS + 1
+    graph_auth._set_cached_buckets("new token", "plan", [])
+    assert list(graph_auth._bucket_cache) == [("new token", "plan")]
+
+
+def test_created_buckets_are_appended():
+    graph_auth._set_cached_buckets("token", "plan", [{"name": "A"}])
+    graph_auth._add_cached_buckets("token", "plan", [{"name": "B"}])
+    graph_auth._add_cached_buckets("token", "other plan", [{"name": "C"}])
+    assert graph_auth._get_cached_buckets("token", "plan") == [{"name": "A"}, {"name": "B"}]
+    assert graph_auth._get_cached_buckets("token", "other plan") is None
+
+
+def hint_anchors(hint):
+    assert hint.endswith("!")
+    previous, following = hint[:-1].split(" ")
+    return previous, following
+
+
+@pytest.mark.parametrize("count", [1, 5, 61, 62, 200])
+def test_order_hints_chain_and_ascend_after_the_last_bucket(count):
+    hints = graph_auth.compute_order_hints("8585", count)
+    assert len(hints) == count
+    anchors = [hint_anchors(hint) for hint in hints]
+    assert anchors[0][0] == "8585"
+    for (previous, following), (next_previous, _) in zip(anchors, anchors[1:]):
+        assert following == next_previous
+    # Planner compares order hints ordinally
+    followings = [following for _, following in anchors]
+    assert all(following > "8585" for following in followings)
+    assert followings == sorted(followings)
+    assert len(set(followings)) == count
+
+
+def test_order_hints_widen_past_the_alphabet():
+    width = len(graph_auth._ORDER_HINT_ALPHABET)
+    assert len(hint_anchors(graph_auth.compute_order_hints("", width - 1)[-1])[1]) == 1
+    assert len(hint_anchors(graph_auth.compute_order_hints("", width)[-1])[1]) == 2
+
+
+def test_order_hints_for_an_empty_plan():
+    assert graph_auth.compute_order_hints("", 2) == [" 1!", "1 2!"]
+
@@ -0,0 +1,61 @@
+"""
+Parse Cache Checks
+Run with: python -m pytest test_parse_cache.py
+"""
+
+from parse_cache import ParseCache
+
+
+def test_hits_and_misses_are_counted():
+    cache = ParseCache()
+    key = ParseCache.frame_key("abc")
+    assert cache.get(key) is None
+    cache.put(key, [1, 2, 3])
+    assert cache.get(key) == [1, 2, 3]
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["bytes"] > 0
+
+
+def test_tasks_key_depends_on_mapping():
+    first = ParseCache.tasks_key("abc", {"title": "Title", "status": "None"})
+    second = ParseCache.tasks_key("abc", {"title": "Name", "status": "None"})
+    assert first != second
+    assert first == ParseCache.tasks_key("abc", {"status": "None", "title": "Title"})
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    cache = ParseCache(max_entries=2)
+    cache.put(("a",), "a")
+    cache.put(("b",), "b")
+    cache.get(("a",))  # "b" is now the least recently used
+    cache.put(("c",), "c")
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == "a"
+    assert cache.get(("c",)) == "c"
+    assert cache.stats()["entries"] == 2
+
+
+def test_eviction_by_memory_budget():
+    cache = ParseCache(max_bytes=3000)
+    cache.put(("a",), "x" * 1000)
+    cache.put(("b",), "y" * 1000)
+    cache.put(("c",), "z" * 1500)
+    assert cache.get(("a",)) is None
+    assert cache.stats()["bytes"] <= 3000
+
+
+def test_value_larger_than_budget_is_not_cached():
+    cache = ParseCache(max_bytes=100)
+    cache.put(("small",), "s")
+    cache.put(("big",), "b" * 1000)
+    assert cache.get(("big",)) is None
+    assert cache.get(("small",)) == "s"
+
+
+def test_clear_resets_occupancy():
+    cache = ParseCache()
+    cache.put(("a",), "a")
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
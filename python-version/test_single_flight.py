@@ -0,0 +1,71 @@
+"""
+Single Flight Checks
+Run with: python -m pytest test_single_flight.py
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def slow():
+        runs.append(1)
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "key", slow) for _ in range(4)]
+        while flight.shared < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == ["result"] * 4
+    assert len(runs) == 1
+    assert (flight.calls, flight.shared) == (1, 3)
+
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flight.do, "key", failing, 60) for _ in range(2)]
+        while flight.shared < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=5)
+
+    assert flight.do("key", lambda: "retried", max_age=60) == "retried"
+
+
+def test_recent_results_reused_within_max_age():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1, max_age=60) == 1
+    assert flight.do("key", lambda: 2, max_age=60) == 1
+    assert flight.do("key", lambda: 3) == 3
+    assert flight.do("other", lambda: 4, max_age=60) == 4
+
+
+def test_cache_if_and_max_recent():
+    flight = SingleFlight(max_recent=1)
+    flight.do("bad", lambda: None, max_age=60, cache_if=lambda result: result is not None)
+    assert flight.do("bad", lambda: "fresh", max_age=60) == "fresh"
+    flight.do("a", lambda: "a", max_age=60)
+    flight.do("b", lambda: "b", max_age=60)
+    assert flight.do("a", lambda: "a again", max_age=60) == "a again"
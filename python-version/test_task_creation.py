@@ -0,0 +1,61 @@
+"""
+Task Creation Checks
+Run with: python -m pytest test_task_creation.py
+"""
+
+from task_creation import merge_retry_results
+
+
+def row(number, outcome):
+    return {"Row": number, "Title": f"Task {number}", "Outcome": outcome}
+
+
+def failure(index, failure_class="throttled", status=429):
+    return {"index": index, "failure": failure_class, "status": status}
+
+
+PREVIOUS = {
+    "rows": [row(1, "✅ Created"), row(2, "❌ Failed"), row(3, "❌ Failed"), row(4, "❌ Failed")],
+    "total": 4,
+    "created": 1,
+    "assigned": 1,
+    "assignment_failed": 0,
+    "failed": 3,
+    "retry_queue": [failure(1), failure(2, "validation", 400), failure(3)],
+}
+
+
+def test_retried_rows_replace_earlier_rows_and_counts():
+    retried = {
+        "rows": [row(2, "✅ Created"), row(4, "❌ Failed")],
+        "total": 2,
+        "created": 1,
+        "assigned": 0,
+        "assignment_failed": 1,
+        "failed": 1,
+        "retry_queue": [failure(3, "error", 500)],
+    }
+    merged = merge_retry_results(PREVIOUS, retried, [1, 3])
+
+    assert [r["Outcome"] for r in merged["rows"]] == ["✅ Created", "✅ Created", "❌ Failed", "❌ Failed"]
+    assert (merged["total"], merged["created"], merged["assigned"], merged["assignment_failed"], merged["failed"]) == \
+        (4, 2, 1, 1, 2)
+    # Row 3 was not retried and stays queued; row 4 is queued with its new failure
+    assert merged["retry_queue"] == [failure(2, "validation", 400), failure(3, "error", 500)]
+
+
+def test_everything_succeeding_empties_the_queue():
+    retried = {
+        "rows": [row(2, "✅ Created"), row(3, "✅ Created"), row(4, "✅ Created")],
+        "total": 3, "created": 3, "assigned": 0, "assignment_failed": 0, "failed": 0, "retry_queue": [],
+    }
+    merged = merge_retry_results(PREVIOUS, retried, [1, 2, 3])
+    assert (merged["created"], merged["failed"], merged["retry_queue"]) == (4, 0, [])
+
+
+def test_previous_results_are_not_modified():
+    retried = {"rows": [row(2, "✅ Created")], "total": 1, "created": 1, "assigned": 0,
+               "assignment_failed": 0, "failed": 0, "retry_queue": []}
+    merge_retry_results(PREVIOUS, retried, [1])
+    assert PREVIOUS["rows"][1]["Outcome"] == "❌ Failed"
+    assert len(PREVIOUS["retry_queue"]) == 3
@@ -0,0 +1,24 @@
+"""
+Task Model Checks
+Run with: python -m pytest test_task_model.py
+"""
+
+import inspect
+
+from task_model import TASK_FIELDS, Task
+
+
+def test_constructor_arguments_survive():
+    parameters = [name for name in inspect.signature(Task.__init__).parameters if name in TASK_FIELDS]
+    values = {name: f"value of {name}" for name in parameters}
+    task = Task(**values)
+    for name, value in values.items():
+        assert task[name] == value, name
+
+
+def test_keyword_fields_and_unset_defaults():
+    task = Task(title="a", status="Done", bucket_name="Admin")
+    assert task.status == "Done"
+    assert task["bucket_name"] == "Admin"
+    assert task.get("bucket_info") is None
+    assert "assignees" not in task
@@ -0,0 +1,253 @@
+"""
+Watch Daemon
+Long-running import of task files dropped into a folder
+
+    python watch_daemon.py drop/ --plan "Practice 1 Plan 1"
+    python watch_daemon.py drop/ --plan <plan id> --interval 10 --output imported.csv
+    python watch_daemon.py drop/ --plan <plan id> --once        # import what is there and exit
+
+The folder is polled for new or changed CSV/XLSX (optionally compressed) files. A file is imported
+once its size and modification time are unchanged for one poll (so
+half-copied files are left alone), through the same parse, lookup and
+creation pipeline as batch_import.py. One process keeps the HTTP connection
+pool, the sign-in, the planner list and the bucket and directory caches warm
+between files.
+
+Imports are incremental: a fingerprint of each created row's parsed fields is
+kept in a state file, so when a file changes only its new or edited rows are
+created. Rows that failed are not recorded and are tried again the next time
+their file changes or the daemon restarts. Every import of new rows saves its
+own run report (see run_report.py).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from batch_import import RESULT_COLUMNS, BatchImporter, find_files, parse_path, quiet_streamlit, resolve_planner
+from graph_auth import GraphAuth
+from rate_limiter import RateLimiter
+from run_report import RunReport
+from task_creation import FAILURE_CLASSES
+from task_model import PARSED_FIELDS, Task
+
+DEFAULT_STATE_FILE = ".planner_watch_state.json"
+
+
+def log(message: str):
+    print(f"{datetime.now().strftime('%H:%M:%S')} {message}", flush=True)
+
+
+def row_fingerprint(task: Task) -> str:
+    """Stable hash of the fields a row was parsed into (not the lookup results)"""
+    values = [str(task.get(name, "")) for name in PARSED_FIELDS]
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+class WatchState:
+    """Per-file modification stamp and fingerprints of the rows already created, saved as JSON"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                self.files = json.load(handle).get("files", {})
+
+    def stamp(self, name: str) -> Optional[Tuple[float, int]]:
+        entry = self.files.get(name)
+        return (entry["mtime"], entry["size"]) if entry else None
+
+    def imported(self, name: str) -> Counter:
+        return Counter(self.files.get(name, {}).get("imported", {}))
+
+    def update(self, name: str, stamp: Tuple[float, int], imported: Counter):
+        self.files[name] = {"mtime": stamp[0], "size": stamp[1], "imported": dict(imported)}
+
+    def save(self):
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"files": self.files}, handle, indent=1)
+        os.replace(temporary, self.path)  # Never leave a half-written state file
+
+
+class WatchDaemon:
+    """Polls a folder and imports new rows of settled files"""
+
+    def __init__(self, folder: str, importer: BatchImporter, state: WatchState, output: Optional[str] = None):
+        self.folder = folder
+        self.importer = importer
+        self.state = state
+        self.output = output
+        self._pending: Dict[str, Tuple[float, int]] = {}
+
+    def poll(self, settle: bool = True) -> int:
+        """Import every new or changed file that has settled; returns the number of tasks created"""
+        created = 0
+        for path in find_files(self.folder):
+            if self.output and os.path.abspath(path) == os.path.abspath(self.output):
+                continue  # Our own results log
+            name = os.path.basename(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed between listing and stat
+            stamp = (stat.st_mtime, stat.st_size)
+            if self.state.stamp(name) == stamp:
+                continue
+            if settle and self._pending.get(name) != stamp:
+                self._pending[name] = stamp  # Still being written, or first seen: check again next poll
+                continue
+            self._pending.pop(name, None)
+            created += self.import_file(path, stamp)
+        return created
+
+    def import_file(self, path: str, stamp: Tuple[float, int]) -> int:
+        """Create the rows of a file that were not created before; returns how many were created"""
+        name = os.path.basename(path)
+        started = time.perf_counter()
+        parsed = parse_path(path)
+        if parsed["error"]:
+            log(f"{name}: skipped ({parsed['error']})")
+            self.state.update(name, stamp, self.state.imported(name))  # Not retried until the file changes
+            self.state.save()
+            return 0
+
+        # Identical rows are allowed; import as many copies as are new
+        imported = self.state.imported(name)
+        remaining = imported.copy()
+        new_tasks: List[Task] = []
+        row_numbers: List[int] = []
+        fingerprints: Dict[int, str] = {}
+        for row_id, task in enumerate(parsed["tasks"]):
+            fingerprint = row_fingerprint(task)
+            if remaining[fingerprint] > 0:
+                remaining[fingerprint] -= 1
+                continue
+            fingerprints[row_id] = fingerprint
+            row_numbers.append(row_id)
+            new_tasks.append(task)
+
+        results = []
+        if new_tasks:
+            # One run report per imported file, as batch_import writes one per run
+            report = RunReport(name, self.importer.default_planner["title"])
+            for phase, seconds in parsed["phases"].items():
+                report.add(phase, seconds)
+            self.importer.use_report(report)
+            creation_started = time.perf_counter()
+            futures, skipped = self.importer.submit(path, new_tasks, row_numbers)
+            results = [future.result() for future in futures]
+            report.add("task_creation", time.perf_counter() - creation_started)
+            if skipped:
+                log(f"{name}: {skipped} rows skipped (plan or bucket not found)")
+            self.save_report(report, results, len(new_tasks), skipped)
+
+        created = 0
+        for row in results:
+            if row["Outcome"] == "created":
+                imported[fingerprints[row["Row"] - 1]] += 1
+                created += 1
+        self.state.update(name, stamp, imported)
+        self.state.save()
+
+        failed = len(results) - created
+        log(f"{name}: {len(parsed['tasks'])} rows, {len(new_tasks)} new, {created} created, {failed} failed "
+            f"in {time.perf_counter() - started:.1f}s")
+        if self.output and results:
+            append_results(self.output, results)
+        return created
+
+    def save_report(self, report: RunReport, results: List[Dict[str, Any]], new_rows: int, skipped: int):
+        """Add a file's outcome counts to its run report and write it"""
+        outcomes = Counter(row["Outcome"] for row in results)
+        failures = Counter(row["Failure"] for row in results if row["Failure"])
+        report.count("new_rows", new_rows)
+        report.count("skipped", skipped)
+        report.count("created", outcomes["created"])
+        report.count("failed", outcomes["failed"])
+        report.count("failed_by_class", {name: failures[name] for name, _ in FAILURE_CLASSES})
+        try:
+            log(f"Run report saved to {report.save()}")
+        except OSError as e:
+            log(f"Could not save run report: {e}")
+
+
+def append_results(path: str, rows: List[Dict[str, Any]]):
+    """Append result rows to a CSV log, writing the header for a new file"""
+    write_header = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["Imported At"] + RESULT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        imported_at = datetime.now().isoformat(timespec="seconds")
+        writer.writerows({"Imported At": imported_at, **row} for row in rows)
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Watch a folder and import task files as they arrive")
+    arg_parser.add_argument("folder", help="Drop folder to watch")
+    arg_parser.add_argument("--plan", required=True, help="Plan id, title or 'Title (Group)' for rows without a plan column")
+    arg_parser.add_argument("--bucket", help="Default bucket name (default: each plan's first bucket)")
+    arg_parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls")
+    arg_parser.add_argument("--once", action="store_true", help="Import what is in the folder now and exit")
+    arg_parser.add_argument("--state", help=f"State file (default: {DEFAULT_STATE_FILE} in the folder)")
+    arg_parser.add_argument("--max-rps", type=float, default=10.0, help="Graph requests per second")
+    arg_parser.add_argument("--workers", type=int, default=8, help="Concurrent task creations")
+    arg_parser.add_argument("--token", default=os.environ.get("GRAPH_ACCESS_TOKEN"), help="Graph access token")
+    arg_parser.add_argument("--graph-url", help="Graph base URL (default: GRAPH_BASE_URL or Microsoft Graph)")
+    arg_parser.add_argument("--output", help="Append one result row per task to this CSV file")
+    args = arg_parser.parse_args()
+
+    quiet_streamlit()
+    auth = GraphAuth(args.graph_url, rate_limiter=RateLimiter(args.max_rps))
+    msal_apps: Dict[tuple, Any] = {}
+    access_token = args.token or auth.authenticate_interactive(msal_apps)
+    if not access_token:
+        log("Sign-in failed")
+        return 1
+
+    planners = auth.get_planners(access_token) or []
+    default_planner = resolve_planner(planners, args.plan)
+    if not default_planner:
+        log(f"Plan '{args.plan}' was not found or is ambiguous; use its id or 'Title (Group)'")
+        return 1
+
+    state = WatchState(args.state or os.path.join(args.folder, DEFAULT_STATE_FILE))
+    with ThreadPoolExecutor(max_workers=args.workers) as creators:
+        importer = BatchImporter(auth, access_token, default_planner, planners, args.bucket, creators,
+                                 RunReport(args.folder, default_planner["title"]))
+        daemon = WatchDaemon(args.folder, importer, state, args.output)
+
+        if args.once:
+            daemon.poll(settle=False)
+            return 0
+
+        log(f"Watching {args.folder} every {args.interval:g}s (Ctrl+C to stop)")
+        try:
+            while True:
+                if not args.token:
+                    # Silent refresh from the MSAL token cache before the hour-long token expires;
+                    # a daemon must not open a browser prompt mid-run
+                    access_token = auth.acquire_token_silent(msal_apps)
+                    if not access_token:
+                        log("Could not refresh the sign-in silently; restart the daemon or pass --token")
+                        return 1
+                    importer.access_token = access_token
+                daemon.poll()
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            log("Stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())